@@ -7,6 +7,9 @@ if [ -f .env ]; then
     export $(cat .env | grep -v '^#' | xargs)
 fi
 
+# Make the shared models package importable
+export PYTHONPATH="$(cd "$(dirname "$0")/.." && pwd)/shared:$PYTHONPATH"
+
 # Run the API with uvicorn
 echo "Starting Reddit Job Posts API..."
 echo "API will be available at: http://${API_HOST:-0.0.0.0}:${API_PORT:-8000}"
@@ -0,0 +1,103 @@
+"""
+On-demand access to archived job posts.
+
+The retention job (jobposts.retention) detaches old monthly partitions of
+raw_job_posts and writes them to ARCHIVE_DIR as gzip NDJSON or Parquet files.
+These helpers list the archived months and stream a month's posts back,
+applying the same search/tag filters as the live endpoints.
+"""
+import gzip
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+
+from .queries import JOB_POST_FIELDS
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, only needed for Parquet archives
+    pq = None
+
+ARCHIVE_FILE_PATTERN = re.compile(
+    r"^raw_job_posts_y(?P<year>\d{4})m(?P<month>\d{2})(?:\.\d+)?\.(?P<ext>ndjson\.gz|parquet)$"
+)
+MONTH_PATTERN = re.compile(r"^(?P<year>\d{4})-(?P<month>\d{2})$")
+
+
+def list_archives(archive_dir: str) -> List[Dict]:
+    """
+    List archived months, newest first.
+
+    Returns:
+        List of dicts with month (YYYY-MM), file count and total size in bytes
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+
+    months: Dict[str, Dict] = {}
+    for name in os.listdir(archive_dir):
+        match = ARCHIVE_FILE_PATTERN.match(name)
+        if not match:
+            continue
+        month = f"{match['year']}-{match['month']}"
+        entry = months.setdefault(month, {"month": month, "files": 0, "size_bytes": 0})
+        entry["files"] += 1
+        entry["size_bytes"] += os.path.getsize(os.path.join(archive_dir, name))
+
+    return sorted(months.values(), key=lambda entry: entry["month"], reverse=True)
+
+
+def archive_files(archive_dir: str, month: str) -> List[str]:
+    """Paths of the archive files holding the given YYYY-MM month."""
+    match = MONTH_PATTERN.match(month)
+    if not match or not os.path.isdir(archive_dir):
+        return []
+
+    paths = []
+    for name in sorted(os.listdir(archive_dir)):
+        file_match = ARCHIVE_FILE_PATTERN.match(name)
+        if file_match and (file_match["year"], file_match["month"]) == (match["year"], match["month"]):
+            paths.append(os.path.join(archive_dir, name))
+    return paths
+
+
+def _iter_records(path: str) -> Iterator[Dict]:
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError(f"Reading {os.path.basename(path)} requires pyarrow to be installed")
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(columns=list(JOB_POST_FIELDS)):
+            yield from batch.to_pylist()
+    else:
+        with gzip.open(path, "rb") as archive:
+            for line in archive:
+                yield orjson.loads(line)
+
+
+def _matches(record: Dict, search: Optional[str], tag_set: set) -> bool:
+    if tag_set and not tag_set.intersection(record.get("tags") or ()):
+        return False
+    if search:
+        haystack = " ".join(filter(None, (record.get("cleaned_title"), record.get("cleaned_text"))))
+        if search not in haystack.lower():
+            return False
+    return True
+
+
+def stream_archived_posts(paths: List[str], search: Optional[str], tag_list: List[str]) -> Iterator[bytes]:
+    """
+    Stream archived posts matching the filters as NDJSON, one file at a time.
+
+    Args:
+        paths: Archive files from archive_files()
+        search: Case-insensitive text to match in cleaned_title or cleaned_text
+        tag_list: Tags to match (OR logic)
+    """
+    search = search.lower() if search else None
+    tag_set = set(tag_list)
+    for path in paths:
+        for record in _iter_records(path):
+            if _matches(record, search, tag_set):
+                yield orjson.dumps({field: record.get(field) for field in JOB_POST_FIELDS}) + b"\n"
@@ -0,0 +1,236 @@
+"""
+Response cache for the job post endpoints.
+
+Cached entries are keyed on the data version plus the normalized query
+parameters, so bumping the version (done by the scraper on insert and by the
+LLM consumer on update) invalidates every cached response at once.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import query_counter
+from .metrics import cache_requests
+from .models import DataVersion
+
+
+class LRUBackend:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: str, body: bytes):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Redis-backed cache shared between API workers."""
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "jobposts:cache:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self.prefix + key)
+        except Exception as e:
+            print(f"Redis cache read failed: {e}")
+            return None
+
+    def set(self, key: str, body: bytes):
+        try:
+            self.client.setex(self.prefix + key, self.ttl_seconds, body)
+        except Exception as e:
+            print(f"Redis cache write failed: {e}")
+
+    def __len__(self) -> int:
+        try:
+            return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+        except Exception:
+            return 0
+
+
+class DataVersionTracker:
+    """
+    Tracks the data version counter stored in the data_version table.
+
+    The version is re-read at most once per `check_interval` seconds so that
+    cache hits cost a single cheap query instead of the full list query.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._version = 0
+        self._updated_at: Optional[datetime] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self, db: Session) -> Tuple[int, Optional[datetime]]:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._version, self._updated_at
+
+        row = db.query(DataVersion.version, DataVersion.updated_at).filter(
+            DataVersion.id == 1
+        ).first()
+
+        with self._lock:
+            if row:
+                self._version, self._updated_at = row
+            self._checked_at = now
+            return self._version, self._updated_at
+
+
+class ResponseCache:
+    """Caches serialized JSON responses and answers conditional requests."""
+
+    def __init__(self, backend, tracker: DataVersionTracker, enabled: bool = True):
+        self.backend = backend
+        self.tracker = tracker
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> str:
+        """Build a stable digest from the endpoint namespace and normalized params."""
+        normalized = json.dumps(
+            {"ns": namespace, "params": params}, sort_keys=True, default=str
+        )
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+    def respond(
+        self,
+        request: Request,
+        db: Session,
+        namespace: str,
+        params: Dict[str, Any],
+        render: Callable[[], bytes],
+    ) -> Response:
+        """
+        Return a cached response for the given params, rendering it on a miss.
+
+        Args:
+            request: Incoming request (used for conditional headers)
+            db: Database session (used to read the data version)
+            namespace: Endpoint name, keeps keys of different endpoints apart
+            params: Normalized query parameters
+            render: Callable producing the JSON body on a cache miss
+
+        Returns:
+            Response with ETag/Last-Modified headers, or 304 if unchanged
+        """
+        if not self.enabled:
+            return Response(content=render(), media_type="application/json")
+
+        version, updated_at = self.tracker.current(db)
+        digest = self.make_key(namespace, params)
+        etag = f'"{version}-{digest[:16]}"'
+        headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+        if updated_at:
+            headers["Last-Modified"] = format_datetime(
+                updated_at.replace(tzinfo=timezone.utc), usegmt=True
+            )
+
+        key = f"{version}:{digest}"
+        body = self.backend.get(key)
+        if body is None:
+            self.misses += 1
+            cache_requests.labels(result="miss").inc()
+            body = render()
+            self.backend.set(key, body)
+        else:
+            self.hits += 1
+            cache_requests.labels(result="hit").inc()
+
+        # Conditional headers are only honored once the cache or render() has
+        # shown the resource exists: a missing post raises 404 from render()
+        # and must not turn into a 304
+        if self._is_not_modified(request, etag, updated_at):
+            self.not_modified += 1
+            cache_requests.labels(result="not_modified").inc()
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    @staticmethod
+    def _is_not_modified(request: Request, etag: str, updated_at: Optional[datetime]) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = [tag.strip() for tag in if_none_match.split(",")]
+            return etag in candidates or "*" in candidates
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and updated_at:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            # HTTP dates have second precision
+            modified = updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+            return modified <= since
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio and DB query rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "db_queries": query_counter.count,
+            "db_queries_per_second": round(query_counter.rate(), 4),
+        }
+
+
+def build_response_cache() -> ResponseCache:
+    """Create the response cache configured from settings."""
+    settings = get_settings()
+    if settings.REDIS_URL:
+        backend = RedisBackend(settings.REDIS_URL, settings.CACHE_TTL_SECONDS)
+    else:
+        backend = LRUBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+
+    tracker = DataVersionTracker(settings.CACHE_VERSION_CHECK_INTERVAL)
+    return ResponseCache(backend, tracker, enabled=settings.CACHE_ENABLED)
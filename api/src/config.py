@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -16,6 +17,34 @@ class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
 
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_VERSION_CHECK_INTERVAL: float = 1.0
+    REDIS_URL: Optional[str] = None
+
+    # Server-sent events feed
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    # Archived partitions written by the retention job
+    ARCHIVE_DIR: str = "/var/lib/jobposts/archive"
+
+    # Prometheus metrics (/metrics)
+    METRICS_ENABLED: bool = True
+
+    # OpenTelemetry tracing: none, otlp (OTEL_EXPORTER_OTLP_ENDPOINT) or json
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSON_FILE: str = "/tmp/traces-api.jsonl"
+
+    # Semantic search (query embeddings come from the LLM service's Ollama)
+    OLLAMA_HOST: str = "http://localhost:11434"
+    OLLAMA_TIMEOUT: float = 10.0
+    EMBEDDING_MODEL: str = "nomic-embed-text"
+    SEMANTIC_EF_SEARCH: int = 64
+    SEMANTIC_QUERY_CACHE_SIZE: int = 512
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
+import threading
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from jobposts.metrics import observe_queries
+from jobposts.models import Base
 from .config import get_settings
+from .metrics import db_query_duration
 
 settings = get_settings()
 
@@ -13,12 +17,32 @@ engine = create_engine(
     max_overflow=20
 )
 
+
+class QueryCounter:
+    """Counts statements executed against the database engine."""
+
+    def __init__(self):
+        self.count = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def increment(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+    def rate(self) -> float:
+        """Average number of queries per second since startup."""
+        elapsed = time.monotonic() - self.started_at
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+
+query_counter = QueryCounter()
+event.listen(engine, "before_cursor_execute", query_counter.increment)
+observe_queries(engine, db_query_duration)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Base class for models
-Base = declarative_base()
-
 
 def get_db() -> Session:
     """
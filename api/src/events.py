@@ -0,0 +1,230 @@
+"""
+Push feed of newly processed job posts.
+
+The LLM consumer issues `NOTIFY job_posts_processed, '<id>'` when it writes
+cleaned data back. A single background thread LISTENs on that channel, loads
+each notified post once, encodes it once and fans it out to the subscribers
+whose filters match. Subscribers are indexed by tag so a post is only matched
+against subscriptions that could possibly want it.
+"""
+import asyncio
+import select
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+import orjson
+import psycopg2
+from jobposts.models import NOTIFY_CHANNEL
+from jobposts.tracing import context_from_traceparent, get_tracer
+from sqlalchemy import select as sql_select
+
+from .database import SessionLocal
+from .models import JobListing
+from .queries import JOB_POST_COLUMNS, JOB_POST_FIELDS
+
+tracer = get_tracer(__name__)
+
+
+class Subscription:
+    """A single client's filter and its queue of encoded events."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        tags: Iterable[str],
+        search: Optional[str],
+        max_queue_size: int
+    ):
+        self.loop = loop
+        self.tags = frozenset(tags)
+        self.search = search.lower() if search else None
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+
+    def deliver(self, payload: bytes):
+        """Queue an event from any thread."""
+        self.loop.call_soon_threadsafe(self._put, payload)
+
+    def _put(self, payload: bytes):
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # Slow client: drop the event rather than buffering without bound
+            self.dropped += 1
+
+
+class PostEventHub:
+    """Listens for processed-post notifications and fans them out to subscribers."""
+
+    def __init__(self, database_url: str, channel: str = NOTIFY_CHANNEL, max_queue_size: int = 100):
+        self.database_url = database_url
+        self.channel = channel
+        self.max_queue_size = max_queue_size
+        self.events_received = 0
+        self.events_delivered = 0
+
+        self._by_tag: Dict[str, Set[Subscription]] = {}
+        self._wildcard: Set[Subscription] = set()
+        self._subscriber_count = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # Subscription management
+
+    def subscribe(self, tags: List[str], search: Optional[str]) -> Subscription:
+        """
+        Register a subscriber. Must be called from the event loop serving it.
+
+        Args:
+            tags: Tags to match (OR logic); empty matches every post
+            search: Case-insensitive substring to match in title or text
+
+        Returns:
+            Subscription whose queue receives encoded posts
+        """
+        subscription = Subscription(asyncio.get_running_loop(), tags, search, self.max_queue_size)
+        with self._lock:
+            if subscription.tags:
+                for tag in subscription.tags:
+                    self._by_tag.setdefault(tag, set()).add(subscription)
+            else:
+                self._wildcard.add(subscription)
+            self._subscriber_count += 1
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber from the index."""
+        with self._lock:
+            if subscription.tags:
+                for tag in subscription.tags:
+                    subscribers = self._by_tag.get(tag)
+                    if subscribers is not None:
+                        subscribers.discard(subscription)
+                        if not subscribers:
+                            del self._by_tag[tag]
+            else:
+                self._wildcard.discard(subscription)
+            self._subscriber_count -= 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscriber_count
+
+    # Fan-out
+
+    def dispatch(self, post: dict) -> int:
+        """
+        Deliver a post to every subscription whose filters match it.
+
+        Returns:
+            Number of subscriptions the post was delivered to
+        """
+        post_tags = post.get("tags") or []
+        with self._lock:
+            candidates = set(self._wildcard)
+            for tag in post_tags:
+                candidates.update(self._by_tag.get(tag, ()))
+
+        if not candidates:
+            return 0
+
+        delivered = 0
+        payload = orjson.dumps(post)
+        haystack = None
+        search_results: Dict[str, bool] = {}
+
+        for subscription in candidates:
+            if subscription.search:
+                matched = search_results.get(subscription.search)
+                if matched is None:
+                    if haystack is None:
+                        haystack = " ".join(
+                            filter(None, (post.get("cleaned_title"), post.get("cleaned_text")))
+                        ).lower()
+                    matched = subscription.search in haystack
+                    search_results[subscription.search] = matched
+                if not matched:
+                    continue
+            subscription.deliver(payload)
+            delivered += 1
+        self.events_delivered += delivered
+        return delivered
+
+    # Listener thread
+
+    def start(self):
+        """Start the LISTEN thread if it is not already running."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="post-event-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the LISTEN thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def _run(self):
+        retry_delay = 1
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+                retry_delay = 1
+            except Exception as e:
+                print(f"Event listener error: {e}. Reconnecting in {retry_delay}s...")
+                self._stop_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+    def _listen(self):
+        connection = psycopg2.connect(self.database_url)
+        connection.set_session(autocommit=True)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            print(f"Listening for notifications on channel {self.channel}")
+
+            while not self._stop_event.is_set():
+                if select.select([connection], [], [], 5) == ([], [], []):
+                    continue
+                connection.poll()
+                # Payload is "<job id>" or "<job id> <traceparent>"
+                traceparents: Dict[int, Optional[str]] = {}
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    job_id, _, traceparent = notify.payload.partition(" ")
+                    try:
+                        traceparents[int(job_id)] = traceparent or None
+                    except ValueError:
+                        print(f"Ignoring malformed notification payload: {notify.payload!r}")
+                self.events_received += len(traceparents)
+
+                if traceparents and self.subscriber_count:
+                    for post in self._load_posts(list(traceparents)):
+                        with tracer.start_as_current_span(
+                            "sse.dispatch", context=context_from_traceparent(traceparents.get(post["id"]))
+                        ) as span:
+                            span.set_attributes({"job_id": post["id"], "delivered": self.dispatch(post)})
+        finally:
+            connection.close()
+
+    def _load_posts(self, job_ids: List[int]) -> List[dict]:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                sql_select(*JOB_POST_COLUMNS).where(JobListing.id.in_(job_ids))
+            ).all()
+            return [dict(zip(JOB_POST_FIELDS, row)) for row in rows]
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "events_received": self.events_received,
+            "events_delivered": self.events_delivered,
+        }
@@ -0,0 +1,208 @@
+"""
+Streaming bulk export of job posts.
+
+Rows are read through a server-side cursor (`yield_per`) in fixed-size batches
+and encoded batch by batch, so memory stays constant regardless of how many
+posts match the filters.
+"""
+import csv
+import io
+from typing import Iterator, List, Optional
+
+import orjson
+from sqlalchemy import select
+
+from .database import SessionLocal
+from .models import JobListing
+from .queries import JOB_POST_COLUMNS, JOB_POST_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional, only needed for parquet/arrow
+    pa = None
+    pq = None
+
+EXPORT_BATCH_SIZE = 2000
+
+# Media type and file extension per export format
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+ARROW_FORMATS = ("parquet", "arrow")
+
+
+def arrow_available() -> bool:
+    """Return True if pyarrow is installed."""
+    return pa is not None
+
+
+def iter_batches(filters: list, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """
+    Yield batches of matching rows using a server-side cursor.
+
+    A dedicated session is opened because the response body is streamed after
+    the request's dependency-managed session has been closed.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(*JOB_POST_COLUMNS)
+            .where(*filters)
+            .order_by(JobListing.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+    finally:
+        db.close()
+
+
+def stream_ndjson(batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """Encode batches as newline-delimited JSON."""
+    for rows in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(JOB_POST_FIELDS, row))) + b"\n" for row in rows
+        )
+
+
+def stream_csv(batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """Encode batches as CSV with a header row. Tags are written as a JSON array."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(JOB_POST_FIELDS)
+    tags_index = JOB_POST_FIELDS.index("tags")
+
+    for rows in batches:
+        for row in rows:
+            row = list(row)
+            if row[tags_index] is not None:
+                row[tags_index] = orjson.dumps(row[tags_index]).decode("utf-8")
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes back as chunks.
+
+    Keeps a running position so the Parquet writer can compute footer offsets
+    after earlier chunks have already been sent to the client.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("cleaned_title", pa.string()),
+        ("cleaned_text", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("created_utc", pa.timestamp("us")),
+        ("url", pa.string()),
+    ])
+
+
+def _string_list(tags) -> Optional[List[str]]:
+    # tags is a JSON column, so nothing stops numbers, nulls or a bare scalar
+    # from getting in; the Arrow column only takes lists of strings
+    if tags is None:
+        return None
+    if not isinstance(tags, list):
+        tags = [tags]
+    return [tag if isinstance(tag, str) else str(tag) for tag in tags if tag is not None]
+
+
+def _to_record_batch(rows: List[tuple], schema) -> "pa.RecordBatch":
+    columns = list(zip(*rows))
+    tags_index = schema.get_field_index("tags")
+    columns[tags_index] = [_string_list(tags) for tags in columns[tags_index]]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def stream_arrow(batches: Iterator[List[tuple]], export_format: str) -> Iterator[bytes]:
+    """Encode batches as a Parquet file (one row group per batch) or an Arrow IPC stream."""
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+
+    try:
+        for rows in batches:
+            batch = _to_record_batch(rows, schema)
+            if export_format == "parquet":
+                writer.write_batch(batch, row_group_size=len(rows))
+            else:
+                writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def stream_export(filters: list, export_format: str) -> Iterator[bytes]:
+    """
+    Stream all posts matching the filters in the requested format.
+
+    Args:
+        filters: Filter expressions from build_job_post_filters
+        export_format: One of EXPORT_FORMATS
+
+    Returns:
+        Iterator of encoded byte chunks
+    """
+    batches = iter_batches(filters)
+    if export_format == "ndjson":
+        return stream_ndjson(batches)
+    if export_format == "csv":
+        return stream_csv(batches)
+    return stream_arrow(batches, export_format)
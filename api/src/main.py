@@ -1,17 +1,54 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import array
 from typing import Optional, List
 from datetime import datetime
-import math
+import asyncio
+import orjson
+from jobposts.tracing import init_tracing, shutdown_tracing
 
 from .database import get_db
-from .models import RawJobPost
-from .schemas import JobPostResponse, JobPostListResponse, ErrorResponse
+from .models import JobListing, JobTag
+from .schemas import JobPostResponse, JobPostListResponse, ErrorResponse, SemanticSearchResponse
 from .config import get_settings
+from .cache import build_response_cache
+from .queries import (
+    JOB_POST_COLUMNS,
+    JOB_POST_FIELDS,
+    build_job_post_filters,
+    parse_tags,
+    query_job_posts,
+)
+from .export import ARROW_FORMATS, EXPORT_FORMATS, arrow_available, stream_export
+from .events import PostEventHub
+from .archive import archive_files, list_archives, stream_archived_posts
+from .metrics import MetricsMiddleware, metrics
+from .tracing import TracingMiddleware
+from .semantic import EmbeddingUnavailable, QueryEmbedder, semantic_search, similar_posts
 
 settings = get_settings()
+tracing_enabled = init_tracing("api", exporter=settings.TRACING_EXPORTER, json_file=settings.TRACING_JSON_FILE)
+response_cache = build_response_cache()
+event_hub = PostEventHub(settings.database_url, max_queue_size=settings.EVENTS_QUEUE_SIZE)
+query_embedder = QueryEmbedder(
+    settings.OLLAMA_HOST,
+    settings.EMBEDDING_MODEL,
+    cache_size=settings.SEMANTIC_QUERY_CACHE_SIZE,
+    timeout=settings.OLLAMA_TIMEOUT
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop the notification listener and flush pending spans on shutdown."""
+    yield
+    event_hub.stop()
+    shutdown_tracing()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -19,7 +56,9 @@ app = FastAPI(
     description="API to query job posts scraped from Reddit with LLM-cleaned data",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -31,6 +70,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -54,6 +98,14 @@ async def health_check(db: Session = Depends(get_db)):
         raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=metrics.generate_latest(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get(
     "/api/v1/job-posts",
     response_model=JobPostListResponse,
@@ -61,11 +113,13 @@ async def health_check(db: Session = Depends(get_db)):
     summary="Get filtered job posts",
     responses={
         200: {"description": "Successful response with filtered job posts"},
+        304: {"description": "Results not modified since the given ETag"},
         400: {"model": ErrorResponse, "description": "Invalid query parameters"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     }
 )
 async def get_job_posts(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page (max 100)"),
     search: Optional[str] = Query(None, description="Search in cleaned_title and cleaned_text"),
@@ -93,94 +147,246 @@ async def get_job_posts(
     **Pagination:**
     - `page`: Current page number (starts at 1)
     - `page_size`: Items per page (1-100)
+
+    **Caching:**
+    Responses carry `ETag` and `Last-Modified` headers; send them back via
+    `If-None-Match` / `If-Modified-Since` to get `304 Not Modified`.
     """
+    sort_order = sort_order.lower()
+    if sort_order not in ["asc", "desc"]:
+        raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
+
+    sort_field = getattr(JobListing, sort_by, None)
+    if sort_field is None:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by field: {sort_by}")
+
+    tag_list = parse_tags(tags)
+
+    # Normalized parameters used as the cache key
+    params = {
+        "page": page,
+        "page_size": page_size,
+        "search": search or None,
+        "tags": tag_list,
+        "from_date": from_date.isoformat() if from_date else None,
+        "to_date": to_date.isoformat() if to_date else None,
+        "has_cleaned_data": has_cleaned_data,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+    }
+
+    def render() -> bytes:
+        return query_job_posts(
+            db,
+            page=page,
+            page_size=page_size,
+            search=search,
+            tag_list=tag_list,
+            from_date=from_date,
+            to_date=to_date,
+            has_cleaned_data=has_cleaned_data,
+            sort_field=sort_field,
+            sort_order=sort_order
+        )
+
     try:
-        # Build base query
-        query = db.query(RawJobPost)
-
-        # Apply filters
-        filters = []
-
-        # Filter by cleaned data availability
-        if has_cleaned_data is True:
-            filters.append(RawJobPost.cleaned_title.isnot(None))
-        elif has_cleaned_data is False:
-            filters.append(RawJobPost.cleaned_title.is_(None))
-
-        # Search filter
-        if search:
-            search_term = f"%{search}%"
-            search_filters = [
-                RawJobPost.cleaned_title.ilike(search_term),
-                RawJobPost.cleaned_text.ilike(search_term)
-            ]
-            filters.append(or_(*search_filters))
-
-        # Tags filter (OR logic - match any of the provided tags)
-        if tags:
-            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
-            if tag_list:
-                # Check if any of the tags in the list are in the JSON array
-                # Using cast to text and LIKE for PostgreSQL JSON type
-                from sqlalchemy import Text, cast
-                tag_filters = []
-                for tag in tag_list:
-                    # Cast tags to text and check if it contains the tag
-                    tag_filters.append(
-                        cast(RawJobPost.tags, Text).like(f'%"{tag}"%')
-                    )
-                filters.append(or_(*tag_filters))
+        return response_cache.respond(request, db, "job-posts", params, render)
 
-        # Date range filters
-        if from_date:
-            filters.append(RawJobPost.created_utc >= from_date)
-        if to_date:
-            filters.append(RawJobPost.created_utc <= to_date)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error querying job posts: {str(e)}")
 
-        # Apply all filters
-        if filters:
-            query = query.filter(and_(*filters))
 
-        # Get total count before pagination
-        total = query.count()
+@app.get(
+    "/api/v1/job-posts/export",
+    tags=["Job Posts"],
+    summary="Bulk export filtered job posts",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Stream of all matching job posts"},
+        400: {"model": ErrorResponse, "description": "Invalid or unavailable export format"},
+    }
+)
+async def export_job_posts(
+    export_format: str = Query("ndjson", alias="format", description="Export format: ndjson, csv, parquet or arrow"),
+    search: Optional[str] = Query(None, description="Search in cleaned_title and cleaned_text"),
+    tags: Optional[str] = Query(None, description="Comma-separated list of tags to filter by (OR logic)"),
+    from_date: Optional[datetime] = Query(None, description="Filter posts from this date (ISO 8601 format)"),
+    to_date: Optional[datetime] = Query(None, description="Filter posts until this date (ISO 8601 format)"),
+    has_cleaned_data: Optional[bool] = Query(None, description="Filter posts with/without cleaned data"),
+):
+    """
+    Stream every job post matching the filters, ordered by ID.
+
+    Rows are read through a server-side cursor and encoded in batches, so
+    memory use stays constant regardless of the result size. Use this instead
+    of paging through `/api/v1/job-posts` for bulk downloads.
 
-        # Apply sorting
-        sort_order = sort_order.lower()
-        if sort_order not in ["asc", "desc"]:
-            raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
+    **Formats:**
+    - `ndjson`: One JSON object per line (default)
+    - `csv`: CSV with a header row, tags as a JSON array
+    - `parquet` / `arrow`: Parquet file or Arrow IPC stream (requires pyarrow)
+    """
+    export_format = export_format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format: {export_format}. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if export_format in ARROW_FORMATS and not arrow_available():
+        raise HTTPException(status_code=400, detail=f"Format {export_format} requires pyarrow to be installed")
+
+    filters = build_job_post_filters(
+        search=search,
+        tag_list=parse_tags(tags),
+        from_date=from_date,
+        to_date=to_date,
+        has_cleaned_data=has_cleaned_data
+    )
 
-        sort_field = getattr(RawJobPost, sort_by, None)
-        if sort_field is None:
-            raise HTTPException(status_code=400, detail=f"Invalid sort_by field: {sort_by}")
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        stream_export(filters, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="job_posts.{extension}"'}
+    )
 
-        if sort_order == "desc":
-            query = query.order_by(sort_field.desc())
-        else:
-            query = query.order_by(sort_field.asc())
 
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+@app.get(
+    "/api/v1/job-posts/stream",
+    tags=["Job Posts"],
+    summary="Server-sent events feed of newly processed job posts",
+    response_class=StreamingResponse,
+    responses={200: {"description": "text/event-stream of job posts as they are processed"}}
+)
+async def stream_job_posts(
+    request: Request,
+    search: Optional[str] = Query(None, description="Only posts whose cleaned_title or cleaned_text contain this text"),
+    tags: Optional[str] = Query(None, description="Comma-separated list of tags to filter by (OR logic)"),
+):
+    """
+    Push newly processed job posts to the client as server-sent events.
 
-        # Execute query
-        job_posts = query.all()
+    Each event is named `job_post` and carries the post as JSON in the same
+    shape as `/api/v1/job-posts/{post_id}`. Use this instead of polling
+    `/api/v1/job-posts` sorted by `processed_at`.
+    """
+    subscription = event_hub.subscribe(parse_tags(tags), search)
+
+    async def event_stream():
+        try:
+            yield b"retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"event: job_post\ndata: " + payload + b"\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        # Calculate total pages
-        total_pages = math.ceil(total / page_size) if total > 0 else 0
 
-        # Build response
-        return JobPostListResponse(
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            data=[JobPostResponse.model_validate(post) for post in job_posts]
+@app.get(
+    "/api/v1/job-posts/search",
+    response_model=SemanticSearchResponse,
+    tags=["Job Posts"],
+    summary="Semantic search",
+    responses={
+        200: {"description": "Posts closest in meaning to the query, most similar first"},
+        304: {"description": "Results not modified since the given ETag"},
+        503: {"model": ErrorResponse, "description": "Embedding model unavailable"},
+    }
+)
+def search_job_posts(
+    request: Request,
+    semantic: str = Query(..., min_length=1, max_length=500, description="Free-text query matched by meaning"),
+    limit: int = Query(10, ge=1, le=100, description="Number of results (max 100)"),
+    tags: Optional[str] = Query(None, description="Comma-separated list of tags to filter by (OR logic)"),
+    from_date: Optional[datetime] = Query(None, description="Filter posts from this date (ISO 8601 format)"),
+    to_date: Optional[datetime] = Query(None, description="Filter posts until this date (ISO 8601 format)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Search processed job posts by meaning rather than keywords, so that
+    "backend dev" also finds "server-side engineer".
+
+    The query is embedded with the same model as the posts and matched
+    against the HNSW index on `job_embeddings`. Each result carries its
+    cosine `similarity` (1 is identical).
+
+    A plain function, so FastAPI runs it in the threadpool: embedding the
+    query is a blocking call to Ollama.
+    """
+    tag_list = parse_tags(tags)
+    params = {
+        "semantic": semantic,
+        "limit": limit,
+        "tags": tag_list,
+        "from_date": from_date.isoformat() if from_date else None,
+        "to_date": to_date.isoformat() if to_date else None,
+    }
+
+    def render() -> bytes:
+        filters = build_job_post_filters(
+            search=None,
+            tag_list=tag_list,
+            from_date=from_date,
+            to_date=to_date,
+            has_cleaned_data=None
         )
+        try:
+            return semantic_search(
+                db,
+                query_embedder,
+                semantic,
+                limit=limit,
+                filters=filters,
+                ef_search=settings.SEMANTIC_EF_SEARCH
+            )
+        except EmbeddingUnavailable as e:
+            raise HTTPException(status_code=503, detail=str(e))
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error querying job posts: {str(e)}")
+    return response_cache.respond(request, db, "job-posts-search", params, render)
+
+
+@app.get(
+    "/api/v1/job-posts/{post_id}/similar",
+    response_model=SemanticSearchResponse,
+    tags=["Job Posts"],
+    summary="Get similar job posts",
+    responses={
+        200: {"description": "Posts closest in meaning to the given post"},
+        304: {"description": "Results not modified since the given ETag"},
+        404: {"model": ErrorResponse, "description": "Job post not found or not embedded yet"},
+    }
+)
+async def get_similar_job_posts(
+    request: Request,
+    post_id: int,
+    limit: int = Query(10, ge=1, le=100, description="Number of results (max 100)"),
+    db: Session = Depends(get_db)
+):
+    """Get the job posts most similar to a given post, most similar first."""
+    def render() -> bytes:
+        body = similar_posts(db, post_id, settings.EMBEDDING_MODEL, limit=limit, ef_search=settings.SEMANTIC_EF_SEARCH)
+        if body is None:
+            exists = db.execute(select(JobListing.id).where(JobListing.id == post_id)).first()
+            if not exists:
+                raise HTTPException(status_code=404, detail=f"Job post with id {post_id} not found")
+            raise HTTPException(status_code=404, detail=f"Job post {post_id} has no embedding yet")
+        return body
+
+    return response_cache.respond(request, db, "job-posts-similar", {"post_id": post_id, "limit": limit}, render)
 
 
 @app.get(
@@ -190,17 +396,23 @@ async def get_job_posts(
     summary="Get job post by ID",
     responses={
         200: {"description": "Job post found"},
+        304: {"description": "Job post not modified since the given ETag"},
         404: {"model": ErrorResponse, "description": "Job post not found"},
     }
 )
-async def get_job_post(post_id: int, db: Session = Depends(get_db)):
+async def get_job_post(request: Request, post_id: int, db: Session = Depends(get_db)):
     """Get a specific job post by its ID."""
-    job_post = db.query(RawJobPost).filter(RawJobPost.id == post_id).first()
+    def render() -> bytes:
+        row = db.execute(
+            select(*JOB_POST_COLUMNS).where(JobListing.id == post_id)
+        ).first()
 
-    if not job_post:
-        raise HTTPException(status_code=404, detail=f"Job post with id {post_id} not found")
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Job post with id {post_id} not found")
 
-    return JobPostResponse.model_validate(job_post)
+        return orjson.dumps(dict(zip(JOB_POST_FIELDS, row)))
+
+    return response_cache.respond(request, db, "job-post", {"post_id": post_id}, render)
 
 
 @app.get(
@@ -213,21 +425,70 @@ async def get_job_post(post_id: int, db: Session = Depends(get_db)):
 async def get_all_tags(db: Session = Depends(get_db)):
     """Get all unique tags from job posts."""
     try:
-        # Query all non-null tags
-        results = db.query(RawJobPost.tags).filter(RawJobPost.tags.isnot(None)).all()
-
-        # Extract unique tags
-        unique_tags = set()
-        for (tags,) in results:
-            if tags and isinstance(tags, list):
-                unique_tags.update(tags)
-
-        return sorted(list(unique_tags))
+        # Tags still referenced by at least one listing; each EXISTS probe is
+        # served by the GIN index on job_listing.tag_ids
+        in_use = select(JobListing.id).where(
+            JobListing.tag_ids.contains(array([JobTag.id]))
+        ).exists()
+        return db.execute(select(JobTag.name).where(in_use).order_by(JobTag.name)).scalars().all()
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tags: {str(e)}")
 
 
+@app.get(
+    "/api/v1/archive",
+    tags=["Archive"],
+    summary="List archived months",
+    description="Months whose job posts were moved out of the database by the retention job"
+)
+async def get_archived_months():
+    """List archived months with file counts and sizes."""
+    return list_archives(settings.ARCHIVE_DIR)
+
+
+@app.get(
+    "/api/v1/archive/{month}",
+    tags=["Archive"],
+    summary="Stream archived job posts for a month",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "NDJSON stream of archived job posts"},
+        404: {"model": ErrorResponse, "description": "No archive for this month"},
+    }
+)
+async def get_archived_posts(
+    month: str,
+    search: Optional[str] = Query(None, description="Search in cleaned_title and cleaned_text"),
+    tags: Optional[str] = Query(None, description="Comma-separated list of tags to filter by (OR logic)"),
+):
+    """
+    Stream the archived job posts of a month (`YYYY-MM`) as NDJSON.
+
+    Archived months are no longer in the database, so this reads the archive
+    files directly; expect it to be slower than the live endpoints.
+    """
+    paths = archive_files(settings.ARCHIVE_DIR, month)
+    if not paths:
+        raise HTTPException(status_code=404, detail=f"No archive found for month {month}")
+
+    return StreamingResponse(
+        stream_archived_posts(paths, search, parse_tags(tags)),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.get(
+    "/api/v1/cache/stats",
+    tags=["Statistics"],
+    summary="Get response cache statistics",
+    description="Returns cache hit ratio and database query rate"
+)
+async def get_cache_stats():
+    """Get response cache hit ratio and database query counters."""
+    return {**response_cache.stats(), "events": event_hub.stats()}
+
+
 @app.get(
     "/api/v1/stats",
     tags=["Statistics"],
@@ -237,15 +498,15 @@ async def get_all_tags(db: Session = Depends(get_db)):
 async def get_stats(db: Session = Depends(get_db)):
     """Get statistics about job posts in the database."""
     try:
-        total_posts = db.query(func.count(RawJobPost.id)).scalar()
-        posts_with_cleaned_data = db.query(func.count(RawJobPost.id)).filter(
-            RawJobPost.cleaned_title.isnot(None)
+        total_posts = db.query(func.count(JobListing.id)).scalar()
+        posts_with_cleaned_data = db.query(func.count(JobListing.id)).filter(
+            JobListing.cleaned_title.isnot(None)
         ).scalar()
         posts_without_cleaned_data = total_posts - posts_with_cleaned_data
 
         # Get date range
-        oldest_post = db.query(func.min(RawJobPost.created_utc)).scalar()
-        newest_post = db.query(func.max(RawJobPost.created_utc)).scalar()
+        oldest_post = db.query(func.min(JobListing.created_utc)).scalar()
+        newest_post = db.query(func.max(JobListing.created_utc)).scalar()
 
         return {
             "total_posts": total_posts,
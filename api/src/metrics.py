@@ -0,0 +1,79 @@
+"""
+Prometheus metrics for the API, exposed at /metrics.
+
+Requests are timed by a plain ASGI middleware labelled with the matched
+route template (not the raw path) so cardinality stays bounded. The request
+latency is the time to the first body chunk, which for an ordinary response
+is the whole body. Streaming responses (exports, the SSE feed) would
+otherwise record how long a client stayed connected, so their full duration
+goes to a separate histogram instead. With
+METRICS_ENABLED=false the middleware is not installed and every metric is a
+no-op.
+"""
+import time
+
+from jobposts.metrics import MetricSet
+
+from .config import get_settings
+
+metrics = MetricSet("api", enabled=get_settings().METRICS_ENABLED)
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds", "Request latency (time to first byte) by route", ["method", "route", "status"]
+)
+stream_duration = metrics.histogram(
+    "http_stream_duration_seconds", "Full duration of streaming responses by route", ["method", "route", "status"],
+    # Exports take seconds to minutes, SSE connections can stay open for hours
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0, 14400.0)
+)
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds", "Database round-trip time per statement", ["statement"]
+)
+cache_requests = metrics.counter(
+    "cache_requests_total", "Response cache lookups by result", ["result"]
+)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request to its first byte, and streaming responses to their end."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        first_byte = None
+        streaming = False
+
+        def labels(histogram):
+            # FastAPI stores the matched route in the scope
+            route = scope.get("route")
+            return histogram.labels(
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=str(status)
+            )
+
+        async def send_with_status(message):
+            nonlocal status, first_byte, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and first_byte is None:
+                first_byte = time.perf_counter() - started
+                # More chunks to come: a streamed body, timed separately below
+                streaming = message.get("more_body", False)
+                labels(request_duration).observe(first_byte)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if first_byte is None:
+                labels(request_duration).observe(time.perf_counter() - started)
+            elif streaming:
+                labels(stream_duration).observe(time.perf_counter() - started)
@@ -0,0 +1,133 @@
+"""
+Query building shared by the job post endpoints.
+"""
+from datetime import datetime
+from typing import List, Optional
+import math
+
+import orjson
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from .models import JobListing, JobTag
+from .schemas import JobPostResponse
+
+# Columns selected for JobPostResponse payloads, in schema field order. All
+# reads go to the narrow job_listing read model, never to raw_job_posts.
+JOB_POST_FIELDS = tuple(JobPostResponse.model_fields)
+JOB_POST_COLUMNS = tuple(getattr(JobListing, field) for field in JOB_POST_FIELDS)
+
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Split a comma-separated tag string into a sorted, de-duplicated list."""
+    if not tags:
+        return []
+    return sorted({tag.strip() for tag in tags.split(",") if tag.strip()})
+
+
+def build_job_post_filters(
+    search: Optional[str],
+    tag_list: List[str],
+    from_date: Optional[datetime],
+    to_date: Optional[datetime],
+    has_cleaned_data: Optional[bool]
+) -> list:
+    """
+    Build the WHERE clauses for the job post filters.
+
+    Returns:
+        List of SQLAlchemy filter expressions (AND-ed by the caller)
+    """
+    filters = []
+
+    # Filter by cleaned data availability
+    if has_cleaned_data is True:
+        filters.append(JobListing.cleaned_title.isnot(None))
+    elif has_cleaned_data is False:
+        filters.append(JobListing.cleaned_title.is_(None))
+
+    # Search filter
+    if search:
+        search_term = f"%{search}%"
+        search_filters = [
+            JobListing.cleaned_title.ilike(search_term),
+            JobListing.cleaned_text.ilike(search_term)
+        ]
+        filters.append(or_(*search_filters))
+
+    # Tags filter (OR logic - match any of the provided tags)
+    if tag_list:
+        # Resolve names to ids once (an InitPlan), then tag_ids && ids is
+        # served by the GIN index on job_listing.tag_ids
+        tag_ids = select(func.array_agg(JobTag.id)).where(JobTag.name.in_(tag_list)).scalar_subquery()
+        filters.append(JobListing.tag_ids.overlap(tag_ids))
+
+    # Date range filters
+    if from_date:
+        filters.append(JobListing.created_utc >= from_date)
+    if to_date:
+        filters.append(JobListing.created_utc <= to_date)
+
+    return filters
+
+
+def query_job_posts(
+    db: Session,
+    page: int,
+    page_size: int,
+    search: Optional[str],
+    tag_list: List[str],
+    from_date: Optional[datetime],
+    to_date: Optional[datetime],
+    has_cleaned_data: Optional[bool],
+    sort_field,
+    sort_order: str
+) -> bytes:
+    """
+    Run the filtered, paginated job post query and serialize the page.
+
+    Only the columns served by JobPostResponse are selected, so rows come back
+    as plain tuples without ORM identity-map overhead, and are serialized
+    straight to JSON bytes with orjson.
+    """
+    filters = build_job_post_filters(
+        search=search,
+        tag_list=tag_list,
+        from_date=from_date,
+        to_date=to_date,
+        has_cleaned_data=has_cleaned_data
+    )
+
+    # Get total count before pagination
+    total = db.execute(
+        select(func.count()).select_from(JobListing).where(*filters)
+    ).scalar()
+
+    # Build the page query over the response columns only
+    query = select(*JOB_POST_COLUMNS).where(*filters)
+
+    # Apply sorting, with id as a tie-breaker so pages are stable and the
+    # (sort_field, id) indexes can serve the ORDER BY ... LIMIT
+    if sort_order == "desc":
+        query = query.order_by(sort_field.desc(), JobListing.id.desc())
+    else:
+        query = query.order_by(sort_field.asc(), JobListing.id.asc())
+
+    # Apply pagination
+    offset = (page - 1) * page_size
+    query = query.offset(offset).limit(page_size)
+
+    # Execute query
+    rows = db.execute(query).all()
+
+    # Calculate total pages
+    total_pages = math.ceil(total / page_size) if total > 0 else 0
+
+    # Build response
+    return orjson.dumps({
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "data": [dict(zip(JOB_POST_FIELDS, row)) for row in rows]
+    })
@@ -25,6 +25,17 @@ class JobPostListResponse(BaseModel):
     data: List[JobPostResponse]
 
 
+class SimilarJobPostResponse(JobPostResponse):
+    """Job post returned by semantic search, with its cosine similarity."""
+    similarity: float
+
+
+class SemanticSearchResponse(BaseModel):
+    """Response schema for semantic search and similar posts."""
+    query: Optional[str] = None
+    data: List[SimilarJobPostResponse]
+
+
 class ErrorResponse(BaseModel):
     """Error response schema."""
     detail: str
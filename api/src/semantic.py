@@ -0,0 +1,134 @@
+"""
+Semantic search over the job_embeddings HNSW index.
+
+Queries are embedded with the same Ollama model the LLM consumer uses for
+posts, then ranked by cosine distance in Postgres (pgvector). Query
+embeddings are kept in a small LRU so repeated searches skip Ollama.
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import ollama
+import orjson
+from jobposts.embeddings import JobEmbedding
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from .models import JobListing
+from .queries import JOB_POST_COLUMNS, JOB_POST_FIELDS
+
+
+class EmbeddingUnavailable(Exception):
+    """Raised when the query embedding cannot be computed."""
+
+
+class QueryEmbedder:
+    """Embeds search queries through Ollama, caching recent results."""
+
+    def __init__(self, host: str, model: str, cache_size: int = 512, timeout: float = 10.0):
+        # Bounded, so an unreachable Ollama turns into a 503 instead of a hung request
+        self.client = ollama.Client(host=host, timeout=timeout)
+        self.model = model
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, query: str) -> List[float]:
+        """
+        Embed a search query.
+
+        Raises:
+            EmbeddingUnavailable: If Ollama cannot be reached or fails
+        """
+        with self._lock:
+            if query in self._cache:
+                self._cache.move_to_end(query)
+                return self._cache[query]
+
+        try:
+            embedding = self.client.embeddings(model=self.model, prompt=query)["embedding"]
+        except Exception as e:
+            raise EmbeddingUnavailable(f"Could not embed query with {self.model}: {e}") from e
+
+        with self._lock:
+            self._cache[query] = embedding
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return embedding
+
+
+def _configure_scan(db: Session, ef_search: int, filtered: bool):
+    # Candidate list size for this transaction only; with filters, let the
+    # index keep scanning until enough rows pass them instead of returning
+    # fewer than `limit` results
+    db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    if filtered:
+        db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+
+
+def _nearest(db: Session, embedding: List[float], model: str, limit: int, filters: list) -> list:
+    distance = JobEmbedding.embedding.cosine_distance(embedding).label("distance")
+    query = (
+        select(*JOB_POST_COLUMNS, distance)
+        .join(JobEmbedding, JobEmbedding.id == JobListing.id)
+        # Vectors from another model live in a different space
+        .where(JobEmbedding.model == model, *filters)
+        .order_by(distance)
+        .limit(limit)
+    )
+    results = []
+    for row in db.execute(query).all():
+        post = dict(zip(JOB_POST_FIELDS, row[:-1]))
+        post["similarity"] = round(1.0 - row[-1], 6)
+        results.append(post)
+    return results
+
+
+def semantic_search(
+    db: Session,
+    embedder: QueryEmbedder,
+    query: str,
+    limit: int,
+    filters: list,
+    ef_search: int
+) -> bytes:
+    """
+    Find the posts closest in meaning to a free-text query.
+
+    Args:
+        db: Database session
+        embedder: Query embedder
+        query: Free-text query
+        limit: Maximum number of results
+        filters: Extra WHERE clauses from build_job_post_filters
+        ef_search: HNSW candidate list size (higher is slower and more accurate)
+
+    Returns:
+        Serialized SemanticSearchResponse
+    """
+    embedding = embedder.embed(query)
+    _configure_scan(db, max(ef_search, limit), filtered=bool(filters))
+    return orjson.dumps({"query": query, "data": _nearest(db, embedding, embedder.model, limit, filters)})
+
+
+def similar_posts(db: Session, post_id: int, model: str, limit: int, ef_search: int) -> Optional[bytes]:
+    """
+    Find the posts closest to an existing post.
+
+    Only embeddings made with model are compared, so posts not yet
+    re-embedded after a model change are left out.
+
+    Returns:
+        Serialized SemanticSearchResponse, or None if the post has no embedding
+    """
+    embedding = db.execute(
+        select(JobEmbedding.embedding).where(JobEmbedding.id == post_id, JobEmbedding.model == model)
+    ).scalar()
+    if embedding is None:
+        return None
+
+    _configure_scan(db, max(ef_search, limit + 1), filtered=False)
+    data = _nearest(db, embedding.tolist(), model, limit + 1, [])
+    data = [post for post in data if post["id"] != post_id][:limit]
+    return orjson.dumps({"query": None, "data": data})
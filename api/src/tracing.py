@@ -0,0 +1,43 @@
+"""
+Request spans for the API.
+
+Incoming `traceparent` headers are honoured, so a client can join the API
+call to its own trace. Installed only when tracing is enabled.
+"""
+from jobposts.tracing import extract_context, get_tracer
+
+tracer = get_tracer(__name__)
+
+
+class TracingMiddleware:
+    """Wraps every HTTP request in a span named after its route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(f"{scope['method']} request", context=extract_context(headers)) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = scope.get("route")
+                route_path = route.path if route is not None else "unmatched"
+                span.update_name(f"{scope['method']} {route_path}")
+                span.set_attributes({
+                    "http.method": scope["method"],
+                    "http.route": route_path,
+                    "http.status_code": status,
+                })
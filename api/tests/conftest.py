@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Same import layout as the container: the src package and the shared jobposts package
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'shared'))
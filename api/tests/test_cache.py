@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.cache import LRUBackend, ResponseCache
+
+UPDATED_AT = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class FixedVersion:
+    def current(self, db):
+        return 7, UPDATED_AT
+
+
+def make_request(headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/job-posts/1",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def missing_post():
+    raise HTTPException(status_code=404, detail="Job post with id 1 not found")
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(LRUBackend(max_entries=16, ttl_seconds=60), FixedVersion())
+
+
+def test_if_modified_since_on_missing_post_is_404(cache):
+    request = make_request({"If-Modified-Since": "Fri, 02 Jan 2026 00:00:00 GMT"})
+    with pytest.raises(HTTPException) as raised:
+        cache.respond(request, None, "job-post", {"post_id": 1}, missing_post)
+    assert raised.value.status_code == 404
+
+
+def test_if_none_match_any_on_missing_post_is_404(cache):
+    request = make_request({"If-None-Match": "*"})
+    with pytest.raises(HTTPException) as raised:
+        cache.respond(request, None, "job-post", {"post_id": 1}, missing_post)
+    assert raised.value.status_code == 404
+
+
+def test_if_modified_since_on_existing_post_is_304(cache):
+    request = make_request({"If-Modified-Since": "Fri, 02 Jan 2026 00:00:00 GMT"})
+    response = cache.respond(request, None, "job-post", {"post_id": 1}, lambda: b'{"id": 1}')
+    assert response.status_code == 304
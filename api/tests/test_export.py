@@ -0,0 +1,18 @@
+from datetime import datetime
+
+import pyarrow as pa
+
+from src.export import stream_arrow
+
+
+def test_arrow_export_coerces_tags_to_strings():
+    rows = [
+        (1, "Backend developer", "Python and Postgres", ["python", 2026, None], datetime(2026, 1, 1), "https://x/1"),
+        (2, "Designer", "Figma", None, datetime(2026, 1, 2), "https://x/2"),
+        (3, "Data engineer", "Spark", "remote", datetime(2026, 1, 3), "https://x/3"),
+    ]
+
+    body = b"".join(stream_arrow(iter([rows]), "arrow"))
+
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column("tags").to_pylist() == [["python", "2026"], None, ["remote"]]
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from src import metrics
+from src.metrics import MetricsMiddleware
+
+
+class Recorder:
+    def __init__(self):
+        self.observed = []
+
+    def labels(self, **labels):
+        return self
+
+    def observe(self, value):
+        self.observed.append(value)
+
+
+@pytest.fixture
+def histograms(monkeypatch):
+    request, stream = Recorder(), Recorder()
+    monkeypatch.setattr(metrics, "request_duration", request)
+    monkeypatch.setattr(metrics, "stream_duration", stream)
+    return request, stream
+
+
+def run(app):
+    scope = {"type": "http", "method": "GET", "path": "/"}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    asyncio.run(MetricsMiddleware(app)(scope, receive, send))
+
+
+def test_streaming_response_records_time_to_first_byte(histograms):
+    request, stream = histograms
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"data: 1\n\n", "more_body": True})
+        await asyncio.sleep(0.2)
+        await send({"type": "http.response.body", "body": b""})
+
+    run(app)
+
+    assert len(request.observed) == 1 and request.observed[0] < 0.1
+    assert len(stream.observed) == 1 and stream.observed[0] >= 0.2
+
+
+def test_plain_response_is_not_a_stream(histograms):
+    request, stream = histograms
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    run(app)
+
+    assert len(request.observed) == 1
+    assert stream.observed == []
@@ -0,0 +1,142 @@
+"""
+Benchmark per-request CPU time of the /api/v1/job-posts list serialization.
+
+Compares the previous path (full RawJobPost entities -> JobPostResponse.model_validate
+-> FastAPI's jsonable_encoder + json.dumps) with the lean path (response columns only
+-> dict rows -> orjson.dumps).
+
+Usage (from the repository root):
+    python benchmarks/bench_api_serialization.py --pages 500 --page-size 100
+    python benchmarks/bench_api_serialization.py --with-db   # also time the DB fetch
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "shared"))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from src.models import JobListing, RawJobPost
+from src.schemas import JobPostResponse, JobPostListResponse
+from src.queries import JOB_POST_COLUMNS, JOB_POST_FIELDS
+
+
+def make_posts(page_size: int, text_length: int):
+    """Build transient ORM entities resembling processed job posts."""
+    now = datetime.utcnow()
+    posts = []
+    for i in range(page_size):
+        posts.append(RawJobPost(
+            id=i + 1,
+            reddit_id=f"t3_{i:06d}",
+            title=f"[Hiring] Backend engineer #{i}",
+            body="Lorem ipsum dolor sit amet. " * (text_length // 28),
+            author="someone",
+            created_utc=now - timedelta(minutes=i),
+            score=i % 50,
+            url=f"https://reddit.com/r/forhire/comments/{i}",
+            subreddit="forhire",
+            scraped_at=now,
+            cleaned_title=f"Backend Engineer #{i} - Remote",
+            cleaned_text="We are looking for an experienced engineer. " * (text_length // 44),
+            tags=["python", "remote", "senior", "backend", "full-time"],
+            processed_at=now,
+        ))
+    return posts
+
+
+def old_path(posts, page_size: int) -> bytes:
+    response = JobPostListResponse(
+        total=10_000,
+        page=1,
+        page_size=page_size,
+        total_pages=100,
+        data=[JobPostResponse.model_validate(post) for post in posts]
+    )
+    return json.dumps(jsonable_encoder(response)).encode("utf-8")
+
+
+def new_path(rows, page_size: int) -> bytes:
+    return orjson.dumps({
+        "total": 10_000,
+        "page": 1,
+        "page_size": page_size,
+        "total_pages": 100,
+        "data": [dict(zip(JOB_POST_FIELDS, row)) for row in rows]
+    })
+
+
+def cpu_time_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def bench_db(page_size: int, iterations: int) -> dict:
+    """Time the entity query against the column-only query on a live database."""
+    from src.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        def fetch_entities():
+            db.expunge_all()
+            posts = db.query(RawJobPost).order_by(RawJobPost.created_utc.desc()).limit(page_size).all()
+            return old_path(posts, page_size)
+
+        def fetch_columns():
+            rows = db.execute(
+                select(*JOB_POST_COLUMNS).order_by(JobListing.created_utc.desc()).limit(page_size)
+            ).all()
+            return new_path(rows, page_size)
+
+        return {
+            "before_cpu_ms": cpu_time_per_call(fetch_entities, iterations) * 1000,
+            "after_cpu_ms": cpu_time_per_call(fetch_columns, iterations) * 1000,
+        }
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="Number of simulated requests")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--text-length", type=int, default=1000, help="Approximate cleaned_text length")
+    parser.add_argument("--with-db", action="store_true", help="Also benchmark against the configured database")
+    args = parser.parse_args()
+
+    posts = make_posts(args.page_size, args.text_length)
+    rows = [tuple(getattr(post, field) for field in JOB_POST_FIELDS) for post in posts]
+
+    # Both paths must produce the same document
+    assert json.loads(old_path(posts, args.page_size)) == json.loads(new_path(rows, args.page_size))
+
+    before = cpu_time_per_call(lambda: old_path(posts, args.page_size), args.pages)
+    after = cpu_time_per_call(lambda: new_path(rows, args.page_size), args.pages)
+
+    result = {
+        "benchmark": "api_list_serialization",
+        "page_size": args.page_size,
+        "requests": args.pages,
+        "serialization": {
+            "before_cpu_ms": before * 1000,
+            "after_cpu_ms": after * 1000,
+            "speedup": before / after if after else None,
+        },
+    }
+    if args.with_db:
+        result["with_db"] = bench_db(args.page_size, args.pages)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark the /api/v1/job-posts/export streaming endpoint.
+
+Reports rows per second, bytes transferred and, when the API's PID is given,
+the peak resident memory of the server process while the export runs.
+
+Usage (from the repository root, API running locally):
+    python benchmarks/seed_data.py --rows 1000000
+    python benchmarks/bench_export.py --format ndjson --server-pid $(pgrep -f "uvicorn src.main:app")
+"""
+import argparse
+import io
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+CHUNK_SIZE = 1 << 16
+
+
+class RssSampler(threading.Thread):
+    """Samples VmRSS of a process from /proc until stopped."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self.start_kb = self._read_rss_kb()
+        self._stop_event = threading.Event()
+
+    def _read_rss_kb(self) -> int:
+        with open(f"/proc/{self.pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+        return 0
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.peak_kb = max(self.peak_kb, self._read_rss_kb())
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def count_arrow_rows(data: bytes, export_format: str) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if export_format == "parquet":
+        return pq.ParquetFile(io.BytesIO(data)).metadata.num_rows
+    return pa.ipc.open_stream(data).read_all().num_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv", "parquet", "arrow"])
+    parser.add_argument("--server-pid", type=int, help="PID of the API process to sample memory from")
+    parser.add_argument("--params", default="", help="Extra filter query string, e.g. 'tags=python'")
+    args = parser.parse_args()
+
+    query = {"format": args.format}
+    query.update(urllib.parse.parse_qsl(args.params))
+    url = f"{args.url}/api/v1/job-posts/export?{urllib.parse.urlencode(query)}"
+
+    sampler = RssSampler(args.server_pid) if args.server_pid else None
+    if sampler:
+        sampler.start()
+
+    total_bytes = 0
+    newlines = 0
+    first_byte_at = None
+    binary = bytearray() if args.format in ("parquet", "arrow") else None
+
+    start = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if first_byte_at is None:
+                first_byte_at = time.perf_counter()
+            total_bytes += len(chunk)
+            if binary is not None:
+                binary.extend(chunk)
+            else:
+                newlines += chunk.count(b"\n")
+    elapsed = time.perf_counter() - start
+
+    if sampler:
+        sampler.stop()
+
+    if binary is not None:
+        rows = count_arrow_rows(bytes(binary), args.format)
+    else:
+        # CSV has a header line
+        rows = newlines - 1 if args.format == "csv" else newlines
+
+    result = {
+        "benchmark": "api_export",
+        "format": args.format,
+        "rows": rows,
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "time_to_first_byte_s": (first_byte_at - start) if first_byte_at else None,
+        "rows_per_second": rows / elapsed if elapsed else None,
+        "mb_per_second": total_bytes / elapsed / 1e6 if elapsed else None,
+    }
+    if sampler:
+        result["server_rss_start_mb"] = sampler.start_kb / 1024
+        result["server_rss_peak_mb"] = sampler.peak_kb / 1024
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
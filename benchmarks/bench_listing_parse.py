@@ -0,0 +1,207 @@
+"""
+Benchmark decoding Reddit search listings: PRAW objects vs compact records.
+
+Compares, per post, the time and memory of
+- praw: json.loads + PRAW's objector (Submission objects) + the dict built
+  by scrape_job_posts, which is what SCRAPER_BACKEND=praw does
+- records: reddit_api.parse_listing into __slots__ JobPostRecord objects
+  (orjson when installed), which is what SCRAPER_BACKEND=http does
+- records_stdlib: the same with the stdlib json parser
+
+Listings are read from fixture files (raw response bodies). Record real ones
+with --record, which needs REDDIT_CLIENT_ID/SECRET/USER_AGENT; without
+fixtures, synthetic listings carrying the full set of t3 keys are used.
+
+Usage (from the repository root, scraper requirements installed):
+    python benchmarks/bench_listing_parse.py --record forhire jobbit --fixture-dir benchmarks/fixtures
+    python benchmarks/bench_listing_parse.py --fixtures benchmarks/fixtures/*.json --repeat 50
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "reddit_scraper", "src"))
+
+from reddit_api import records as record_module  # noqa: E402
+from reddit_api import RedditClient, parse_listing  # noqa: E402
+
+# Keys of a t3 (submission) object in a listing response besides the stored ones
+T3_EXTRA_KEYS = [
+    "approved_at_utc", "author_flair_background_color", "author_flair_css_class", "author_flair_richtext",
+    "author_flair_template_id", "author_flair_text", "author_flair_text_color", "author_flair_type",
+    "author_fullname", "author_is_blocked", "author_patreon_flair", "author_premium", "awarders",
+    "banned_at_utc", "banned_by", "can_gild", "can_mod_post", "category", "clicked", "content_categories",
+    "contest_mode", "created", "discussion_type", "distinguished", "domain", "downs", "edited",
+    "gilded", "gildings", "hidden", "hide_score", "is_created_from_ads_ui", "is_crosspostable",
+    "is_meta", "is_original_content", "is_reddit_media_domain", "is_robot_indexable", "is_self",
+    "is_video", "likes", "link_flair_background_color", "link_flair_css_class", "link_flair_richtext",
+    "link_flair_text", "link_flair_text_color", "link_flair_type", "locked", "media", "media_embed",
+    "media_only", "mod_note", "mod_reason_by", "mod_reason_title", "mod_reports", "name", "no_follow",
+    "num_comments", "num_crossposts", "num_reports", "over_18", "parent_whitelist_status", "permalink",
+    "pinned", "pwls", "quarantine", "removal_reason", "removed_by", "removed_by_category",
+    "report_reasons", "saved", "secure_media", "secure_media_embed", "selftext_html", "send_replies",
+    "spoiler", "stickied", "subreddit_id", "subreddit_name_prefixed", "subreddit_subscribers",
+    "subreddit_type", "suggested_sort", "thumbnail", "thumbnail_height", "thumbnail_width",
+    "top_awarded_type", "total_awards_received", "treatment_tags", "ups", "upvote_ratio",
+    "user_reports", "view_count", "visited", "whitelist_status", "wls",
+]
+
+
+def synthetic_listing(index: int, posts: int, body_words: int) -> bytes:
+    words = ["python", "remote", "senior", "django", "team", "salary", "contract", "apply", "react"]
+    children = []
+    for number in range(posts):
+        post_id = f"s{index:03d}{number:04d}"
+        body = " ".join(words[(number + i) % len(words)] for i in range(body_words))
+        data = {key: None for key in T3_EXTRA_KEYS}
+        data.update({
+            "id": post_id,
+            "name": f"t3_{post_id}",
+            "title": f"[Hiring] Synthetic role #{number}",
+            "selftext": body,
+            "selftext_html": f"<div class=\"md\"><p>{body}</p></div>",
+            "author": f"user_{number % 97}",
+            "author_fullname": f"t2_{number:06x}",
+            "created_utc": 1_700_000_000.0 + number * 60,
+            "created": 1_700_000_000.0 + number * 60,
+            "score": number % 40,
+            "ups": number % 40,
+            "url": f"https://www.reddit.com/r/forhire/comments/{post_id}/synthetic/",
+            "permalink": f"/r/forhire/comments/{post_id}/synthetic/",
+            "subreddit": "forhire",
+            "subreddit_id": "t5_2qhnf",
+            "subreddit_name_prefixed": "r/forhire",
+            "link_flair_richtext": [], "author_flair_richtext": [], "awarders": [], "gildings": {},
+            "treatment_tags": [], "user_reports": [], "mod_reports": [], "media_embed": {},
+            "secure_media_embed": {}, "is_self": True, "domain": "self.forhire", "upvote_ratio": 0.9,
+        })
+        children.append({"kind": "t3", "data": data})
+    return json.dumps({"kind": "Listing", "data": {"after": None, "dist": posts, "children": children}}).encode()
+
+
+def record_fixtures(subreddits, fixture_dir: str, limit: int):
+    """Save raw search responses from Reddit as fixtures."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    client = RedditClient.from_env()
+    try:
+        for subreddit in subreddits:
+            response = client._get(f"/r/{subreddit}/search", {
+                "q": "[Hiring]", "restrict_sr": "on", "sort": "new", "limit": limit, "raw_json": 1,
+            })
+            path = os.path.join(fixture_dir, f"listing_{subreddit}.json")
+            with open(path, "wb") as fixture:
+                fixture.write(response.content)
+            print(f"Recorded {path} ({len(response.content)} bytes)", file=sys.stderr)
+    finally:
+        client.close()
+
+
+def parse_praw(reddit, payload: bytes):
+    listing = reddit._objector.objectify(json.loads(payload))
+    return [
+        {
+            "title": post.title,
+            "body": post.selftext,
+            "author": str(post.author),
+            "created_utc": datetime.fromtimestamp(post.created_utc),
+            "score": post.score,
+            "url": post.url,
+            "subreddit": "forhire",
+            "id": post.id,
+        }
+        for post in listing
+    ]
+
+
+def parse_records(payload: bytes):
+    return parse_listing(payload, "forhire")[0]
+
+
+def parse_records_stdlib(payload: bytes):
+    return parse_listing(json.loads(payload), "forhire")[0]
+
+
+def measure(name: str, parse, payloads, repeat: int) -> dict:
+    posts = sum(len(parse(payload)) for payload in payloads)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for payload in payloads:
+            parse(payload)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    results = [parse(payload) for payload in payloads]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+
+    best = min(timings)
+    return {
+        "backend": name,
+        "posts": posts,
+        "posts_per_second": posts / best,
+        "us_per_post_best": best / posts * 1e6,
+        "us_per_post_median": statistics.median(timings) / posts * 1e6,
+        "peak_bytes_per_post": peak / posts,
+        "retained_bytes_per_post": retained / posts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", nargs="*", default=[], help="Raw listing response files")
+    parser.add_argument("--record", nargs="*", default=[], metavar="SUBREDDIT",
+                        help="Record fixtures from Reddit for these subreddits and exit")
+    parser.add_argument("--fixture-dir", default="benchmarks/fixtures")
+    parser.add_argument("--synthetic-listings", type=int, default=10)
+    parser.add_argument("--body-words", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixture_dir, limit=100)
+        return
+
+    paths = [path for pattern in args.fixtures for path in glob.glob(pattern)]
+    if paths:
+        payloads = []
+        for path in paths:
+            with open(path, "rb") as fixture:
+                payloads.append(fixture.read())
+        source = f"{len(paths)} fixture files"
+    else:
+        payloads = [synthetic_listing(i, 100, args.body_words) for i in range(args.synthetic_listings)]
+        source = f"{len(payloads)} synthetic listings"
+
+    backends = [
+        ("records", parse_records),
+        ("records_stdlib", parse_records_stdlib),
+    ]
+    try:
+        import praw
+
+        reddit = praw.Reddit(client_id="bench", client_secret="bench", user_agent="bench",
+                             check_for_async=False)
+        backends.insert(0, ("praw", lambda payload: parse_praw(reddit, payload)))
+    except ImportError:
+        print("praw is not installed, skipping the PRAW baseline", file=sys.stderr)
+
+    print(json.dumps({
+        "benchmark": "reddit_listing_parse",
+        "source": source,
+        "bytes": sum(len(payload) for payload in payloads),
+        "json_parser": record_module._json.__name__,
+        "results": [measure(name, parse, payloads, args.repeat) for name, parse in backends],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
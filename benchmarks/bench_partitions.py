@@ -0,0 +1,137 @@
+"""
+Benchmark query latency on recent date ranges of the partitioned raw_job_posts.
+
+Seeds synthetic rows (optional), makes sure every month has its partition,
+then runs the API's typical recent-range queries under EXPLAIN ANALYZE and
+reports latency percentiles and how many partitions each plan touched.
+With --compare-unpartitioned the same queries also run against a plain
+(non-partitioned) copy of the table with the same indexes.
+
+Usage (from the repository root, database migrated):
+    python benchmarks/bench_partitions.py --seed 5000000 --compare-unpartitioned
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "shared"))
+
+from sqlalchemy import create_engine, text
+
+from jobposts.partitions import ensure_partitions
+from seed_data import cleanup_job_posts, get_database_url, seed_job_posts
+
+FLAT_TABLE = "raw_job_posts_flat"
+
+QUERIES = {
+    "list_recent_14d": """
+        SELECT id, cleaned_title, cleaned_text, tags, created_utc, url
+        FROM {table}
+        WHERE created_utc >= (now() AT TIME ZONE 'UTC') - interval '14 days'
+        ORDER BY created_utc DESC, id DESC
+        LIMIT 20
+    """,
+    "count_recent_14d": """
+        SELECT count(*) FROM {table}
+        WHERE created_utc >= (now() AT TIME ZONE 'UTC') - interval '14 days'
+    """,
+    "tag_recent_30d": """
+        SELECT id, cleaned_title, created_utc FROM {table}
+        WHERE created_utc >= (now() AT TIME ZONE 'UTC') - interval '30 days'
+          AND tags @> '["python"]'
+        ORDER BY created_utc DESC, id DESC
+        LIMIT 20
+    """,
+    "stats_min_max": """
+        SELECT min(created_utc), max(created_utc) FROM {table}
+    """,
+}
+
+
+def count_relations(plan: dict) -> int:
+    """Count scan nodes on distinct relations in an EXPLAIN JSON plan."""
+    relations = set()
+
+    def walk(node):
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan)
+    return len(relations)
+
+
+def run_query(conn, sql: str, repeats: int) -> dict:
+    timings = []
+    relations = 0
+    for _ in range(repeats):
+        explain = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+        timings.append(explain[0]["Execution Time"])
+        relations = count_relations(explain[0]["Plan"])
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "relations_scanned": relations,
+    }
+
+
+def create_flat_copy(engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {FLAT_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {FLAT_TABLE} AS SELECT * FROM raw_job_posts"))
+        conn.execute(text(f"CREATE INDEX ON {FLAT_TABLE} (created_utc, id)"))
+        conn.execute(text(f"CREATE INDEX ON {FLAT_TABLE} USING gin (tags jsonb_path_ops)"))
+        conn.execute(text(f"ANALYZE {FLAT_TABLE}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic rows to insert first")
+    parser.add_argument("--spread-days", type=int, default=3 * 365)
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--compare-unpartitioned", action="store_true")
+    parser.add_argument("--cleanup", action="store_true", help="Remove synthetic rows afterwards")
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_url())
+
+    if args.seed:
+        seed_job_posts(engine, args.seed, spread_days=args.spread_days)
+    created = ensure_partitions(engine)
+
+    with engine.connect() as conn:
+        total_rows = conn.execute(text("SELECT count(*) FROM raw_job_posts")).scalar()
+
+    tables = {"partitioned": "raw_job_posts"}
+    if args.compare_unpartitioned:
+        create_flat_copy(engine)
+        tables["unpartitioned"] = FLAT_TABLE
+
+    results = {}
+    with engine.connect() as conn:
+        for label, table in tables.items():
+            results[label] = {
+                name: run_query(conn, sql.format(table=table), args.repeats)
+                for name, sql in QUERIES.items()
+            }
+
+    if args.compare_unpartitioned:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {FLAT_TABLE}"))
+    if args.cleanup:
+        cleanup_job_posts(engine)
+
+    print(json.dumps({
+        "benchmark": "partitioned_recent_queries",
+        "total_rows": total_rows,
+        "partitions_created": len(created),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark prompt prefill time per post for each analyzer prompt version.
+
+Sends the same posts through every prompt template in llm_service/src/prompts.py,
+one request at a time so consecutive requests can share the server's cached
+prefix, and with num_predict=1 so the timing is almost all prefill. Ollama
+reports prompt_eval_count/prompt_eval_duration for the prompt tokens it had to
+evaluate, so a reused prefix shows up as fewer evaluated tokens and less time.
+The first request of each version warms the cache and is not counted.
+
+Runs against OLLAMA_HOST (a real Ollama, or benchmarks/pipeline/stub_ollama.py
+started with --prefix-cache). Posts come from the database with --from-db,
+otherwise from the fake Reddit listing generator.
+
+Usage (from the repository root):
+    OLLAMA_HOST=http://localhost:11434 python benchmarks/bench_prompt_prefill.py --posts 50
+    python benchmarks/bench_prompt_prefill.py --from-db --posts 200 --versions v1 v2
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "llm_service", "src"))
+sys.path.insert(0, os.path.join(BENCH_DIR, "pipeline"))
+
+from prompts import TEMPLATES  # noqa: E402
+
+
+def load_posts(count: int, from_db: bool):
+    if from_db:
+        from sqlalchemy import create_engine, text
+
+        from seed_data import get_database_url
+
+        engine = create_engine(get_database_url())
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT title, coalesce(body, '') FROM raw_job_posts ORDER BY created_utc DESC LIMIT :n"
+            ), {"n": count}).all()
+        return [(title, body) for title, body in rows]
+
+    import fake_reddit
+
+    factory = fake_reddit.ListingFactory(posts_per_listing=count, body_words=250)
+    return [(child["data"]["title"], child["data"]["selftext"])
+            for child in factory.listing("forhire", count)["data"]["children"]]
+
+
+def chat(host: str, model: str, messages, keep_alive) -> dict:
+    request = urllib.request.Request(
+        f"{host.rstrip('/')}/api/chat",
+        data=json.dumps({
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "keep_alive": keep_alive,
+            "options": {"temperature": 0, "num_predict": 1},
+        }).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=600) as response:
+        return json.loads(response.read())
+
+
+def run_version(host: str, model: str, template, posts, keep_alive) -> dict:
+    # Warm the model and the template's prefix
+    chat(host, model, template.messages(*posts[0]), keep_alive)
+
+    prefill_ms, evaluated, wall_ms = [], [], []
+    for title, body in posts[1:]:
+        started = time.perf_counter()
+        response = chat(host, model, template.messages(title, body), keep_alive)
+        wall_ms.append((time.perf_counter() - started) * 1000)
+        prefill_ms.append((response.get("prompt_eval_duration") or 0) / 1e6)
+        evaluated.append(response.get("prompt_eval_count") or 0)
+
+    prompt_chars = statistics.mean(
+        sum(len(message["content"]) for message in template.messages(title, body)) for title, body in posts
+    )
+    prefill_ms.sort()
+    return {
+        "prompt_version": template.version,
+        "static_prefix_chars": len(template.static_prefix()),
+        "mean_prompt_chars": prompt_chars,
+        "mean_evaluated_tokens": statistics.mean(evaluated),
+        "prefill_ms_mean": statistics.mean(prefill_ms),
+        "prefill_ms_p50": statistics.median(prefill_ms),
+        "prefill_ms_p95": prefill_ms[min(len(prefill_ms) - 1, int(len(prefill_ms) * 0.95))],
+        "request_ms_mean": statistics.mean(wall_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("OLLAMA_HOST", "http://localhost:11434"))
+    parser.add_argument("--model", default=os.getenv("OLLAMA_MODEL", "llama3.1:8b"))
+    parser.add_argument("--posts", type=int, default=50)
+    parser.add_argument("--from-db", action="store_true", help="Use the newest posts in raw_job_posts")
+    parser.add_argument("--versions", nargs="+", default=list(TEMPLATES))
+    parser.add_argument("--keep-alive", default="30m")
+    args = parser.parse_args()
+
+    if args.posts < 2:
+        parser.error("--posts must be at least 2")
+    posts = load_posts(args.posts, args.from_db)
+    results = []
+    for version in args.versions:
+        print(f"Prompt {version}...", file=sys.stderr)
+        results.append(run_version(args.host, args.model, TEMPLATES[version], posts, args.keep_alive))
+
+    print(json.dumps({
+        "benchmark": "prompt_prefill",
+        "host": args.host,
+        "model": args.model,
+        "posts": len(posts) - 1,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
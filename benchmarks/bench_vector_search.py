@@ -0,0 +1,181 @@
+"""
+Benchmark recall@10 and latency of the pgvector HNSW index used for semantic search.
+
+Generates clustered synthetic unit vectors (clusters stand in for job
+categories), inserts them into a scratch table that has the same HNSW index
+as job_embeddings, then runs held-out queries for several ef_search values
+and compares each result with the exact top-10 computed by brute force in
+NumPy. Vectors are inserted with the index already in place, the same
+incremental path the LLM consumer uses, so insert throughput is reported too.
+
+The vectors are kept in a memory-mapped file so ground truth at 1M x 768
+does not need to fit in RAM.
+
+Usage (from the repository root, database migrated):
+    python benchmarks/bench_vector_search.py --vectors 1000000 --queries 200
+    python benchmarks/bench_vector_search.py --vectors 100000 --ef-search 40 64 128 --keep
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+from seed_data import get_database_url
+
+BENCH_TABLE = "bench_vectors"
+CHUNK_SIZE = 20_000
+
+
+def make_vectors(path: str, count: int, dim: int, clusters: int, seed: int) -> np.memmap:
+    """Write `count` clustered unit vectors to a memory-mapped float32 file."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = np.memmap(path, dtype=np.float32, mode="w+", shape=(count, dim))
+    for start in range(0, count, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, count)
+        chunk = centroids[rng.integers(0, clusters, stop - start)]
+        chunk = chunk + 0.6 * rng.standard_normal(chunk.shape).astype(np.float32)
+        vectors[start:stop] = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+    vectors.flush()
+    return vectors
+
+
+def vector_literal(vector) -> str:
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+def load_vectors(engine, vectors: np.memmap, dim: int, m: int, ef_construction: int) -> float:
+    """Create the scratch table with its HNSW index and COPY the vectors in. Returns seconds."""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {BENCH_TABLE} (id INTEGER PRIMARY KEY, embedding vector({dim}) NOT NULL)"))
+        conn.execute(text(
+            f"CREATE INDEX ON {BENCH_TABLE} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {m}, ef_construction = {ef_construction})"
+        ))
+
+    start = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for chunk_start in range(0, len(vectors), CHUNK_SIZE):
+            chunk = vectors[chunk_start:chunk_start + CHUNK_SIZE]
+            buffer = io.StringIO()
+            for offset, vector in enumerate(chunk):
+                buffer.write(f"{chunk_start + offset}\t{vector_literal(vector)}\n")
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {BENCH_TABLE} (id, embedding) FROM STDIN", buffer)
+            raw.commit()
+            print(f"Inserted {min(chunk_start + CHUNK_SIZE, len(vectors))}/{len(vectors)} vectors")
+        cursor.execute(f"ANALYZE {BENCH_TABLE}")
+        raw.commit()
+    finally:
+        raw.close()
+    return time.perf_counter() - start
+
+
+def exact_top_k(vectors: np.memmap, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k ids (vectors are unit length, so cosine is a dot product)."""
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), k), dtype=np.int64)
+    for start in range(0, len(vectors), CHUNK_SIZE * 5):
+        chunk = np.asarray(vectors[start:start + CHUNK_SIZE * 5])
+        scores = queries @ chunk.T
+        ids = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+    return best_ids
+
+
+def run_queries(engine, queries: np.ndarray, truth: np.ndarray, ef_search: int, k: int) -> dict:
+    latencies = []
+    recalls = []
+    sql = text(f"SELECT id FROM {BENCH_TABLE} ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k")
+    with engine.connect() as conn:
+        conn.execute(text(f"SET hnsw.ef_search = {int(ef_search)}"))
+        for query, expected in zip(queries, truth):
+            literal = vector_literal(query)
+            start = time.perf_counter()
+            ids = conn.execute(sql, {"q": literal, "k": k}).scalars().all()
+            latencies.append((time.perf_counter() - start) * 1000)
+            recalls.append(len(set(ids) & set(expected.tolist())) / k)
+
+    latencies.sort()
+    return {
+        "ef_search": ef_search,
+        "recall_at_10": statistics.mean(recalls),
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=768, help="Must match EMBEDDING_DIMENSIONS for realistic numbers")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[40, 64, 100, 200])
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table for further runs")
+    args = parser.parse_args()
+
+    k = 10
+    engine = create_engine(get_database_url())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vectors = make_vectors(
+            os.path.join(tmp_dir, "vectors.f32"), args.vectors, args.dim, args.clusters, args.seed
+        )
+        # Queries are perturbed copies of random stored vectors, so they are
+        # close to, but never identical with, what is in the index
+        rng = np.random.default_rng(args.seed + 1)
+        picks = vectors[rng.integers(0, args.vectors, args.queries)]
+        queries = picks + 0.2 * rng.standard_normal(picks.shape).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        load_seconds = load_vectors(engine, vectors, args.dim, args.m, args.ef_construction)
+        truth = exact_top_k(vectors, queries, k)
+        results = [run_queries(engine, queries, truth, ef, k) for ef in args.ef_search]
+        del vectors
+
+    with engine.connect() as conn:
+        index_bytes = conn.execute(text(
+            "SELECT sum(pg_relation_size(indexrelid)) FROM pg_index "
+            "WHERE indrelid = CAST(:table AS regclass) AND NOT indisprimary"
+        ), {"table": BENCH_TABLE}).scalar()
+
+    if not args.keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+
+    print(json.dumps({
+        "benchmark": "vector_search_hnsw",
+        "vectors": args.vectors,
+        "dim": args.dim,
+        "m": args.m,
+        "ef_construction": args.ef_construction,
+        "incremental_insert": {
+            "seconds": load_seconds,
+            "vectors_per_second": args.vectors / load_seconds if load_seconds else None,
+        },
+        "index_size_mb": (index_bytes or 0) / 1024 / 1024,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
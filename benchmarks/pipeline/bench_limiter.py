@@ -0,0 +1,138 @@
+"""
+Compare the adaptive LLM concurrency limiter with fixed limits against the stub Ollama.
+
+Starts stub_ollama.py with a saturation curve (--parallel slots, and an
+--overload-penalty that slows requests down while others queue), then has
+--clients threads send chat requests as fast as the limiter lets them for
+each strategy in turn. Reports throughput, request latency (time at the
+stub) and total latency (including the wait for a limiter slot), plus the
+limit the adaptive limiter settled on.
+
+Usage (from the repository root, llm_service requirements installed):
+    python benchmarks/pipeline/bench_limiter.py --parallel 4 --overload-penalty 0.2 --fixed 1 4 16
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+os.environ.setdefault("METRICS_ENABLED", "false")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "llm_service", "src"))
+
+from concurrency import AdaptiveLimiter  # noqa: E402
+
+import stub_ollama  # noqa: E402
+
+PROMPT = "TITLE: [Hiring] Backend Engineer (python, aws)\n\nBODY: " + "python aws remote team " * 100
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else None
+
+
+def run_strategy(name: str, limiter: AdaptiveLimiter, url: str, clients: int, duration: float) -> dict:
+    request_ms, total_ms, limits = [], [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    payload = json.dumps({"model": "stub", "messages": [{"role": "user", "content": PROMPT}]}).encode()
+
+    def client():
+        local_request, local_total = [], []
+        while time.monotonic() < deadline:
+            queued = time.perf_counter()
+            with limiter.acquire():
+                started = time.perf_counter()
+                request = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+                with urllib.request.urlopen(request, timeout=300) as response:
+                    response.read()
+                finished = time.perf_counter()
+            local_request.append((finished - started) * 1000)
+            local_total.append((finished - queued) * 1000)
+        with lock:
+            request_ms.extend(local_request)
+            total_ms.extend(local_total)
+
+    def sample_limit(stop: threading.Event):
+        while not stop.is_set():
+            limits.append(limiter.limit)
+            stop.wait(0.25)
+
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_limit, args=(stop,), daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+
+    request_ms.sort()
+    total_ms.sort()
+    return {
+        "strategy": name,
+        "requests": len(request_ms),
+        "requests_per_second": len(request_ms) / elapsed,
+        "request_p50_ms": percentile(request_ms, 0.50),
+        "request_p95_ms": percentile(request_ms, 0.95),
+        "total_p50_ms": percentile(total_ms, 0.50),
+        "total_p95_ms": percentile(total_ms, 0.95),
+        "mean_limit": statistics.mean(limits) if limits else None,
+        "final_limit": limiter.limit,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=18435)
+    parser.add_argument("--parallel", type=int, default=4, help="Stub slots (the real capacity)")
+    parser.add_argument("--overload-penalty", type=float, default=0.2)
+    parser.add_argument("--base-ms", type=float, default=20.0)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--output-tokens", type=int, default=40)
+    parser.add_argument("--clients", type=int, default=32, help="Offered concurrency")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per strategy")
+    parser.add_argument("--max-limit", type=int, default=32)
+    parser.add_argument("--fixed", type=int, nargs="*", default=[1, 4, 32], help="Fixed limits to compare")
+    args = parser.parse_args()
+
+    strategies = [("adaptive", lambda: AdaptiveLimiter(initial_limit=1, max_limit=args.max_limit))]
+    strategies += [
+        (f"fixed_{limit}", lambda limit=limit: AdaptiveLimiter(limit, min_limit=limit, max_limit=limit))
+        for limit in args.fixed
+    ]
+
+    results = []
+    for name, make_limiter in strategies:
+        server, model = stub_ollama.start_server(
+            args.port, args.base_ms, 2000.0, args.tokens_per_second, args.output_tokens,
+            args.parallel, args.overload_penalty
+        )
+        try:
+            result = run_strategy(
+                name, make_limiter(), f"http://127.0.0.1:{args.port}/api/chat", args.clients, args.duration
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        result["stub_max_in_flight"] = model.stats()["max_in_flight"]
+        print(f"{name}: {result['requests_per_second']:.1f} req/s", file=sys.stderr)
+        results.append(result)
+
+    print(json.dumps({
+        "benchmark": "llm_concurrency_limiter",
+        "stub_parallel": args.parallel,
+        "overload_penalty": args.overload_penalty,
+        "clients": args.clients,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
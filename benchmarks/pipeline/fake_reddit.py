@@ -0,0 +1,149 @@
+"""
+Fake Reddit API serving synthetic [Hiring] search listings.
+
+Implements just enough of Reddit for PRAW: the OAuth token endpoint and the
+subreddit search listing. Every listing request returns posts that have not
+been served before, so each scraper run inserts a fresh batch.
+
+Point PRAW at it with environment variables:
+    praw_oauth_url=http://127.0.0.1:8181 praw_reddit_url=http://127.0.0.1:8181
+
+Usage:
+    python benchmarks/pipeline/fake_reddit.py --port 8181 --posts-per-listing 100
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SKILLS = ["python", "django", "react", "typescript", "go", "rust", "aws", "kubernetes", "sql", "figma"]
+ROLES = ["Backend Engineer", "Frontend Developer", "Data Engineer", "DevOps Engineer", "Designer"]
+
+
+class ListingFactory:
+    """Generates unique synthetic submissions."""
+
+    def __init__(self, posts_per_listing: int, body_words: int, seed: int = 0):
+        self.posts_per_listing = posts_per_listing
+        self.body_words = body_words
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.id_prefix = f"{int(time.time()):x}"
+        self.served = 0
+
+    def submission(self, subreddit: str) -> dict:
+        with self._lock:
+            number = next(self._ids)
+            rng_state = self._random.random()
+        rng = random.Random(rng_state)
+        role = rng.choice(ROLES)
+        skills = rng.sample(SKILLS, 3)
+        words = [rng.choice(SKILLS + ["remote", "team", "salary", "experience", "apply"])
+                 for _ in range(self.body_words)]
+        post_id = f"b{self.id_prefix}{number:x}"
+        return {
+            "kind": "t3",
+            "data": {
+                "id": post_id,
+                "name": f"t3_{post_id}",
+                "title": f"[Hiring] {role} ({', '.join(skills)})",
+                "selftext": " ".join(words),
+                "author": f"bench_user_{number % 50}",
+                "created_utc": time.time() - rng.randint(0, 3600),
+                "score": rng.randint(0, 50),
+                "url": f"https://www.reddit.com/r/{subreddit}/comments/{post_id}/",
+                "permalink": f"/r/{subreddit}/comments/{post_id}/",
+                "subreddit": subreddit,
+                "num_comments": 0,
+            },
+        }
+
+    def listing(self, subreddit: str, limit: int) -> dict:
+        count = min(limit, self.posts_per_listing)
+        children = [self.submission(subreddit) for _ in range(count)]
+        with self._lock:
+            self.served += count
+        return {"kind": "Listing", "data": {"after": None, "before": None, "dist": count, "children": children}}
+
+
+def make_handler(factory: ListingFactory, latency_ms: float):
+    class FakeRedditHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload: dict, status: int = 200):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if self.path.startswith("/api/v1/access_token"):
+                self._send_json({
+                    "access_token": "bench-token",
+                    "token_type": "bearer",
+                    "expires_in": 86400,
+                    "scope": "*",
+                })
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            # /r/<subreddit>/search[.json]
+            if len(parts) >= 3 and parts[0] == "r" and parts[2].startswith("search"):
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+                limit = int(parse_qs(url.query).get("limit", ["100"])[0])
+                self._send_json(factory.listing(parts[1], limit))
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+    return FakeRedditHandler
+
+
+def start_server(port: int, posts_per_listing: int = 100, body_words: int = 250,
+                 latency_ms: float = 0.0):
+    """
+    Start the fake Reddit server on a background thread.
+
+    Returns:
+        (server, factory); call server.shutdown() to stop it
+    """
+    factory = ListingFactory(posts_per_listing, body_words)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(factory, latency_ms))
+    threading.Thread(target=server.serve_forever, name="fake-reddit", daemon=True).start()
+    return server, factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8181)
+    parser.add_argument("--posts-per-listing", type=int, default=100)
+    parser.add_argument("--body-words", type=int, default=250)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to each listing response")
+    args = parser.parse_args()
+
+    server, _ = start_server(args.port, args.posts_per_listing, args.body_words, args.latency_ms)
+    print(f"Fake Reddit listening on http://127.0.0.1:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
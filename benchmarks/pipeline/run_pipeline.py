@@ -0,0 +1,358 @@
+"""
+End-to-end pipeline benchmark: scraper -> RabbitMQ -> LLM consumers -> API.
+
+Brings up a throwaway Postgres and RabbitMQ (docker-compose.yml next to this
+file), migrates the schema, and replaces the two external services with local
+fakes: fake_reddit.py serves fresh [Hiring] listings to PRAW and
+stub_ollama.py answers chat/embedding calls with a configurable latency and
+token rate. It then
+
+1. starts N `llm_service/src/consumer.py` worker processes,
+2. runs `reddit_scraper/src/scraper.py` --scrape-runs times,
+3. waits until every scraped post has been processed, and
+4. starts the API and drives a read-heavy load against it.
+
+The JSON report holds pipeline throughput (posts/s), end-to-end latency
+percentiles (scraped_at -> processed_at), API requests/s with per-endpoint
+latency percentiles, and the stub's request counts.
+
+Usage (from the repository root, with the scraper, llm_service and api
+requirements installed and Docker available):
+    python benchmarks/pipeline/run_pipeline.py --workers 4 --scrape-runs 5
+    python benchmarks/pipeline/run_pipeline.py --workers 8 --tokens-per-second 80 --parallel 4 \
+        --output pipeline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+from sqlalchemy import create_engine, text
+
+import fake_reddit
+import stub_ollama
+
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(PIPELINE_DIR))
+COMPOSE_FILE = os.path.join(PIPELINE_DIR, "docker-compose.yml")
+
+BENCH_ENV = {
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_HOST": "127.0.0.1",
+    "POSTGRES_PORT": "55432",
+    "RABBITMQ_HOST": "127.0.0.1",
+    "RABBITMQ_PORT": "55672",
+    "RABBITMQ_QUEUE": "bench_job_posts_queue",
+    "METRICS_ENABLED": "false",
+    "TRACING_EXPORTER": "none",
+    "PYTHONUNBUFFERED": "1",
+}
+
+API_ENDPOINTS = [
+    ("list", "/api/v1/job-posts", {"page_size": 20}),
+    ("list_tags", "/api/v1/job-posts", {"page_size": 20, "tags": "python,aws"}),
+    ("search", "/api/v1/job-posts", {"page_size": 20, "search": "engineer"}),
+    ("semantic", "/api/v1/job-posts/search", {"semantic": "python backend engineer", "limit": 10}),
+    ("tags", "/api/v1/tags", {}),
+    ("stats", "/api/v1/stats", {}),
+]
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.mean(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def service_env(*pythonpath: str, **extra) -> dict:
+    env = dict(os.environ, **BENCH_ENV, **extra)
+    env["PYTHONPATH"] = os.pathsep.join(os.path.join(REPO_ROOT, path) for path in pythonpath)
+    return env
+
+
+def compose(*args: str):
+    subprocess.run(["docker", "compose", "-f", COMPOSE_FILE, *args], check=True)
+
+
+def migrate():
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=os.path.join(REPO_ROOT, "shared"), env=service_env("shared"), check=True
+    )
+
+
+def start_consumers(count: int, ollama_url: str, log_dir: str) -> list:
+    workers = []
+    for index in range(count):
+        log = open(os.path.join(log_dir, f"consumer-{index}.log"), "w")
+        workers.append(subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, "llm_service", "src", "consumer.py")],
+            env=service_env("llm_service/src", "shared", OLLAMA_HOST=ollama_url),
+            stdout=log, stderr=subprocess.STDOUT,
+        ))
+    return workers
+
+
+def run_scraper(reddit_url: str, log_dir: str, run_index: int):
+    env = service_env(
+        "reddit_scraper/src", "shared",
+        praw_oauth_url=reddit_url,
+        praw_reddit_url=reddit_url,
+        REDDIT_CLIENT_ID="bench",
+        REDDIT_CLIENT_SECRET="bench",
+        REDDIT_USER_AGENT="jobposts-pipeline-benchmark",
+    )
+    with open(os.path.join(log_dir, f"scraper-{run_index}.log"), "w") as log:
+        subprocess.run(
+            [sys.executable, os.path.join(REPO_ROOT, "reddit_scraper", "src", "scraper.py")],
+            env=env, stdout=log, stderr=subprocess.STDOUT, check=True,
+        )
+
+
+def wait_processed(engine, id_prefix: str, expected: int, timeout: float) -> int:
+    """Poll until `expected` posts with the run's reddit_id prefix are processed."""
+    query = text(
+        "SELECT count(*) FROM raw_job_posts WHERE reddit_id LIKE :prefix AND processed_at IS NOT NULL"
+    )
+    deadline = time.monotonic() + timeout
+    processed = 0
+    while time.monotonic() < deadline:
+        with engine.connect() as conn:
+            processed = conn.execute(query, {"prefix": f"{id_prefix}%"}).scalar()
+        if processed >= expected:
+            break
+        time.sleep(0.5)
+    return processed
+
+
+def pipeline_latencies(engine, id_prefix: str):
+    """End-to-end seconds per post and the first-scraped/last-processed span."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT scraped_at, processed_at FROM raw_job_posts "
+            "WHERE reddit_id LIKE :prefix AND processed_at IS NOT NULL"
+        ), {"prefix": f"{id_prefix}%"}).all()
+    if not rows:
+        return [], 0.0
+    latencies = [(processed - scraped).total_seconds() for scraped, processed in rows]
+    span = (max(row.processed_at for row in rows) - min(row.scraped_at for row in rows)).total_seconds()
+    return latencies, span
+
+
+def start_api(port: int, ollama_url: str, log_dir: str) -> subprocess.Popen:
+    log = open(os.path.join(log_dir, "api.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=os.path.join(REPO_ROOT, "api"),
+        env=service_env("api", "shared", OLLAMA_HOST=ollama_url, CACHE_ENABLED="false"),
+        stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not become healthy, see api.log")
+
+
+def api_load(port: int, duration: float, concurrency: int) -> dict:
+    """Round-robin the endpoint mix over keep-alive connections for `duration` seconds."""
+    latencies = {name: [] for name, _, _ in API_ENDPOINTS}
+    errors = {name: 0 for name, _, _ in API_ENDPOINTS}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(offset: int):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = {name: [] for name in latencies}
+        local_errors = dict.fromkeys(errors, 0)
+        index = offset
+        while time.monotonic() < deadline:
+            name, path, params = API_ENDPOINTS[index % len(API_ENDPOINTS)]
+            index += 1
+            started = time.perf_counter()
+            try:
+                connection.request("GET", f"{path}?{urlencode(params)}" if params else path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors[name] += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                local_errors[name] += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local[name].append((time.perf_counter() - started) * 1000)
+        with lock:
+            for name in latencies:
+                latencies[name].extend(local[name])
+                errors[name] += local_errors[name]
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    return {
+        "duration_seconds": elapsed,
+        "concurrency": concurrency,
+        "requests": total,
+        "requests_per_second": total / elapsed if elapsed else None,
+        "errors": sum(errors.values()),
+        "endpoints": {
+            name: dict(percentiles(latencies[name]), errors=errors[name]) for name in latencies
+        },
+    }
+
+
+def stop(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="LLM consumer processes")
+    parser.add_argument("--scrape-runs", type=int, default=3)
+    parser.add_argument("--posts-per-run", type=int, default=100, help="Posts per listing, at most 100")
+    parser.add_argument("--body-words", type=int, default=250)
+    parser.add_argument("--reddit-latency-ms", type=float, default=0.0)
+    parser.add_argument("--ollama-base-ms", type=float, default=50.0)
+    parser.add_argument("--prefill-tps", type=float, default=2000.0)
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--output-tokens", type=int, default=120)
+    parser.add_argument("--parallel", type=int, default=1, help="Concurrent requests the stub Ollama serves")
+    parser.add_argument("--ollama-load-ms", type=float, default=0.0,
+                        help="Stub model load time once keep_alive has expired")
+    parser.add_argument("--process-timeout", type=float, default=900.0)
+    parser.add_argument("--api-duration", type=float, default=30.0)
+    parser.add_argument("--api-concurrency", type=int, default=16)
+    parser.add_argument("--reddit-port", type=int, default=18181)
+    parser.add_argument("--ollama-port", type=int, default=18434)
+    parser.add_argument("--api-port", type=int, default=18000)
+    parser.add_argument("--no-compose", action="store_true", help="Use already running Postgres/RabbitMQ")
+    parser.add_argument("--keep", action="store_true", help="Leave the compose services running")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    if not args.no_compose:
+        compose("up", "-d", "--wait")
+    log_dir = tempfile.mkdtemp(prefix="pipeline-bench-")
+    processes = []
+    reddit_server = ollama_server = None
+    try:
+        migrate()
+        reddit_server, factory = fake_reddit.start_server(
+            args.reddit_port, args.posts_per_run, args.body_words, args.reddit_latency_ms
+        )
+        ollama_server, latency_model = stub_ollama.start_server(
+            args.ollama_port, args.ollama_base_ms, args.prefill_tps, args.tokens_per_second,
+            args.output_tokens, args.parallel, load_ms=args.ollama_load_ms
+        )
+        reddit_url = f"http://127.0.0.1:{args.reddit_port}"
+        ollama_url = f"http://127.0.0.1:{args.ollama_port}"
+        engine = create_engine(
+            "postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
+            .format(**BENCH_ENV)
+        )
+
+        workers = start_consumers(args.workers, ollama_url, log_dir)
+        processes.extend(workers)
+
+        print(f"Scraping {args.scrape_runs} x {args.posts_per_run} posts into {args.workers} workers "
+              f"(logs in {log_dir})", file=sys.stderr)
+        started_at = datetime.utcnow()
+        scrape_started = time.perf_counter()
+        for run_index in range(args.scrape_runs):
+            run_scraper(reddit_url, log_dir, run_index)
+        scrape_seconds = time.perf_counter() - scrape_started
+
+        expected = factory.served
+        processed = wait_processed(engine, factory.id_prefix, expected, args.process_timeout)
+        latencies, span_seconds = pipeline_latencies(engine, factory.id_prefix)
+        stop(workers)
+
+        api = start_api(args.api_port, ollama_url, log_dir)
+        processes.append(api)
+        print(f"Driving the API for {args.api_duration:.0f}s", file=sys.stderr)
+        api_report = api_load(args.api_port, args.api_duration, args.api_concurrency)
+
+        report = {
+            "benchmark": "pipeline_end_to_end",
+            "started_at": started_at.isoformat(),
+            "config": {
+                "workers": args.workers,
+                "scrape_runs": args.scrape_runs,
+                "posts_per_run": args.posts_per_run,
+                "ollama_base_ms": args.ollama_base_ms,
+                "prefill_tps": args.prefill_tps,
+                "tokens_per_second": args.tokens_per_second,
+                "output_tokens": args.output_tokens,
+                "ollama_parallel": args.parallel,
+                "ollama_load_ms": args.ollama_load_ms,
+            },
+            "pipeline": {
+                "posts_scraped": expected,
+                "posts_processed": processed,
+                "scrape_seconds": scrape_seconds,
+                "wall_seconds": span_seconds,
+                "posts_per_second": processed / span_seconds if span_seconds else None,
+                "end_to_end_latency_seconds": percentiles(latencies),
+            },
+            "ollama": latency_model.stats(),
+            "api": api_report,
+            "logs": log_dir,
+        }
+        output = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w") as report_file:
+                report_file.write(output + "\n")
+        print(output)
+    finally:
+        stop(processes)
+        for server in (reddit_server, ollama_server):
+            if server is not None:
+                server.shutdown()
+        if not args.no_compose and not args.keep:
+            compose("down", "-v")
+
+
+if __name__ == "__main__":
+    main()
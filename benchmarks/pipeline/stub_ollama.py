@@ -0,0 +1,278 @@
+"""
+Stub Ollama server with a configurable latency model.
+
+Serves /api/chat, /api/generate, /api/embeddings and /api/tags like Ollama
+does for non-streaming requests. A request takes
+
+    base latency + prompt tokens / prefill rate + output tokens / token rate
+
+and at most --parallel requests are served at once (like OLLAMA_NUM_PARALLEL),
+so extra concurrent requests queue, which makes the saturation point of a
+consumer fleet visible. --overload-penalty additionally slows every request
+down while others are queued behind it (memory pressure, context swapping),
+so overload costs throughput and not only latency. Prompt tokens are
+estimated at 4 characters each.
+
+With --prefix-cache, the stub keeps the last prompt of each of its
+--parallel slots and, like llama.cpp's slot cache, only charges (and reports
+in prompt_eval_count) the tokens after the longest common prefix with one of
+them.
+
+With --load-ms, a model that has not been used for its keep_alive (from the
+request, default 5m like Ollama) is unloaded, and the next request pays the
+load time and reports it as load_duration, as after an idle period.
+
+Usage:
+    python benchmarks/pipeline/stub_ollama.py --port 11500 --tokens-per-second 40 --parallel 2
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIMENSIONS = 768
+KNOWN_TAGS = ["python", "django", "react", "typescript", "go", "rust", "aws", "kubernetes", "sql", "figma", "remote"]
+
+
+class LatencyModel:
+    """Simulated inference cost and capacity of one Ollama node."""
+
+    def __init__(self, base_ms: float, prefill_tps: float, tokens_per_second: float,
+                 output_tokens: int, parallel: int, overload_penalty: float = 0.0, load_ms: float = 0.0,
+                 prefix_cache: bool = False):
+        self.prefix_cache = prefix_cache
+        self.cached_prompts = collections.deque(maxlen=parallel)
+        self.load_ms = load_ms
+        self.loaded_until = {}
+        self.load_lock = threading.Lock()
+        self.loads = 0
+        self.base_ms = base_ms
+        self.parallel = parallel
+        self.overload_penalty = overload_penalty
+        self.prefill_tps = prefill_tps
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.slots = threading.Semaphore(parallel)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def uncached_tokens(self, prompt: str) -> int:
+        """Prompt tokens left to evaluate after reusing the best cached prefix."""
+        if not self.prefix_cache:
+            return len(prompt) // 4
+        with self.lock:
+            shared = max((len(os.path.commonprefix([prompt, cached])) for cached in self.cached_prompts), default=0)
+            self.cached_prompts.append(prompt)
+        return (len(prompt) - shared) // 4
+
+    def load(self, model_name: str, keep_alive=None) -> float:
+        """Load the model if it has expired; returns the load time in seconds."""
+        if not self.load_ms:
+            return 0.0
+        with self.load_lock:
+            now = time.monotonic()
+            loaded = self.loaded_until.get(model_name, 0.0) > now
+            if not loaded:
+                time.sleep(self.load_ms / 1000)
+                self.loads += 1
+            self.loaded_until[model_name] = time.monotonic() + parse_keep_alive(keep_alive)
+        return 0.0 if loaded else self.load_ms / 1000
+
+    def run(self, prompt_tokens: int, output_tokens: int, model_name: str = "stub", keep_alive=None) -> dict:
+        """Block for the simulated duration; returns Ollama's timing fields (ns)."""
+        load_seconds = self.load(model_name, keep_alive)
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            with self.slots:
+                with self.lock:
+                    queued = max(0, self.in_flight - self.parallel)
+                slowdown = 1 + self.overload_penalty * queued / self.parallel
+                prefill = prompt_tokens / self.prefill_tps * slowdown if self.prefill_tps else 0.0
+                generate = output_tokens / self.tokens_per_second * slowdown if self.tokens_per_second else 0.0
+                time.sleep(self.base_ms / 1000 + prefill + generate)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        total = time.perf_counter() - started
+        return {
+            "total_duration": int(total * 1e9),
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prefill * 1e9),
+            "eval_count": output_tokens,
+            "eval_duration": int(generate * 1e9),
+        }
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"requests": self.requests, "max_in_flight": self.max_in_flight, "model_loads": self.loads}
+
+
+def parse_keep_alive(keep_alive) -> float:
+    """Seconds from an Ollama keep_alive value (seconds, '30m', '1h', negative = forever)."""
+    if keep_alive is None:
+        return 300.0
+    if isinstance(keep_alive, (int, float)):
+        seconds = float(keep_alive)
+    else:
+        match = re.fullmatch(r"(-?[\d.]+)(ms|s|m|h)?", str(keep_alive).strip())
+        if not match:
+            return 300.0
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+        seconds = float(match.group(1)) * scale
+    return float("inf") if seconds < 0 else seconds
+
+
+def analysis_reply(prompt: str) -> str:
+    """A valid analyzer JSON answer derived from the prompt's TITLE line."""
+    match = re.search(r"TITLE:\s*(.*)", prompt)
+    title = match.group(1).strip() if match else "Job post"
+    title = re.sub(r"^\[hiring\]\s*", "", title, flags=re.IGNORECASE)
+    lowered = prompt.lower()
+    tags = [tag for tag in KNOWN_TAGS if tag in lowered][:5] or ["general"]
+    return json.dumps({
+        "cleaned_title": title[:200],
+        "cleaned_text": f"Synthetic summary for {title}."[:1000],
+        "tags": tags,
+    })
+
+
+def fake_embedding(text: str) -> list:
+    """Deterministic unit-ish vector from the text hash."""
+    digest = hashlib.sha256(text.encode()).digest()
+    return [((digest[i % len(digest)] + i) % 255) / 255.0 - 0.5 for i in range(EMBEDDING_DIMENSIONS)]
+
+
+def make_handler(model: LatencyModel):
+    class StubOllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload: dict, status: int = 200):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def do_GET(self):
+            if self.path.startswith("/api/tags"):
+                self._send_json({"models": [{"name": "stub:latest"}]})
+            elif self.path in ("/", "/api/version"):
+                self._send_json({"version": "stub"})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            request = self._read_json()
+            created_at = datetime.now(timezone.utc).isoformat()
+
+            if self.path.startswith("/api/chat"):
+                messages = request.get("messages") or []
+                prompt = "\n".join(str(message.get("content", "")) for message in messages)
+                if not prompt.strip():
+                    # Empty chat is how clients load a model without generating
+                    load_seconds = model.load(request.get("model"), request.get("keep_alive"))
+                    self._send_json({"model": request.get("model"), "created_at": created_at,
+                                     "message": {"role": "assistant", "content": ""}, "done": True,
+                                     "load_duration": int(load_seconds * 1e9)})
+                    return
+                options = request.get("options") or {}
+                output_tokens = min(model.output_tokens, options.get("num_predict") or model.output_tokens)
+                timings = model.run(model.uncached_tokens(prompt), output_tokens, request.get("model"),
+                                    request.get("keep_alive"))
+                self._send_json({
+                    "model": request.get("model"),
+                    "created_at": created_at,
+                    "message": {"role": "assistant", "content": analysis_reply(prompt)},
+                    "done": True,
+                    **timings,
+                })
+            elif self.path.startswith("/api/generate"):
+                prompt = request.get("prompt") or ""
+                timings = model.run(len(prompt) // 4, model.output_tokens if prompt else 0,
+                                    request.get("model"), request.get("keep_alive"))
+                self._send_json({
+                    "model": request.get("model"),
+                    "created_at": created_at,
+                    "response": analysis_reply(prompt) if prompt else "",
+                    "done": True,
+                    **timings,
+                })
+            elif self.path.startswith("/api/embeddings"):
+                prompt = request.get("prompt") or ""
+                model.run(len(prompt) // 4, 0, request.get("model"), request.get("keep_alive"))
+                self._send_json({"embedding": fake_embedding(prompt)})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+    return StubOllamaHandler
+
+
+def start_server(port: int, base_ms: float = 50.0, prefill_tps: float = 2000.0,
+                 tokens_per_second: float = 40.0, output_tokens: int = 120, parallel: int = 1,
+                 overload_penalty: float = 0.0, load_ms: float = 0.0, prefix_cache: bool = False):
+    """
+    Start the stub on a background thread.
+
+    Returns:
+        (server, latency model); call server.shutdown() to stop it
+    """
+    model = LatencyModel(base_ms, prefill_tps, tokens_per_second, output_tokens, parallel, overload_penalty,
+                         load_ms, prefix_cache)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(model))
+    threading.Thread(target=server.serve_forever, name="stub-ollama", daemon=True).start()
+    return server, model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--base-ms", type=float, default=50.0, help="Fixed per-request latency")
+    parser.add_argument("--prefill-tps", type=float, default=2000.0, help="Prompt tokens per second")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0, help="Generated tokens per second")
+    parser.add_argument("--output-tokens", type=int, default=120, help="Tokens generated per chat request")
+    parser.add_argument("--parallel", type=int, default=1, help="Requests served concurrently")
+    parser.add_argument("--overload-penalty", type=float, default=0.0,
+                        help="Slowdown per queued request per slot, e.g. 0.1 = 10%%")
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Model load time after keep_alive expires")
+    parser.add_argument("--prefix-cache", action="store_true", help="Reuse common prompt prefixes per slot")
+    args = parser.parse_args()
+
+    server, _ = start_server(args.port, args.base_ms, args.prefill_tps, args.tokens_per_second,
+                             args.output_tokens, args.parallel, args.overload_penalty, args.load_ms,
+                             args.prefix_cache)
+    print(f"Stub Ollama listening on http://127.0.0.1:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Helpers to seed and remove synthetic job posts for benchmarks.
+
+Synthetic rows are tagged with subreddit='benchmark' so they can be removed
+without touching scraped data. Each row also gets its job_listing row, since
+that is what the API reads.
+
+Usage:
+    python benchmarks/seed_data.py --rows 1000000
+    python benchmarks/seed_data.py --cleanup
+"""
+import argparse
+import os
+import time
+
+from sqlalchemy import create_engine, text
+
+BENCHMARK_SUBREDDIT = "benchmark"
+
+SEED_TAGS = ["python", "remote", "javascript", "senior", "devops", "contract"]
+
+SEED_SQL = """
+WITH raw AS (
+INSERT INTO raw_job_posts (
+    reddit_id, title, body, author, created_utc, score, url, subreddit, scraped_at,
+    cleaned_title, cleaned_text, tags, processed_at
+)
+SELECT
+    'bench_' || (:offset + g),
+    '[Hiring] Synthetic job post #' || g,
+    repeat('Synthetic body text for benchmarking. ', 20),
+    'benchmark_user',
+    now() - ((g % :spread_minutes) * interval '1 minute'),
+    g % 100,
+    'https://reddit.com/r/benchmark/comments/' || g,
+    :subreddit,
+    now(),
+    'Synthetic Job Post #' || g,
+    repeat('Cleaned synthetic description. ', 10),
+    (ARRAY['["python", "remote"]', '["javascript", "senior"]', '["devops", "contract"]'])[1 + g % 3]::jsonb,
+    CASE WHEN g % 10 = 0 THEN NULL ELSE now() END
+FROM generate_series(1, :batch) AS g
+RETURNING id, cleaned_title, cleaned_text, tags, created_utc, url, processed_at, score
+)
+INSERT INTO job_listing (
+    id, cleaned_title, cleaned_text, tags, created_utc, url, processed_at, score, tag_ids
+)
+SELECT
+    raw.id, raw.cleaned_title, raw.cleaned_text, raw.tags, raw.created_utc, raw.url,
+    raw.processed_at, raw.score,
+    ARRAY(SELECT t.id FROM job_tags t WHERE raw.tags ? t.name ORDER BY t.id)
+FROM raw
+"""
+
+
+def get_database_url() -> str:
+    """Construct database URL from environment variables."""
+    return (
+        f"postgresql://{os.getenv('POSTGRES_USER', 'reddit_user')}:"
+        f"{os.getenv('POSTGRES_PASSWORD', 'reddit_password')}@"
+        f"{os.getenv('POSTGRES_HOST', 'localhost')}:"
+        f"{os.getenv('POSTGRES_PORT', '5432')}/"
+        f"{os.getenv('POSTGRES_DB', 'reddit_jobs')}"
+    )
+
+
+def seed_job_posts(engine, rows: int, spread_days: int = 365, batch_size: int = 100_000):
+    """
+    Insert `rows` synthetic job posts spread over the last `spread_days` days.
+
+    Args:
+        engine: SQLAlchemy engine
+        rows: Number of rows to insert
+        spread_days: Range of created_utc values, ending now
+        batch_size: Rows inserted per statement
+    """
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        offset = conn.execute(
+            text("SELECT count(*) FROM raw_job_posts WHERE subreddit = :subreddit"),
+            {"subreddit": BENCHMARK_SUBREDDIT}
+        ).scalar()
+
+        conn.execute(
+            text("INSERT INTO job_tags (name) SELECT unnest(:names) ON CONFLICT (name) DO NOTHING"),
+            {"names": SEED_TAGS}
+        )
+
+    inserted = 0
+    while inserted < rows:
+        batch = min(batch_size, rows - inserted)
+        with engine.begin() as conn:
+            conn.execute(text(SEED_SQL), {
+                "offset": offset + inserted,
+                "batch": batch,
+                "spread_minutes": spread_days * 24 * 60,
+                "subreddit": BENCHMARK_SUBREDDIT,
+            })
+        inserted += batch
+        print(f"Seeded {inserted}/{rows} rows")
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE raw_job_posts"))
+        conn.execute(text("ANALYZE job_listing"))
+    print(f"Seeded {rows} rows in {time.perf_counter() - start:.1f}s")
+
+
+def cleanup_job_posts(engine):
+    """Delete all synthetic benchmark rows."""
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                DELETE FROM job_listing
+                WHERE id IN (SELECT id FROM raw_job_posts WHERE subreddit = :subreddit)
+            """),
+            {"subreddit": BENCHMARK_SUBREDDIT}
+        )
+        deleted = conn.execute(
+            text("DELETE FROM raw_job_posts WHERE subreddit = :subreddit"),
+            {"subreddit": BENCHMARK_SUBREDDIT}
+        ).rowcount
+    print(f"Deleted {deleted} benchmark rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--spread-days", type=int, default=365)
+    parser.add_argument("--cleanup", action="store_true", help="Remove benchmark rows instead of seeding")
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_url())
+    if args.cleanup:
+        cleanup_job_posts(engine)
+    else:
+        seed_job_posts(engine, args.rows, args.spread_days)
+
+
+if __name__ == "__main__":
+    main()
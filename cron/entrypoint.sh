@@ -9,6 +9,9 @@ chmod 0644 /etc/cron.d/scraper-cron-active
 # Apply cron job
 crontab /etc/cron.d/scraper-cron-active
 
+# Cron jobs do not inherit the container environment; expose it to them
+printenv | grep -v -E '^(HOME|PWD|SHLVL|_)=' >> /etc/environment
+
 # Create the log file to be able to run tail
 touch /var/log/cron.log
 
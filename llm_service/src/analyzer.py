@@ -4,63 +4,140 @@ Job post analyzer using Ollama with Llama 3.1 model.
 import os
 import json
 import re
-from typing import Dict, List, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-import ollama
+from jobposts.embeddings import EMBEDDING_DIMENSIONS, embedding_text, get_embedding_model
+from jobposts.tracing import get_tracer
+from concurrency import get_limiter
+from llm_pool import NoNodeAvailable, get_pool
+from prompts import PromptTemplate, get_prompt_template
+from metrics import (
+    embedding_duration,
+    llm_cold_start_duration,
+    llm_errors,
+    llm_prefill_duration,
+    llm_request_duration,
+    llm_tokens,
+    parse_failures,
+)
 
 load_dotenv()
 
+tracer = get_tracer(__name__)
 
-def clean_and_extract_text(title: str, body: str) -> Tuple[str, str, List[str]]:
+# A load_duration above this means the request had to load the model
+COLD_START_THRESHOLD = 0.5
+
+
+def get_keep_alive():
     """
-    Analyze a job post using Ollama's Llama 3.1 model to extract structured information.
+    OLLAMA_KEEP_ALIVE for every request: a duration such as '30m', seconds,
+    or -1 to keep models loaded indefinitely (Ollama's default is 5m).
+    """
+    keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    try:
+        return int(keep_alive)
+    except ValueError:
+        return keep_alive
 
-    Args:
-        title: Job post title
-        body: Job post body text
+
+def warm_up_models() -> Dict[str, Dict]:
+    """
+    Load the chat and embedding models on every Ollama node.
 
     Returns:
-        Tuple of (cleaned_title, cleaned_text, tags)
+        {model: {host: load seconds or None}}
+    """
+    chat_model = get_chat_model()
+    embedding_model = get_embedding_model()
+    pool = get_pool()
+    results = {
+        chat_model: pool.warm_up(chat_model, keep_alive=get_keep_alive()),
+        embedding_model: pool.warm_up(embedding_model, keep_alive=get_keep_alive(), embedding=True),
+    }
+    for model, loads in results.items():
+        for load_seconds in loads.values():
+            if load_seconds is not None and load_seconds > COLD_START_THRESHOLD:
+                llm_cold_start_duration.labels(model=model, source='warmup').observe(load_seconds)
+    return results
+
+
+class AnalysisError(Exception):
     """
-    model_name = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+    Ollama failed or its reply could not be parsed.
 
-    # Create structured prompt for extraction
-    prompt = f"""You are a job post analyzer. Extract and clean the following information from this job posting.
+    `fallback` holds (title, text, tags) built from the raw post, for callers
+    that would rather store something than nothing.
+    """
 
-TITLE: {title}
+    def __init__(self, message: str, fallback: Tuple[str, str, List[str]]):
+        super().__init__(message)
+        self.fallback = fallback
 
-BODY: {body}
 
-Please provide your analysis in this EXACT JSON format (no extra text):
-{{
-    "cleaned_title": "A concise, professional version of the title",
-    "cleaned_text": "A cleaned summary of the job description with key details",
-    "tags": ["tag1", "tag2", "tag3"]
-}}
+def get_chat_model() -> str:
+    """Ollama model used for analysis (OLLAMA_MODEL)."""
+    return os.getenv("OLLAMA_MODEL", "llama3.1:8b")
 
-Tags should include: job type, experience level, key technologies/skills, remote/location info, and any other relevant categories.
 
-Response:"""
+def clean_and_extract_text(title: str, body: str,
+                           template: Optional[PromptTemplate] = None) -> Tuple[str, str, List[str]]:
+    """
+    Analyze a job post using Ollama's Llama 3.1 model to extract structured information.
+
+    Args:
+        title: Job post title
+        body: Job post body text
+        template: Prompt template (default: PROMPT_VERSION)
+
+    Returns:
+        Tuple of (cleaned_title, cleaned_text, tags)
+
+    Raises:
+        AnalysisError: The request failed or the reply was not valid JSON
+        NoNodeAvailable: No Ollama node could take the request
+    """
+    model_name = get_chat_model()
+    template = template or get_prompt_template()
 
     try:
         # Call Ollama API
-        response = ollama.chat(
-            model=model_name,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that extracts structured information from job posts. Always respond with valid JSON only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            options={
-                "temperature": 0.3,  # Lower temperature for more consistent output
-                "num_predict": 500   # Limit output length
-            }
-        )
+        with tracer.start_as_current_span('ollama.chat') as span:
+            span.set_attributes({'model': model_name, 'prompt_version': template.version})
+            started = time.perf_counter()
+            with get_limiter().acquire() as slot:
+                response = get_pool().chat(
+                    model=model_name,
+                    messages=template.messages(title, body),
+                    options={
+                        "temperature": 0.3,  # Lower temperature for more consistent output
+                        "num_predict": 500   # Limit output length
+                    },
+                    keep_alive=get_keep_alive()
+                )
+                load_seconds = (response.get('load_duration') or 0) / 1e9
+                if load_seconds > COLD_START_THRESHOLD:
+                    # A model load is not queueing; keep it out of the limiter
+                    # and the warm latency histogram
+                    slot.discard()
+            if load_seconds > COLD_START_THRESHOLD:
+                llm_cold_start_duration.labels(model=model_name, source='request').observe(load_seconds)
+                span.set_attribute('cold_start_seconds', load_seconds)
+            else:
+                llm_request_duration.labels(model=model_name).observe(time.perf_counter() - started)
+            llm_tokens.labels(model=model_name, kind='prompt').inc(response.get('prompt_eval_count') or 0)
+            # Ollama only counts and times prompt tokens it had to evaluate, so a
+            # reused cached prefix shows up as shorter prefill here
+            llm_prefill_duration.labels(model=model_name, prompt_version=template.version).observe(
+                (response.get('prompt_eval_duration') or 0) / 1e9
+            )
+            llm_tokens.labels(model=model_name, kind='completion').inc(response.get('eval_count') or 0)
+            span.set_attributes({
+                'node': response.get('node'),
+                'prompt_tokens': response.get('prompt_eval_count') or 0,
+                'completion_tokens': response.get('eval_count') or 0,
+            })
 
         # Extract response content
         content = response['message']['content']
@@ -70,14 +147,52 @@ Response:"""
 
         return result
 
+    except (AnalysisError, NoNodeAvailable):
+        # No node to ask is not a verdict on the post: let the caller retry it
+        raise
+
     except Exception as e:
+        llm_errors.labels(model=model_name).inc()
         print(f"Error analyzing job post with Ollama: {e}")
-        # Return fallback values
-        return (
+        raise AnalysisError(str(e), (
             title[:200],  # Truncated title
             body[:500] if body else "No description provided",
             ["unprocessed", "error"]
-        )
+        )) from e
+
+
+def compute_embedding(cleaned_title: str, cleaned_text: str, tags: List[str]) -> Optional[List[float]]:
+    """
+    Embed a processed job post with the Ollama embeddings endpoint.
+
+    Args:
+        cleaned_title: Processed title
+        cleaned_text: Processed text
+        tags: List of tags/categories
+
+    Returns:
+        Embedding vector, or None if the embedding request failed or the
+        model's vectors do not fit the job_embeddings column
+    """
+    model_name = get_embedding_model()
+    try:
+        with tracer.start_as_current_span('ollama.embeddings'), \
+                embedding_duration.labels(model=model_name).time():
+            response = get_pool().embeddings(
+                model=model_name,
+                prompt=embedding_text(cleaned_title, cleaned_text, tags),
+                keep_alive=get_keep_alive()
+            )
+    except Exception as e:
+        print(f"Error computing embedding with Ollama: {e}")
+        return None
+
+    embedding = response['embedding']
+    if len(embedding) != EMBEDDING_DIMENSIONS:
+        print(f"Embedding model {model_name} returned {len(embedding)} dimensions, "
+              f"expected {EMBEDDING_DIMENSIONS}; skipping embedding")
+        return None
+    return embedding
 
 
 def parse_llm_response(content: str, original_title: str, original_body: str) -> Tuple[str, str, List[str]]:
@@ -91,6 +206,9 @@ def parse_llm_response(content: str, original_title: str, original_body: str) ->
 
     Returns:
         Tuple of (cleaned_title, cleaned_text, tags)
+
+    Raises:
+        AnalysisError: The response was not valid JSON
     """
     try:
         # Try to find JSON in the response
@@ -115,12 +233,13 @@ def parse_llm_response(content: str, original_title: str, original_body: str) ->
         return (cleaned_title, cleaned_text, tags)
 
     except json.JSONDecodeError as e:
+        parse_failures.inc()
         print(f"Failed to parse JSON from LLM response: {e}")
         print(f"Response content: {content[:200]}")
 
         # Fallback: basic text extraction
-        return (
+        raise AnalysisError(f"unparseable response: {e}", (
             original_title[:200],
             original_body[:1000] if original_body else "No description",
             ["parsing_failed"]
-        )
\ No newline at end of file
+        )) from e
\ No newline at end of file
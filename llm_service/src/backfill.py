@@ -0,0 +1,249 @@
+"""
+Queue processed job posts for re-analysis after a model or prompt change.
+
+The consumer skips posts that already have processed_at set, so changing
+OLLAMA_MODEL or PROMPT_VERSION leaves existing posts with the old analysis.
+This selects processed posts by the model/prompt version that analyzed them,
+creation date and tags, and publishes their ids to the backfill queue
+(BACKFILL_QUEUE). Consumers only take backfill messages while the live queue
+is empty, re-analyze each post with their current model and prompt, and
+write the result back only if the post was not re-analyzed in the meantime.
+
+Ids are read in id order one chunk at a time and published at no more than
+--rate messages per second. Publishing also pauses while the backfill queue
+holds --max-queue-depth messages, so a 100k-post backfill never sits in
+RabbitMQ all at once. The run can be stopped and rerun at any point: a post
+that already has the consumers' model and prompt version is skipped.
+
+Usage:
+    python src/backfill.py --stale --dry-run
+    python src/backfill.py --prompt-version v1 --since 2026-01-01 --rate 2
+    python src/backfill.py --model llama3:8b --tag python --tag remote
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+import pika
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+from jobposts.database import get_database_url
+from jobposts.models import RawJobPost
+from analyzer import get_chat_model
+from prompts import get_prompt_template
+
+load_dotenv()
+
+
+def build_filters(
+    models: Optional[List[str]] = None,
+    prompt_versions: Optional[List[str]] = None,
+    stale: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    tags: Optional[List[str]] = None
+) -> list:
+    """
+    WHERE clauses selecting processed posts to re-analyze.
+
+    Args:
+        models: Posts analyzed by any of these models
+        prompt_versions: Posts analyzed with any of these prompt versions
+        stale: Posts not analyzed with the current OLLAMA_MODEL and PROMPT_VERSION
+        since: Posts created at or after this time
+        until: Posts created before this time
+        tags: Posts with any of these tags
+
+    Returns:
+        List of SQLAlchemy clauses to AND together
+    """
+    filters = [RawJobPost.processed_at.isnot(None)]
+    if models:
+        filters.append(RawJobPost.analysis_model.in_(models))
+    if prompt_versions:
+        filters.append(RawJobPost.prompt_version.in_(prompt_versions))
+    if stale:
+        filters.append(or_(
+            RawJobPost.analysis_model.is_distinct_from(get_chat_model()),
+            RawJobPost.prompt_version.is_distinct_from(get_prompt_template().version)
+        ))
+    # created_utc is the partition key, so a date range only scans its months
+    if since:
+        filters.append(RawJobPost.created_utc >= since)
+    if until:
+        filters.append(RawJobPost.created_utc < until)
+    if tags:
+        # One containment test per tag, each served by the GIN index on tags
+        filters.append(or_(*(RawJobPost.tags.contains([tag]) for tag in tags)))
+    return filters
+
+
+def iter_job_ids(session, filters: list, chunk_size: int = 1000, limit: Optional[int] = None) -> Iterator[List[int]]:
+    """
+    Yield the ids of matching posts in id order, one chunk at a time.
+
+    Args:
+        session: SQLAlchemy session
+        filters: Clauses from build_filters()
+        chunk_size: Ids per query
+        limit: Stop after this many ids (None for all)
+    """
+    last_id = 0
+    selected = 0
+    while limit is None or selected < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - selected)
+        ids = session.execute(
+            select(RawJobPost.id)
+            .where(RawJobPost.id > last_id, *filters)
+            .order_by(RawJobPost.id)
+            .limit(size)
+        ).scalars().all()
+        # Don't hold a snapshot open while the chunk is published
+        session.commit()
+        if not ids:
+            return
+        last_id = ids[-1]
+        selected += len(ids)
+        yield ids
+
+
+def message_properties(published_at_ms: int) -> pika.BasicProperties:
+    """
+    Properties of a persistent backfill message. The publish time goes in
+    the published_at_ms header as integer epoch milliseconds, like the
+    scraper's messages: AMQP header tables cannot carry floats.
+    """
+    return pika.BasicProperties(
+        delivery_mode=2,  # Make message persistent
+        timestamp=published_at_ms // 1000,
+        headers={'published_at_ms': published_at_ms}
+    )
+
+
+class BackfillPublisher:
+    """
+    Publishes job ids to the backfill queue at a bounded rate.
+
+    Args:
+        rate: Messages per second
+        max_queue_depth: Wait while the queue holds this many messages (0 to never wait)
+    """
+
+    def __init__(self, rate: float = 5.0, max_queue_depth: int = 1000):
+        self.queue_name = os.getenv('BACKFILL_QUEUE', 'job_posts_backfill')
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.max_queue_depth = max_queue_depth
+        self.next_publish_at = time.monotonic()
+        credentials = pika.PlainCredentials(
+            os.getenv('RABBITMQ_USER', 'guest'),
+            os.getenv('RABBITMQ_PASSWORD', 'guest')
+        )
+        self.connection = pika.BlockingConnection(pika.ConnectionParameters(
+            host=os.getenv('RABBITMQ_HOST', 'localhost'),
+            port=int(os.getenv('RABBITMQ_PORT', 5672)),
+            credentials=credentials
+        ))
+        self.channel = self.connection.channel()
+        self.channel.queue_declare(queue=self.queue_name, durable=True)
+        print(f"Publishing to {self.queue_name}")
+
+    def queue_depth(self) -> int:
+        """Messages ready in the backfill queue."""
+        return self.channel.queue_declare(
+            queue=self.queue_name, durable=True, passive=True
+        ).method.message_count
+
+    def wait_for_room(self, poll_seconds: float = 5.0):
+        """Block while the backfill queue is at max_queue_depth."""
+        if not self.max_queue_depth:
+            return
+        while self.queue_depth() >= self.max_queue_depth:
+            # Sleeping through the connection keeps its heartbeats going
+            self.connection.sleep(poll_seconds)
+
+    def publish(self, job_ids: List[int]):
+        """Publish one message per id, paced to the configured rate."""
+        for job_id in job_ids:
+            delay = self.next_publish_at - time.monotonic()
+            if delay > 0:
+                self.connection.sleep(delay)
+            self.next_publish_at = max(self.next_publish_at, time.monotonic()) + self.interval
+
+            self.channel.basic_publish(
+                exchange='',
+                routing_key=self.queue_name,
+                body=json.dumps({'job_id': job_id}),
+                properties=message_properties(int(time.time() * 1000))
+            )
+
+    def close(self):
+        if not self.connection.is_closed:
+            self.connection.close()
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', action='append', dest='models', metavar='MODEL',
+                        help='Select posts analyzed by this model (repeatable)')
+    parser.add_argument('--prompt-version', action='append', dest='prompt_versions', metavar='VERSION',
+                        help='Select posts analyzed with this prompt version (repeatable)')
+    parser.add_argument('--stale', action='store_true',
+                        help='Select posts not analyzed with the current OLLAMA_MODEL and PROMPT_VERSION')
+    parser.add_argument('--since', type=parse_date, help='Posts created at or after this date (ISO 8601)')
+    parser.add_argument('--until', type=parse_date, help='Posts created before this date (ISO 8601)')
+    parser.add_argument('--tag', action='append', dest='tags', metavar='TAG',
+                        help='Select posts with this tag (repeatable, any matches)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--rate', type=float, default=5.0, help='Messages published per second (0 for unlimited)')
+    parser.add_argument('--max-queue-depth', type=int, default=1000,
+                        help='Pause while the backfill queue holds this many messages (0 to never pause)')
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--dry-run', action='store_true', help='Only count the matching posts')
+    args = parser.parse_args()
+
+    if not (args.models or args.prompt_versions or args.stale or args.since or args.until or args.tags):
+        parser.error('select posts with at least one of --model, --prompt-version, --stale, --since, --until, --tag')
+
+    filters = build_filters(
+        models=args.models,
+        prompt_versions=args.prompt_versions,
+        stale=args.stale,
+        since=args.since,
+        until=args.until,
+        tags=args.tags
+    )
+    engine = create_engine(get_database_url())
+    session = sessionmaker(bind=engine)()
+    try:
+        if args.dry_run:
+            count = session.execute(select(func.count()).select_from(RawJobPost).where(*filters)).scalar()
+            print(f"{count} posts match")
+            return
+
+        publisher = BackfillPublisher(rate=args.rate, max_queue_depth=args.max_queue_depth)
+        published = 0
+        started = time.monotonic()
+        try:
+            for job_ids in iter_job_ids(session, filters, chunk_size=args.chunk_size, limit=args.limit):
+                publisher.wait_for_room()
+                publisher.publish(job_ids)
+                published += len(job_ids)
+                print(f"Queued {published} posts (up to id {job_ids[-1]}, "
+                      f"{published / max(time.monotonic() - started, 1e-9):.1f}/s)")
+        finally:
+            publisher.close()
+        print(f"Done: queued {published} posts for re-analysis")
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
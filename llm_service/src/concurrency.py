@@ -0,0 +1,195 @@
+"""
+Adaptive concurrency limit for Ollama chat requests.
+
+A fixed number of in-flight requests either leaves a node idle or pushes it
+into queueing, where latency grows without any gain in throughput. The
+limiter estimates the right number from what it observes:
+
+- Every successful request contributes a latency sample. A fast-moving
+  average of the samples is the current latency; the baseline is an average
+  that drops quickly on faster samples and rises only slowly, so it tracks
+  latency without queueing.
+- While current latency stays within the tolerance of the baseline, the
+  limit grows additively (about +1 per limit's worth of requests).
+- Above the tolerance, the limit shrinks in proportion to the gradient
+  (baseline / current latency), like Netflix concurrency-limits' Gradient2.
+- Every request that fails with a timeout, connection error or 5xx cuts
+  the limit multiplicatively (the MD of AIMD), since those are the hardest
+  overload signal. Client errors (4xx) leave the limit alone.
+
+The consumer sizes its RabbitMQ prefetch from the current limit, so the
+number of messages pulled follows what Ollama can actually serve.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from metrics import llm_concurrency_limit, llm_in_flight, llm_latency_estimate
+
+try:
+    import httpx
+except ImportError:  # only used to recognise httpx transport errors
+    httpx = None
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Whether a failed request is a sign of saturation: timeouts, connection
+    errors and 5xx responses. Client errors such as an unknown model are not.
+    """
+    # ollama.ResponseError has status_code (-1 for non-HTTP failures), urllib's HTTPError has code
+    status = getattr(error, 'status_code', None)
+    if not isinstance(status, int):
+        status = getattr(error, 'code', None)
+    if isinstance(status, int):
+        return status < 0 or status >= 500
+    if httpx is not None and isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    # TimeoutError and ConnectionError, including NoNodeAvailable
+    return isinstance(error, OSError)
+
+
+class _Slot:
+    """Handle for one acquired slot."""
+
+    __slots__ = ('record',)
+
+    def __init__(self):
+        self.record = True
+
+    def discard(self):
+        """Do not use this request's latency, e.g. because it included a model load."""
+        self.record = False
+
+
+class AdaptiveLimiter:
+    """
+    Gradient concurrency limit with multiplicative decrease on errors.
+
+    Args:
+        initial_limit: Starting limit
+        min_limit: Lower bound; the limit never drops below it
+        max_limit: Upper bound, also the consumer's worker thread count
+        tolerance: Current/baseline latency ratio tolerated before shrinking
+        backoff: Factor applied to the limit on a failed request
+        smoothing: Fraction of the gradient applied per sample (0-1)
+        long_window: Samples over which the baseline rises
+        short_window: Samples averaged into the current latency
+    """
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 16,
+                 tolerance: float = 1.3, backoff: float = 0.8, smoothing: float = 0.2,
+                 long_window: int = 200, short_window: int = 5):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._long_alpha = 2.0 / (long_window + 1)
+        self._short_alpha = 2.0 / (short_window + 1)
+        self._estimate = float(initial_limit)
+        self._long_rtt: Optional[float] = None
+        self._short_rtt: Optional[float] = None
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        llm_concurrency_limit.set(initial_limit)
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self._estimate)))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Hold one slot for the duration of a request.
+
+        The request's latency is recorded on success unless the yielded
+        slot is discarded; an exception counts as an overload signal and is
+        re-raised.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._in_flight >= self.limit:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for an LLM concurrency slot")
+                self._condition.wait(remaining)
+            self._in_flight += 1
+            in_flight = self._in_flight
+        llm_in_flight.set(in_flight)
+
+        slot = _Slot()
+        started = time.perf_counter()
+        try:
+            yield slot
+        except Exception as e:
+            self._release(None, error=is_overload_error(e))
+            raise
+        self._release(time.perf_counter() - started if slot.record else None, in_flight=in_flight)
+
+    def _release(self, latency: Optional[float], in_flight: int = 0, error: bool = False):
+        with self._condition:
+            self._in_flight -= 1
+            if error:
+                self._on_error()
+            elif latency is not None:
+                self._on_sample(latency, in_flight)
+            self._condition.notify_all()
+            limit = self.limit
+            current = self._in_flight
+        llm_concurrency_limit.set(limit)
+        llm_in_flight.set(current)
+
+    def _on_sample(self, latency: float, in_flight: int):
+        if self._long_rtt is None:
+            self._long_rtt = self._short_rtt = latency
+            return
+        self._short_rtt += self._short_alpha * (latency - self._short_rtt)
+        # The baseline follows faster samples quickly and slower ones slowly,
+        # so sustained queueing is not mistaken for the new normal
+        alpha = self._short_alpha if latency < self._long_rtt else self._long_alpha
+        self._long_rtt += alpha * (latency - self._long_rtt)
+        llm_latency_estimate.labels(window='short').set(self._short_rtt)
+        llm_latency_estimate.labels(window='long').set(self._long_rtt)
+
+        ratio = self._short_rtt / self._long_rtt
+        if ratio > self.tolerance:
+            # Queueing: move towards the limit at which latency was at the baseline
+            gradient = max(0.5, self.tolerance / ratio)
+            self._estimate *= 1 - self.smoothing * (1 - gradient)
+        elif in_flight >= self._estimate - 1:
+            # Additive increase of about one per limit's worth of samples, and
+            # only while the workload actually uses the limit
+            self._estimate += 1 / self._estimate
+        self._estimate = max(self.min_limit, min(self.max_limit, self._estimate))
+
+    def _on_error(self):
+        self._estimate = max(self.min_limit, self._estimate * self.backoff)
+
+
+_limiter: Optional[AdaptiveLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> AdaptiveLimiter:
+    """Process-wide limiter configured from the environment, created on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveLimiter(
+                initial_limit=int(os.getenv('LLM_CONCURRENCY_INITIAL', 2)),
+                min_limit=int(os.getenv('LLM_CONCURRENCY_MIN', 1)),
+                max_limit=int(os.getenv('LLM_CONCURRENCY_MAX', 16)),
+                tolerance=float(os.getenv('LLM_CONCURRENCY_TOLERANCE', 1.3)),
+            )
+        return _limiter
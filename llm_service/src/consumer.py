@@ -3,25 +3,68 @@ RabbitMQ consumer that processes job posts from the queue.
 """
 import os
 import json
+import signal
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pika
+from typing import Optional
 from dotenv import load_dotenv
-from database import DatabaseClient
-from analyzer import clean_and_extract_text
+from database import DatabaseClient, StaleAnalysisError
+from llm_pool import NoNodeAvailable
+from analyzer import AnalysisError, clean_and_extract_text, compute_embedding, get_chat_model, warm_up_models
+from prompts import get_prompt_template
+from concurrency import get_limiter
+from metrics import messages_processed, processing_duration, queue_depth, queue_wait, start_metrics_server
+from jobposts.tracing import extract_context, get_tracer, init_tracing
 
 load_dotenv()
 
+tracer = get_tracer(__name__)
+
 
 class JobPostConsumer:
-    """Consumer for processing job posts from RabbitMQ queue."""
+    """
+    Consumer for processing job posts from RabbitMQ queue.
+
+    Messages are handled on a thread pool so several Ollama requests can be in
+    flight at once. The prefetch count follows the adaptive LLM concurrency
+    limit (see concurrency.py), so the consumer only holds as many unacked
+    messages as Ollama is currently able to serve. pika is not thread-safe:
+    workers hand acks back to the connection thread with
+    add_callback_threadsafe.
+
+    Re-analysis requests (see backfill.py) arrive on a separate backfill
+    queue, consumed on its own channel with a small prefetch and only while
+    the live queue is empty and no live message is in flight, so a large
+    backfill never delays newly scraped posts.
+    """
 
     def __init__(self):
         self.host = os.getenv('RABBITMQ_HOST', 'localhost')
         self.port = int(os.getenv('RABBITMQ_PORT', 5672))
         self.queue_name = os.getenv('RABBITMQ_QUEUE', 'job_posts_queue')
+        self.backfill_queue = os.getenv('BACKFILL_QUEUE', 'job_posts_backfill')
+        self.backfill_prefetch = int(os.getenv('BACKFILL_PREFETCH', 1))
         self.connection = None
         self.channel = None
+        self.backfill_channel = None
+        self.backfill_consumer_tag = None
+        self.live_in_flight = 0
         self.db_client = DatabaseClient()
+        self.limiter = get_limiter()
+        self.executor = ThreadPoolExecutor(max_workers=self.limiter.max_limit, thread_name_prefix='worker')
+        self.prefetch = 0
+        self.depth_check_interval = float(os.getenv('QUEUE_DEPTH_CHECK_INTERVAL', 15))
+        self.warmup_idle_seconds = float(os.getenv('WARMUP_IDLE_SECONDS', 120))
+        self.last_depth = 0
+        self.last_message_at = time.monotonic()
+        self.warming = threading.Lock()
+        self.stopping = False
+        self.drain_timeout = float(os.getenv('CONSUMER_DRAIN_TIMEOUT', 60))
+        self.no_node_requeue_delay = float(os.getenv('NO_NODE_REQUEUE_DELAY', 10))
+        # Deliveries handed to the pool and not finished: future -> (channel, delivery tag)
+        self.pending = {}
 
     def connect(self):
         """Connect to RabbitMQ with retry logic."""
@@ -45,8 +88,13 @@ class JobPostConsumer:
                 self.channel = self.connection.channel()
                 self.channel.queue_declare(queue=self.queue_name, durable=True)
 
-                # Set QoS to process one message at a time
-                self.channel.basic_qos(prefetch_count=1)
+                # Pull as many messages as the LLM concurrency limit allows
+                self.prefetch = self.limiter.limit
+                self.channel.basic_qos(prefetch_count=self.prefetch)
+
+                self.backfill_channel = self.connection.channel()
+                self.backfill_channel.queue_declare(queue=self.backfill_queue, durable=True)
+                self.backfill_channel.basic_qos(prefetch_count=self.backfill_prefetch)
 
                 print(f"Connected to RabbitMQ at {self.host}:{self.port}")
                 return True
@@ -60,96 +108,326 @@ class JobPostConsumer:
                     print("Failed to connect to RabbitMQ after all retries")
                     raise
 
-    def process_message(self, ch, method, properties, body):
+    def on_message(self, ch, method, properties, body):
+        """Hand a delivered live message to a worker thread."""
+        self.live_in_flight += 1
+        # Live work takes priority; backfill resumes once the live queue drains
+        self._pause_backfill()
+        self._dispatch(ch, method, properties, body, backfill=False)
+
+    def on_backfill_message(self, ch, method, properties, body):
+        """Hand a delivered backfill message to a worker thread."""
+        self._dispatch(ch, method, properties, body, backfill=True)
+
+    def _dispatch(self, ch, method, properties, body, backfill: bool):
+        now = time.monotonic()
+        if now - self.last_message_at > self.warmup_idle_seconds:
+            self.warm_up('first message after idle')
+        self.last_message_at = now
+        future = self.executor.submit(self.process_message, ch, method, properties, body, backfill)
+        self.pending[future] = (ch, method.delivery_tag)
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future):
+        # Cancelled deliveries are nacked by stop(), which pops them itself
+        if not future.cancelled():
+            self.pending.pop(future, None)
+
+    def _resume_backfill(self):
+        """Start consuming the backfill queue (connection thread)."""
+        if self.backfill_consumer_tag is None:
+            self.backfill_consumer_tag = self.backfill_channel.basic_consume(
+                queue=self.backfill_queue,
+                on_message_callback=self.on_backfill_message,
+                auto_ack=False
+            )
+            print("Live queue is idle, consuming backfill queue")
+
+    def _pause_backfill(self):
+        """Stop taking backfill messages; those already delivered still finish (connection thread)."""
+        if self.backfill_consumer_tag is not None:
+            self.backfill_channel.basic_cancel(self.backfill_consumer_tag)
+            self.backfill_consumer_tag = None
+            print("Live messages waiting, pausing backfill queue")
+
+    def warm_up(self, reason: str, wait: bool = False):
+        """Load the models on every Ollama node, unless a warm-up is already running."""
+        if not self.warming.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                print(f"Warming up models ({reason})")
+                warm_up_models()
+            except Exception as e:
+                print(f"Model warm-up failed: {e}")
+            finally:
+                self.warming.release()
+
+        if wait:
+            run()
+        else:
+            threading.Thread(target=run, name='warm-up', daemon=True).start()
+
+    def check_queue_depth(self):
+        """Poll the ready-message count (connection thread) and warm up when a burst begins."""
+        try:
+            depth = self.channel.queue_declare(
+                queue=self.queue_name, durable=True, passive=True
+            ).method.message_count
+            queue_depth.set(depth)
+            if depth > 0 and self.last_depth == 0:
+                self.warm_up(f"queue depth 0 -> {depth}")
+            self.last_depth = depth
+            if depth == 0 and self.live_in_flight == 0:
+                self._resume_backfill()
+            else:
+                self._pause_backfill()
+        except Exception as e:
+            print(f"Queue depth check failed: {e}")
+        self.connection.call_later(self.depth_check_interval, self.check_queue_depth)
+
+    def _settle(self, ch, delivery_tag: int, requeue: Optional[bool] = None):
+        """Ack (or nack when requeue is given) from any thread."""
+        def settle():
+            # After stop() closed the connection the broker has requeued it already
+            if not ch.is_open:
+                return
+            if requeue is None:
+                ch.basic_ack(delivery_tag=delivery_tag)
+            else:
+                ch.basic_nack(delivery_tag=delivery_tag, requeue=requeue)
+            if ch is self.channel:
+                self.live_in_flight -= 1
+                self._sync_prefetch(ch)
+
+        if self.connection.is_closed:
+            return
+        self.connection.add_callback_threadsafe(settle)
+
+    def _sync_prefetch(self, ch):
+        """Apply the current concurrency limit as the channel's prefetch count."""
+        limit = self.limiter.limit
+        if limit != self.prefetch:
+            ch.basic_qos(prefetch_count=limit)
+            print(f"Prefetch {self.prefetch} -> {limit}")
+            self.prefetch = limit
+
+    def process_message(self, ch, method, properties, body, backfill: bool = False):
         """
-        Process a single job post message from the queue.
+        Process a single job post message from the queue (on a worker thread).
+
+        Live messages skip posts that are already processed. Backfill messages
+        re-analyze them with the current model and prompt unless the post
+        already has that version, and only write back if the post was not
+        re-analyzed by someone else in the meantime.
 
         Args:
             ch: Channel
             method: Delivery method
             properties: Message properties
             body: Message body
+            backfill: Message came from the backfill queue
         """
-        try:
-            # Parse message
-            message = json.loads(body)
-            job_id = message.get('job_id')
+        started = time.perf_counter()
+        received_ns = time.time_ns()
+        headers = properties.headers or {}
+        trace_context = extract_context(headers)
+        queue = 'backfill' if backfill else 'live'
 
-            if not job_id:
-                print(f"Invalid message format: {message}")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
+        # Integer epoch milliseconds; AMQP header tables cannot carry floats
+        published_at_ms = headers.get('published_at_ms')
+        # Backfill messages wait behind live traffic by design, so only live lag is recorded
+        if published_at_ms and not backfill:
+            published_ns = int(published_at_ms) * 1_000_000
+            queue_wait.observe(max(0.0, (received_ns - published_ns) / 1e9))
+            # Reconstructed span covering the time the message sat in the queue
+            wait_span = tracer.start_span('queue_wait', context=trace_context, start_time=published_ns)
+            wait_span.end(end_time=max(received_ns, published_ns))
 
-            print(f"Processing job ID: {job_id}")
+        with tracer.start_as_current_span('process_message', context=trace_context) as span:
+            try:
+                # Parse message
+                message = json.loads(body)
+                job_id = message.get('job_id')
 
-            # Fetch job post from database
-            job_post = self.db_client.fetch_job_post(job_id)
-            if not job_post:
-                print(f"Job post {job_id} not found in database")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
+                if not job_id:
+                    print(f"Invalid message format: {message}")
+                    messages_processed.labels(queue=queue, outcome='invalid').inc()
+                    self._settle(ch, method.delivery_tag)
+                    return
 
-            # Check if already processed
-            if job_post.processed_at:
-                print(f"Job post {job_id} already processed, skipping...")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
+                print(f"Processing job ID: {job_id}" + (" (backfill)" if backfill else ""))
+                span.set_attributes({'job_id': job_id, 'backfill': backfill})
 
-            # Analyze job post with LLM
-            print(f"Analyzing job post {job_id} with Ollama...")
-            cleaned_title, cleaned_text, tags = clean_and_extract_text(
-                job_post.title,
-                job_post.body or ""
-            )
+                # Fetch job post from database
+                with tracer.start_as_current_span('fetch_job_post'):
+                    job_post = self.db_client.fetch_job_post(job_id)
+                if not job_post:
+                    print(f"Job post {job_id} not found in database")
+                    messages_processed.labels(queue=queue, outcome='not_found').inc()
+                    self._settle(ch, method.delivery_tag)
+                    return
 
-            # Update database with cleaned data
-            success = self.db_client.update_cleaned_data(
-                job_id=job_id,
-                cleaned_title=cleaned_title,
-                cleaned_text=cleaned_text,
-                tags=tags
-            )
+                template = get_prompt_template()
+                model_name = get_chat_model()
+                expected_processed_at = None
+                if backfill:
+                    # Re-analysis: skip posts already at the current version, and
+                    # remember which analysis this one replaces
+                    if (job_post.analysis_model, job_post.prompt_version) == (model_name, template.version):
+                        print(f"Job post {job_id} already analyzed with {model_name}/{template.version}, skipping...")
+                        messages_processed.labels(queue=queue, outcome='current').inc()
+                        self._settle(ch, method.delivery_tag)
+                        return
+                    expected_processed_at = job_post.processed_at
+                elif job_post.processed_at:
+                    print(f"Job post {job_id} already processed, skipping...")
+                    messages_processed.labels(queue=queue, outcome='skipped').inc()
+                    self._settle(ch, method.delivery_tag)
+                    return
 
-            if success:
-                print(f"Successfully processed job ID: {job_id}")
-                print(f"  Title: {cleaned_title[:50]}...")
-                print(f"  Tags: {tags}")
-            else:
-                print(f"Failed to update database for job ID: {job_id}")
+                # Analyze job post with LLM
+                print(f"Analyzing job post {job_id} with Ollama...")
+                analysis_model, prompt_version = model_name, template.version
+                try:
+                    cleaned_title, cleaned_text, tags = clean_and_extract_text(
+                        job_post.title,
+                        job_post.body or "",
+                        template=template
+                    )
+                except AnalysisError as e:
+                    if backfill:
+                        # Never replace a good analysis with the raw-text fallback;
+                        # the post stays stale, so rerunning the backfill retries it
+                        print(f"Re-analysis of job post {job_id} failed ({e}), keeping its current analysis")
+                        messages_processed.labels(queue=queue, outcome='analysis_failed').inc()
+                        self._settle(ch, method.delivery_tag)
+                        return
+                    # Store the raw text so the post is listed, without a model or
+                    # prompt version so `backfill.py --stale` picks it up again
+                    cleaned_title, cleaned_text, tags = e.fallback
+                    analysis_model = prompt_version = None
 
-            # Acknowledge message
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+                # Embed the cleaned post for semantic search; a failure here only
+                # leaves the post out of semantic results
+                embedding = compute_embedding(cleaned_title, cleaned_text, tags)
 
-        except json.JSONDecodeError as e:
-            print(f"Failed to parse message: {e}")
-            ch.basic_ack(delivery_tag=method.delivery_tag)
+                # Update database with cleaned data
+                with tracer.start_as_current_span('update_cleaned_data'):
+                    success = self.db_client.update_cleaned_data(
+                        job_id=job_id,
+                        cleaned_title=cleaned_title,
+                        cleaned_text=cleaned_text,
+                        tags=tags,
+                        embedding=embedding,
+                        analysis_model=analysis_model,
+                        prompt_version=prompt_version,
+                        expected_processed_at=expected_processed_at,
+                        # Re-analyzed posts are not new to live subscribers
+                        notify=not backfill
+                    )
 
-        except Exception as e:
-            print(f"Error processing message: {e}")
-            # Don't acknowledge - message will be requeued
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                messages_processed.labels(queue=queue, outcome='processed' if success else 'update_failed').inc()
+                processing_duration.observe(time.perf_counter() - started)
+
+                if success:
+                    print(f"Successfully processed job ID: {job_id}")
+                    print(f"  Title: {cleaned_title[:50]}...")
+                    print(f"  Tags: {tags}")
+                else:
+                    print(f"Failed to update database for job ID: {job_id}")
+
+                # Acknowledge message
+                self._settle(ch, method.delivery_tag)
+
+            except NoNodeAvailable as e:
+                # Ollama is out, not the post: requeue it instead of storing the
+                # fallback. The delay keeps redeliveries from spinning until a
+                # node comes back
+                print(f"{e}, requeueing job post in {self.no_node_requeue_delay:.0f}s")
+                messages_processed.labels(queue=queue, outcome='no_node').inc()
+                time.sleep(self.no_node_requeue_delay)
+                self._settle(ch, method.delivery_tag, requeue=True)
+
+            except StaleAnalysisError as e:
+                print(f"Discarding re-analysis: {e}")
+                messages_processed.labels(queue=queue, outcome='stale').inc()
+                self._settle(ch, method.delivery_tag)
+
+            except json.JSONDecodeError as e:
+                print(f"Failed to parse message: {e}")
+                messages_processed.labels(queue=queue, outcome='invalid').inc()
+                self._settle(ch, method.delivery_tag)
+
+            except Exception as e:
+                print(f"Error processing message: {e}")
+                span.record_exception(e)
+                messages_processed.labels(queue=queue, outcome='requeued').inc()
+                # Don't acknowledge - message will be requeued
+                self._settle(ch, method.delivery_tag, requeue=True)
 
     def start_consuming(self):
         """Start consuming messages from the queue."""
+        if self.stopping:
+            self.stop()
+            return
         print(f"Starting consumer on queue: {self.queue_name}")
         print("Waiting for messages. To exit press CTRL+C")
 
         self.channel.basic_consume(
             queue=self.queue_name,
-            on_message_callback=self.process_message,
+            on_message_callback=self.on_message,
             auto_ack=False
         )
+        # Also decides whether to start on the backfill queue
+        self.check_queue_depth()
 
         try:
             self.channel.start_consuming()
         except KeyboardInterrupt:
             print("\nShutting down consumer...")
-            self.stop()
+        self.stop()
+
+    def request_stop(self):
+        """
+        Make start_consuming() return so stop() can drain; safe to call from a
+        signal handler or another thread.
+        """
+        self.stopping = True
+        if self.connection and self.connection.is_open:
+            self.connection.add_callback_threadsafe(self.channel.stop_consuming)
 
     def stop(self):
-        """Stop consuming and close connections."""
-        if self.channel:
+        """
+        Stop consuming and close connections. Delivered messages still
+        waiting for a worker thread are nacked back to the queue at once.
+        Messages a worker has started get CONSUMER_DRAIN_TIMEOUT seconds to
+        finish and be acked; the connection keeps its heartbeats going
+        meanwhile. Whatever is still unacked when it closes is requeued by
+        the broker.
+        """
+        if self.channel and self.channel.is_open:
             self.channel.stop_consuming()
+        if self.backfill_channel and self.backfill_channel.is_open:
+            self._pause_backfill()
+        requeue = [self.pending.pop(future) for future in list(self.pending) if future.cancel()]
+        # Never block the connection thread on the workers
+        self.executor.shutdown(wait=False)
+        if self.connection and self.connection.is_open:
+            for ch, delivery_tag in requeue:
+                if ch.is_open:
+                    ch.basic_nack(delivery_tag=delivery_tag, requeue=True)
+            if requeue:
+                print(f"Requeued {len(requeue)} messages that were not started")
+            # Workers settle through add_callback_threadsafe, which only runs
+            # while the connection processes events
+            deadline = time.monotonic() + self.drain_timeout
+            while self.pending and time.monotonic() < deadline:
+                self.connection.process_data_events(time_limit=0.5)
+            self.connection.process_data_events(time_limit=0)
+            if self.pending:
+                print(f"{len(self.pending)} messages still in progress, leaving them to be redelivered")
         if self.connection and not self.connection.is_closed:
             self.connection.close()
         self.db_client.close()
@@ -158,9 +436,15 @@ class JobPostConsumer:
 
 def main():
     """Main entry point for the consumer."""
+    start_metrics_server()
+    init_tracing('llm_consumer')
     consumer = JobPostConsumer()
+    # docker stop and the supervisor retire workers with SIGTERM: drain, don't drop
+    signal.signal(signal.SIGTERM, lambda signum, frame: consumer.request_stop())
 
     try:
+        # Load the models before taking messages so the first post is not a cold start
+        consumer.warm_up('startup', wait=True)
         consumer.connect()
         consumer.start_consuming()
     except Exception as e:
@@ -1,64 +1,35 @@
 """
 Database client for fetching and updating job posts in PostgreSQL.
 """
-import os
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text, create_engine, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from typing import Optional, Dict, Any
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from typing import List, Optional
 from dotenv import load_dotenv
+from metrics import db_query_duration
+from jobposts.database import get_database_url
+from jobposts.embeddings import get_embedding_model, upsert_embedding
+from jobposts.listing import upsert_listing
+from jobposts.metrics import observe_queries
+from jobposts.tracing import current_traceparent
+from jobposts.models import NOTIFY_CHANNEL, RawJobPost, bump_data_version
 
 load_dotenv()
 
-Base = declarative_base()
 
-
-class RawJobPost(Base):
-    """
-    SQLAlchemy model matching the raw_job_posts table.
-    """
-    __tablename__ = 'raw_job_posts'
-
-    # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
-
-    # Raw data from Reddit (filled by scraper)
-    reddit_id = Column(String(50), unique=True, nullable=False, index=True)
-    title = Column(Text, nullable=False)
-    body = Column(Text)
-    author = Column(String(100))
-    created_utc = Column(DateTime, nullable=False)
-    score = Column(Integer)
-    url = Column(Text)
-    subreddit = Column(String(100))
-    scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-
-    # Cleaned data (filled by LLM service, nullable initially)
-    cleaned_title = Column(Text, nullable=True)
-    cleaned_text = Column(Text, nullable=True)
-    tags = Column(JSON, nullable=True)
-    processed_at = Column(DateTime, nullable=True)
+class StaleAnalysisError(Exception):
+    """A re-analysis lost the race: the post was re-analyzed since it was read."""
 
 
 class DatabaseClient:
     """Client for interacting with PostgreSQL database."""
 
     def __init__(self):
-        self.database_url = self._get_database_url()
+        self.database_url = get_database_url()
         self.engine = create_engine(self.database_url)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
-
-    def _get_database_url(self) -> str:
-        """Construct database URL from environment variables."""
-        return (
-            f"postgresql://{os.getenv('POSTGRES_USER')}:"
-            f"{os.getenv('POSTGRES_PASSWORD')}@"
-            f"{os.getenv('POSTGRES_HOST')}:"
-            f"{os.getenv('POSTGRES_PORT')}/"
-            f"{os.getenv('POSTGRES_DB')}"
-        )
+        observe_queries(self.engine, db_query_duration)
+        # One session per worker thread; the consumer handles messages concurrently
+        self.session = scoped_session(sessionmaker(bind=self.engine))
 
     def fetch_job_post(self, job_id: int) -> Optional[RawJobPost]:
         """
@@ -81,7 +52,12 @@ class DatabaseClient:
         job_id: int,
         cleaned_title: str,
         cleaned_text: str,
-        tags: list
+        tags: list,
+        embedding: Optional[List[float]] = None,
+        analysis_model: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        expected_processed_at: Optional[datetime] = None,
+        notify: bool = True
     ) -> bool:
         """
         Update cleaned data columns for a job post.
@@ -91,30 +67,87 @@ class DatabaseClient:
             cleaned_title: Processed title
             cleaned_text: Processed text
             tags: List of tags/categories
+            embedding: Optional embedding for semantic search
+            analysis_model: Ollama model that produced the cleaned data
+            prompt_version: Prompt template version that produced it
+            expected_processed_at: For re-analysis, the processed_at of the
+                analysis being replaced; the write only happens if the row
+                still has it
+            notify: NOTIFY live subscribers of the processed post
 
         Returns:
             True if update successful, False otherwise
+
+        Raises:
+            StaleAnalysisError: The row's processed_at no longer matches
+                expected_processed_at; nothing was written
         """
         try:
-            job_post = self.session.query(RawJobPost).filter_by(id=job_id).first()
+            query = self.session.query(RawJobPost).filter_by(id=job_id)
+            if expected_processed_at is not None:
+                # Lock the row and re-read it so the check and the write are atomic
+                query = query.with_for_update().populate_existing()
+            job_post = query.first()
             if not job_post:
                 print(f"Job post {job_id} not found")
                 return False
+            if expected_processed_at is not None and job_post.processed_at != expected_processed_at:
+                raise StaleAnalysisError(
+                    f"job post {job_id} was re-analyzed at {job_post.processed_at} "
+                    f"({job_post.analysis_model}/{job_post.prompt_version}) since it was read"
+                )
 
             job_post.cleaned_title = cleaned_title
             job_post.cleaned_text = cleaned_text
             job_post.tags = tags
             job_post.processed_at = datetime.utcnow()
+            job_post.analysis_model = analysis_model
+            job_post.prompt_version = prompt_version
+
+            # Keep the API's read model in step with the raw row
+            upsert_listing(self.session, job_post)
+            if embedding is not None:
+                # Savepoint: a failed embedding write only leaves the post out of
+                # semantic search, it must not roll back the analysis
+                try:
+                    with self.session.begin_nested():
+                        upsert_embedding(self.session, job_id, get_embedding_model(), embedding)
+                except Exception as e:
+                    print(f"Error storing embedding for job post {job_id}: {e}")
+
+            # Invalidate cached API responses and notify live subscribers;
+            # both take effect only when the transaction commits
+            bump_data_version(self.session)
+            if notify:
+                self._notify_processed(job_id)
 
             self.session.commit()
             print(f"Updated cleaned data for job post {job_id}")
             return True
 
+        except StaleAnalysisError:
+            self.session.rollback()
+            raise
+
         except Exception as e:
             self.session.rollback()
             print(f"Error updating job post {job_id}: {e}")
             return False
 
+    def _notify_processed(self, job_id: int):
+        """
+        Queue a NOTIFY for the API's server-sent events feed.
+
+        The payload is the job id, followed by the current traceparent when
+        tracing is enabled so the API's fan-out joins the post's trace.
+        """
+        traceparent = current_traceparent()
+        payload = f"{job_id} {traceparent}" if traceparent else str(job_id)
+        self.session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {'channel': NOTIFY_CHANNEL, 'payload': payload}
+        )
+
     def close(self):
         """Close database connection."""
-        self.session.close()
+        self.session.remove()
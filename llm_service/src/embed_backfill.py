@@ -0,0 +1,86 @@
+"""
+Embed processed job posts that have no embedding yet.
+
+New posts are embedded by the consumer as they are processed; this covers
+posts processed before semantic search existed, or whose embedding request
+failed. It walks job_listing in id order and commits one batch at a time, so
+it can be stopped and rerun at any point.
+
+Usage:
+    python src/embed_backfill.py --batch-size 100
+"""
+import argparse
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+from jobposts.database import get_database_url
+from jobposts.embeddings import JobEmbedding, get_embedding_model, upsert_embedding
+from jobposts.models import JobListing
+from analyzer import compute_embedding
+
+load_dotenv()
+
+
+def backfill_embeddings(session, batch_size: int = 100, limit: int = None) -> int:
+    """
+    Embed processed listings missing from job_embeddings.
+
+    Args:
+        session: SQLAlchemy session
+        batch_size: Posts embedded per transaction
+        limit: Stop after this many posts (None for all)
+
+    Returns:
+        Number of posts embedded
+    """
+    model = get_embedding_model()
+    embedded = 0
+    last_id = 0
+
+    while limit is None or embedded < limit:
+        rows = session.execute(
+            select(JobListing.id, JobListing.cleaned_title, JobListing.cleaned_text, JobListing.tags)
+            .outerjoin(JobEmbedding, JobEmbedding.id == JobListing.id)
+            .where(
+                JobListing.id > last_id,
+                JobListing.processed_at.isnot(None),
+                JobEmbedding.id.is_(None)
+            )
+            .order_by(JobListing.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        for job_id, cleaned_title, cleaned_text, tags in rows:
+            last_id = job_id
+            embedding = compute_embedding(cleaned_title, cleaned_text, tags)
+            if embedding is None:
+                continue
+            upsert_embedding(session, job_id, model, embedding)
+            embedded += 1
+
+        session.commit()
+        print(f"Embedded {embedded} posts (up to id {last_id})")
+
+    return embedded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    engine = create_engine(get_database_url())
+    session = sessionmaker(bind=engine)()
+    try:
+        total = backfill_embeddings(session, batch_size=args.batch_size, limit=args.limit)
+        print(f"Done: embedded {total} posts")
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""
+Pool of Ollama nodes with health-aware load balancing.
+
+OLLAMA_HOSTS lists the base URLs to use (comma-separated); without it the
+pool has a single node at OLLAMA_HOST, which is what the ollama module-level
+functions used before. Each request goes to the available node with the
+fewest outstanding requests. A node is unavailable while
+
+- it is at OLLAMA_NODE_CONCURRENCY in-flight requests,
+- its last health check (GET /api/tags every OLLAMA_HEALTH_INTERVAL seconds)
+  failed, or
+- its circuit is open: OLLAMA_FAILURE_THRESHOLD consecutive failures open
+  it for OLLAMA_CIRCUIT_RESET_SECONDS, after which one trial request is let
+  through (half-open) and closes it again on success.
+
+Connection errors, timeouts and 5xx responses count as node failures and the
+request is retried on another node. 4xx responses (e.g. a model that is not
+pulled) are the caller's problem and are raised as-is.
+
+OLLAMA_NODE_CONCURRENCY is per process unless OLLAMA_SLOT_DIR is set. Then
+every process pointing at the same directory shares one limit per node: a
+request also needs one of the node's OLLAMA_NODE_CONCURRENCY slot files,
+locked with flock. The kernel drops the lock when a process dies, so a
+killed worker never leaks a slot. The consumer supervisor sets it up for
+its workers.
+"""
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from typing import List, Optional
+
+import httpx
+import ollama
+
+from metrics import llm_node_outstanding, llm_node_requests, llm_node_up
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class NoNodeAvailable(TimeoutError):
+    """Every node is down or open, or all stayed saturated for the wait timeout."""
+
+
+class SharedSlots:
+    """
+    A node's request slots shared between processes, one locked file each.
+
+    Args:
+        slot_dir: Directory holding the slot files of every node
+        host: Node base URL
+        count: Number of slots (the per-node concurrency limit)
+    """
+
+    def __init__(self, slot_dir: str, host: str, count: int):
+        os.makedirs(slot_dir, exist_ok=True)
+        prefix = hashlib.sha1(host.encode()).hexdigest()[:12]
+        self.files = [open(os.path.join(slot_dir, f"{prefix}.{index}.lock"), 'a+') for index in range(count)]
+        self.held = []
+
+    def try_acquire(self) -> bool:
+        """Lock a free slot without blocking."""
+        for slot in self.files:
+            if slot in self.held:
+                continue
+            try:
+                fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            self.held.append(slot)
+            return True
+        return False
+
+    def release(self):
+        """Unlock one of the slots this process holds; they are interchangeable."""
+        fcntl.flock(self.held.pop(), fcntl.LOCK_UN)
+
+
+class OllamaNode:
+    """One Ollama base URL with its load, health and circuit state."""
+
+    def __init__(self, host: str, max_concurrency: int, timeout: float, slot_dir: Optional[str] = None):
+        self.host = host
+        self.client = ollama.Client(host=host, timeout=timeout)
+        self.max_concurrency = max_concurrency
+        self.slots = SharedSlots(slot_dir, host, max_concurrency) if slot_dir else None
+        self.outstanding = 0
+        self.healthy = True
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def available(self, now: float, reset_seconds: float) -> bool:
+        if not self.healthy or self.outstanding >= self.max_concurrency:
+            return False
+        if self.state == OPEN:
+            return now - self.opened_at >= reset_seconds
+        if self.state == HALF_OPEN:
+            # Only the single trial request may be in flight
+            return self.outstanding == 0
+        return True
+
+    def reserve(self) -> bool:
+        """Take a slot in the shared per-node limit, if there is one."""
+        return self.slots is None or self.slots.try_acquire()
+
+    def unreserve(self):
+        if self.slots is not None:
+            self.slots.release()
+
+
+class OllamaPool:
+    """
+    Routes Ollama chat and embedding calls across several nodes.
+
+    Args:
+        hosts: Ollama base URLs
+        max_concurrency: In-flight requests allowed per node
+        failure_threshold: Consecutive failures that open a node's circuit
+        reset_seconds: Time an open circuit waits before a trial request
+        health_interval: Seconds between health checks (0 disables them)
+        wait_timeout: How long a request waits for a free node
+        request_timeout: HTTP timeout of a single Ollama request
+        slot_dir: Share max_concurrency with other processes through lock files here
+    """
+
+    def __init__(self, hosts: List[str], max_concurrency: int = 2, failure_threshold: int = 3,
+                 reset_seconds: float = 30.0, health_interval: float = 10.0,
+                 wait_timeout: float = 300.0, request_timeout: float = 300.0,
+                 slot_dir: Optional[str] = None):
+        if not hosts:
+            raise ValueError("OllamaPool needs at least one host")
+        self.nodes = [OllamaNode(host, max_concurrency, request_timeout, slot_dir) for host in hosts]
+        # Other processes free shared slots without notifying us, so poll them
+        self.poll_interval = 0.1 if slot_dir else 1.0
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.wait_timeout = wait_timeout
+        self._condition = threading.Condition()
+        for node in self.nodes:
+            llm_node_up.labels(node=node.host).set(1)
+
+        if health_interval > 0:
+            threading.Thread(
+                target=self._health_loop, args=(health_interval,), name='ollama-health', daemon=True
+            ).start()
+
+    def chat(self, **kwargs) -> dict:
+        """ollama.chat on the least loaded available node."""
+        return self._call('chat', kwargs)
+
+    def embeddings(self, **kwargs) -> dict:
+        """ollama.embeddings on the least loaded available node."""
+        return self._call('embeddings', kwargs)
+
+    def warm_up(self, model: str, keep_alive=None, embedding: bool = False) -> dict:
+        """
+        Load a model on every reachable node in parallel.
+
+        Uses an empty generate request (or a one-word embedding for embedding
+        models), which makes Ollama load the model without generating.
+
+        Args:
+            model: Model name
+            keep_alive: How long Ollama keeps the model loaded afterwards
+            embedding: Whether `model` is an embedding model
+
+        Returns:
+            {host: load time in seconds, or None if the node failed}
+        """
+        now = time.monotonic()
+        with self._condition:
+            nodes = [node for node in self.nodes if node.healthy and node.state != OPEN]
+        results = {}
+
+        def load(node: OllamaNode):
+            try:
+                if embedding:
+                    response = node.client.embeddings(model=model, prompt='warm-up', keep_alive=keep_alive)
+                else:
+                    response = node.client.generate(model=model, prompt='', keep_alive=keep_alive)
+                results[node.host] = (response.get('load_duration') or 0) / 1e9
+            except Exception as e:
+                print(f"Warm-up of {model} on {node.host} failed: {e}")
+                results[node.host] = None
+
+        threads = [threading.Thread(target=load, args=(node,), daemon=True) for node in nodes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"Warmed up {model} on {len(nodes)} nodes in {time.monotonic() - now:.1f}s")
+        return results
+
+    def _call(self, method: str, kwargs: dict) -> dict:
+        tried = set()
+        last_error: Optional[Exception] = None
+        # Each node is tried at most once per call
+        while len(tried) < len(self.nodes):
+            node = self._acquire(tried)
+            if node is None:
+                break
+            tried.add(node.host)
+            failed = False
+            try:
+                response = getattr(node.client, method)(**kwargs)
+            except ollama.ResponseError as e:
+                # The client reports non-HTTP failures as status -1
+                if 0 <= e.status_code < 500:
+                    llm_node_requests.labels(node=node.host, outcome='client_error').inc()
+                    raise
+                failed = True
+                last_error = e
+            except (httpx.HTTPError, OSError) as e:
+                # OSError covers ConnectionError and socket timeouts
+                failed = True
+                last_error = e
+            except Exception:
+                # Not the node's fault (or not known to be): no failover
+                llm_node_requests.labels(node=node.host, outcome='error').inc()
+                raise
+            else:
+                llm_node_requests.labels(node=node.host, outcome='success').inc()
+                response['node'] = node.host
+                return response
+            finally:
+                # Always give the slot back, or the node fills up and is never picked again
+                self._release(node, failed=failed)
+            llm_node_requests.labels(node=node.host, outcome='failure').inc()
+            print(f"Ollama node {node.host} failed: {last_error}")
+
+        if last_error is not None:
+            raise last_error
+        raise NoNodeAvailable("No Ollama node available: every node is down, open or saturated")
+
+    def _acquire(self, exclude: set) -> Optional[OllamaNode]:
+        """
+        Reserve a slot on the least loaded available node, waiting for one
+        to free up. Returns None at once when no node is healthy and closed.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                candidates = [
+                    node for node in self.nodes
+                    if node.host not in exclude and node.available(now, self.reset_seconds)
+                ]
+                for node in sorted(candidates, key=lambda candidate: candidate.outstanding):
+                    if not node.reserve():
+                        continue
+                    if node.state == OPEN:
+                        node.state = HALF_OPEN
+                        print(f"Ollama node {node.host} circuit half-open, sending a trial request")
+                    node.outstanding += 1
+                    llm_node_outstanding.labels(node=node.host).set(node.outstanding)
+                    return node
+                if exclude and all(node.host in exclude for node in self.nodes):
+                    return None
+                # Only a saturated node frees up by waiting; with every node
+                # down or open, fail now instead of after the wait timeout
+                if not any(
+                    node.healthy and node.state != OPEN
+                    for node in self.nodes if node.host not in exclude
+                ):
+                    return None
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                # Woken on release and health changes; the timeout also
+                # catches open circuits becoming eligible for a trial
+                self._condition.wait(min(remaining, self.poll_interval))
+
+    def _release(self, node: OllamaNode, failed: bool):
+        with self._condition:
+            node.unreserve()
+            node.outstanding -= 1
+            llm_node_outstanding.labels(node=node.host).set(node.outstanding)
+            if failed:
+                node.failures += 1
+                if node.state == HALF_OPEN or node.failures >= self.failure_threshold:
+                    if node.state != OPEN:
+                        print(f"Ollama node {node.host} circuit opened after {node.failures} failures")
+                    node.state = OPEN
+                    node.opened_at = time.monotonic()
+            else:
+                if node.state != CLOSED:
+                    print(f"Ollama node {node.host} circuit closed")
+                node.state = CLOSED
+                node.failures = 0
+            self._condition.notify_all()
+
+    def _health_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            for node in self.nodes:
+                try:
+                    node.client.list()
+                    healthy = True
+                except Exception:
+                    healthy = False
+                with self._condition:
+                    if healthy != node.healthy:
+                        print(f"Ollama node {node.host} is {'up' if healthy else 'down'}")
+                    node.healthy = healthy
+                    self._condition.notify_all()
+                llm_node_up.labels(node=node.host).set(1 if healthy else 0)
+
+
+def hosts_from_env() -> List[str]:
+    """OLLAMA_HOSTS, falling back to OLLAMA_HOST and then Ollama's default."""
+    hosts = [host.strip() for host in os.getenv('OLLAMA_HOSTS', '').split(',') if host.strip()]
+    return hosts or [os.getenv('OLLAMA_HOST') or 'http://localhost:11434']
+
+
+_pool: Optional[OllamaPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> OllamaPool:
+    """Process-wide pool configured from the environment, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OllamaPool(
+                hosts_from_env(),
+                max_concurrency=int(os.getenv('OLLAMA_NODE_CONCURRENCY', 2)),
+                failure_threshold=int(os.getenv('OLLAMA_FAILURE_THRESHOLD', 3)),
+                reset_seconds=float(os.getenv('OLLAMA_CIRCUIT_RESET_SECONDS', 30)),
+                health_interval=float(os.getenv('OLLAMA_HEALTH_INTERVAL', 10)),
+                request_timeout=float(os.getenv('OLLAMA_REQUEST_TIMEOUT', 300)),
+                slot_dir=os.getenv('OLLAMA_SLOT_DIR') or None,
+            )
+            print(f"Ollama pool: {', '.join(node.host for node in _pool.nodes)}")
+        return _pool
@@ -0,0 +1,92 @@
+"""
+Prometheus metrics for the LLM consumer, served on METRICS_PORT.
+
+Set METRICS_ENABLED=false to turn every metric into a no-op.
+"""
+import os
+
+from jobposts.metrics import MetricSet, metrics_enabled_from_env
+
+metrics = MetricSet('llm_consumer', enabled=metrics_enabled_from_env())
+
+messages_processed = metrics.counter(
+    'messages_processed_total', 'Queue messages handled, by queue (live or backfill) and outcome',
+    ['queue', 'outcome']
+)
+queue_wait = metrics.histogram(
+    'queue_wait_seconds', 'Time between publish and the consumer receiving the message',
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0, 7200.0)
+)
+processing_duration = metrics.histogram(
+    'processing_duration_seconds', 'End-to-end handling time of one message',
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+)
+llm_request_duration = metrics.histogram(
+    'llm_request_duration_seconds', 'Ollama chat request latency with the model already loaded', ['model'],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+)
+llm_cold_start_duration = metrics.histogram(
+    'llm_cold_start_duration_seconds',
+    'Model load time, from warm-ups and from requests that had to load the model', ['model', 'source'],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+)
+queue_depth = metrics.gauge(
+    'queue_depth', 'Messages ready in the job posts queue, from the last depth check'
+)
+llm_prefill_duration = metrics.histogram(
+    'llm_prefill_duration_seconds', 'Prompt evaluation time reported by Ollama (uncached tokens only)',
+    ['model', 'prompt_version'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+llm_tokens = metrics.counter(
+    'llm_tokens_total', 'Tokens processed by Ollama', ['model', 'kind']
+)
+llm_errors = metrics.counter(
+    'llm_errors_total', 'Failed Ollama chat requests', ['model']
+)
+parse_failures = metrics.counter(
+    'parse_failures_total', 'LLM responses that were not valid JSON'
+)
+embedding_duration = metrics.histogram(
+    'embedding_duration_seconds', 'Ollama embeddings request latency', ['model']
+)
+llm_node_requests = metrics.counter(
+    'llm_node_requests_total', 'Ollama requests per pool node, by outcome', ['node', 'outcome']
+)
+llm_node_outstanding = metrics.gauge(
+    'llm_node_outstanding_requests', 'In-flight Ollama requests per pool node', ['node']
+)
+llm_node_up = metrics.gauge(
+    'llm_node_up', 'Whether the pool node passed its last health check', ['node']
+)
+llm_concurrency_limit = metrics.gauge(
+    'llm_concurrency_limit', 'Current adaptive limit on in-flight Ollama chat requests'
+)
+llm_in_flight = metrics.gauge(
+    'llm_in_flight_requests', 'Ollama chat requests currently in flight'
+)
+llm_latency_estimate = metrics.gauge(
+    'llm_latency_estimate_seconds', 'Chat latency averages used by the limiter', ['window']
+)
+db_query_duration = metrics.histogram(
+    'db_query_duration_seconds', 'Database round-trip time per statement', ['statement']
+)
+
+
+# The supervisor (supervisor.py) is a separate process with its own set
+supervisor_metrics = MetricSet('llm_supervisor', enabled=metrics_enabled_from_env())
+
+supervisor_workers = supervisor_metrics.gauge(
+    'workers', 'Consumer worker processes, by state', ['state']
+)
+supervisor_queue_depth = supervisor_metrics.gauge(
+    'queue_depth', 'Messages ready in the job posts queue, from the last poll'
+)
+supervisor_scale_events = supervisor_metrics.counter(
+    'scale_events_total', 'Workers started and retired, by direction', ['direction']
+)
+
+
+def start_metrics_server():
+    """Expose /metrics for Prometheus to scrape."""
+    metrics.start_http_server(int(os.getenv('METRICS_PORT', 9100)))
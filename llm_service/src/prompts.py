@@ -0,0 +1,110 @@
+"""
+Versioned prompt templates for job post analysis.
+
+Each processed row records the version of the template that produced it
+(raw_job_posts.prompt_version), so results can be compared across prompt
+changes and re-analyzed selectively. Never edit a released template in
+place; add a new version and point PROMPT_VERSION at it.
+
+From v2 on, every byte that does not depend on the post (system prompt,
+instructions and output format) comes first and is identical across calls,
+and the per-post TITLE/BODY come last. Inference servers that cache the KV
+state of a shared prefix (Ollama/llama.cpp reuse the longest common prefix
+of the previous request in a slot) then only prefill the post itself.
+"""
+import os
+from typing import Dict, List
+
+
+class PromptTemplate:
+    """
+    A chat prompt for the analyzer.
+
+    Args:
+        version: Identifier stored with every row analyzed with this template
+        system: System message
+        user: User message template with {title} and {body} placeholders
+    """
+
+    def __init__(self, version: str, system: str, user: str):
+        self.version = version
+        self.system = system
+        self.user = user
+
+    def messages(self, title: str, body: str) -> List[Dict[str, str]]:
+        """Chat messages for one post."""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user.format(title=title, body=body)},
+        ]
+
+    def static_prefix(self) -> str:
+        """The part of the prompt shared by every post (up to the first placeholder)."""
+        return self.system + "\n" + self.user.split("{", 1)[0]
+
+
+_OUTPUT_FORMAT = """{{
+    "cleaned_title": "A concise, professional version of the title",
+    "cleaned_text": "A cleaned summary of the job description with key details",
+    "tags": ["tag1", "tag2", "tag3"]
+}}"""
+
+_TAG_GUIDANCE = (
+    "Tags should include: job type, experience level, key technologies/skills, "
+    "remote/location info, and any other relevant categories."
+)
+
+# The original prompt: the post comes before the instructions, so no two
+# requests share more than the system message
+V1 = PromptTemplate(
+    version="v1",
+    system=(
+        "You are a helpful assistant that extracts structured information from job posts. "
+        "Always respond with valid JSON only."
+    ),
+    user=f"""You are a job post analyzer. Extract and clean the following information from this job posting.
+
+TITLE: {{title}}
+
+BODY: {{body}}
+
+Please provide your analysis in this EXACT JSON format (no extra text):
+{_OUTPUT_FORMAT}
+
+{_TAG_GUIDANCE}
+
+Response:""",
+)
+
+# Same instructions, static prefix first: everything but the post lives in the
+# system message, and the user message is only the post
+V2 = PromptTemplate(
+    version="v2",
+    system=f"""You are a job post analyzer that extracts structured information from job posts. Always respond with valid JSON only.
+
+Extract and clean the following information from the job posting in the next message.
+
+Provide your analysis in this EXACT JSON format (no extra text):
+{_OUTPUT_FORMAT.replace('{{', '{').replace('}}', '}')}
+
+{_TAG_GUIDANCE}""",
+    user="TITLE: {title}\n\nBODY: {body}",
+)
+
+TEMPLATES = {template.version: template for template in (V1, V2)}
+
+DEFAULT_PROMPT_VERSION = "v2"
+
+
+def get_prompt_template(version: str = None) -> PromptTemplate:
+    """
+    Template by version (default: PROMPT_VERSION, else the latest).
+
+    Raises:
+        KeyError: If the version is unknown
+    """
+    version = version or os.getenv("PROMPT_VERSION", DEFAULT_PROMPT_VERSION)
+    try:
+        return TEMPLATES[version]
+    except KeyError:
+        raise KeyError(f"Unknown prompt version {version!r}; known: {', '.join(TEMPLATES)}") from None
@@ -0,0 +1,309 @@
+"""
+Runs consumer.py worker processes and scales them with the queue depth.
+
+Scrapes arrive in bursts, so a fixed number of consumers either drains the
+queue slowly after a burst or sits idle the rest of the time. The supervisor
+polls the number of ready messages in the live queue every
+SUPERVISOR_POLL_INTERVAL seconds and keeps
+
+    ceil(depth / SCALE_MESSAGES_PER_WORKER)
+
+workers running, bounded by CONSUMER_MIN_WORKERS and CONSUMER_MAX_WORKERS.
+Workers start as soon as the queue grows. They are retired one at a time, and
+only after fewer workers have been enough for SCALE_DOWN_DELAY seconds, so a
+short lull between batches does not cause churn.
+
+Workers are retired, and stopped when the supervisor gets SIGTERM, with
+SIGTERM. A consumer stops taking messages, finishes and acks the ones it is
+working on, then exits. Workers still running DRAIN_TIMEOUT seconds later are
+killed. Worker N serves its metrics on METRICS_PORT + N.
+
+Every worker has its own Ollama node pool, so OLLAMA_NODE_CONCURRENCY is
+enforced as one limit per node across all workers rather than split between
+them. The supervisor creates a slot directory and passes it to every worker
+as OLLAMA_SLOT_DIR, and the workers' pools take a locked slot file per
+request (see llm_pool). Scaling out does not multiply the load on a node, a
+lone worker can still use the whole limit, and a killed worker's slots are
+freed by the kernel.
+
+The depth comes from a passive queue_declare (SUPERVISOR_DEPTH_SOURCE=amqp,
+the default) or from the RabbitMQ management API (management, at
+RABBITMQ_MANAGEMENT_URL).
+
+Usage:
+    CONSUMER_MIN_WORKERS=1 CONSUMER_MAX_WORKERS=4 python src/supervisor.py
+"""
+import base64
+import json
+import math
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from typing import Dict, Optional
+
+import pika
+from dotenv import load_dotenv
+from metrics import supervisor_metrics, supervisor_queue_depth, supervisor_scale_events, supervisor_workers
+
+CONSUMER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'consumer.py')
+
+
+class AmqpQueueDepth:
+    """Ready-message count from a passive queue_declare on a long-lived connection."""
+
+    def __init__(self, queue_name: str):
+        self.queue_name = queue_name
+        self.connection = None
+        self.channel = None
+
+    def __call__(self) -> int:
+        try:
+            if self.connection is None or self.connection.is_closed:
+                credentials = pika.PlainCredentials(
+                    os.getenv('RABBITMQ_USER', 'guest'),
+                    os.getenv('RABBITMQ_PASSWORD', 'guest')
+                )
+                self.connection = pika.BlockingConnection(pika.ConnectionParameters(
+                    host=os.getenv('RABBITMQ_HOST', 'localhost'),
+                    port=int(os.getenv('RABBITMQ_PORT', 5672)),
+                    credentials=credentials
+                ))
+                self.channel = self.connection.channel()
+            return self.channel.queue_declare(
+                queue=self.queue_name, durable=True, passive=True
+            ).method.message_count
+        except Exception:
+            # Reconnect on the next poll
+            self.close()
+            raise
+
+    def close(self):
+        if self.connection is not None and not self.connection.is_closed:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+
+
+class ManagementQueueDepth:
+    """Ready-message count from the RabbitMQ management HTTP API."""
+
+    def __init__(self, queue_name: str, base_url: str, vhost: str = '/'):
+        self.url = (
+            f"{base_url.rstrip('/')}/api/queues/"
+            f"{urllib.parse.quote(vhost, safe='')}/{urllib.parse.quote(queue_name, safe='')}"
+        )
+        credentials = f"{os.getenv('RABBITMQ_USER', 'guest')}:{os.getenv('RABBITMQ_PASSWORD', 'guest')}"
+        self.authorization = 'Basic ' + base64.b64encode(credentials.encode()).decode()
+
+    def __call__(self) -> int:
+        request = urllib.request.Request(self.url, headers={'Authorization': self.authorization})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            # messages_ready can be missing right after the queue is created
+            return int(json.loads(response.read()).get('messages_ready') or 0)
+
+    def close(self):
+        pass
+
+
+class Worker:
+    """One consumer.py process."""
+
+    def __init__(self, slot: int, metrics_port_base: int, node_concurrency: int, slot_dir: str):
+        self.slot = slot
+        env = dict(
+            os.environ,
+            METRICS_PORT=str(metrics_port_base + slot),
+            OLLAMA_NODE_CONCURRENCY=str(node_concurrency),
+            OLLAMA_SLOT_DIR=slot_dir,
+        )
+        self.process = subprocess.Popen([sys.executable, CONSUMER_SCRIPT], env=env)
+        self.retiring_since = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def retire(self):
+        """Ask the worker to drain and exit."""
+        if self.retiring_since is None:
+            self.retiring_since = time.monotonic()
+            self.process.send_signal(signal.SIGTERM)
+
+    def exited(self) -> bool:
+        return self.process.poll() is not None
+
+
+class ConsumerSupervisor:
+    """
+    Keeps between min_workers and max_workers consumer processes running.
+
+    Args:
+        read_depth: Callable returning the live queue's ready-message count
+        min_workers: Workers kept running when the queue is empty
+        max_workers: Upper bound on running workers
+        messages_per_worker: Ready messages that justify one more worker
+        poll_interval: Seconds between depth polls
+        scale_down_delay: Seconds fewer workers must suffice before one is retired
+        drain_timeout: Seconds a retiring worker may take before it is killed
+        metrics_port_base: Worker N serves metrics on this port + N
+        node_concurrency: In-flight requests per Ollama node across all workers
+    """
+
+    def __init__(self, read_depth, min_workers: int = 1, max_workers: int = 4,
+                 messages_per_worker: int = 20, poll_interval: float = 10.0,
+                 scale_down_delay: float = 120.0, drain_timeout: float = 300.0,
+                 metrics_port_base: int = 9100, node_concurrency: int = 2):
+        self.read_depth = read_depth
+        self.min_workers = min_workers
+        self.max_workers = max(min_workers, max_workers)
+        self.messages_per_worker = messages_per_worker
+        self.poll_interval = poll_interval
+        self.scale_down_delay = scale_down_delay
+        self.drain_timeout = drain_timeout
+        self.metrics_port_base = metrics_port_base
+        self.node_concurrency = node_concurrency
+        # Shared by every worker's pool, whatever the number of workers
+        self.slot_dir = tempfile.mkdtemp(prefix='ollama-slots-')
+        self.workers: Dict[int, Worker] = {}
+        self.retiring = []
+        self.surplus_since: Optional[float] = None
+        self.stopping = threading.Event()
+
+    def stop(self, *args):
+        print("Stopping supervisor...")
+        self.stopping.set()
+
+    def desired_workers(self, depth: int) -> int:
+        """Workers wanted for a queue depth, within the bounds."""
+        wanted = math.ceil(depth / self.messages_per_worker) if self.messages_per_worker > 0 else 0
+        return max(self.min_workers, min(self.max_workers, wanted))
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.reap()
+            try:
+                depth = self.read_depth()
+                supervisor_queue_depth.set(depth)
+                self.scale(self.desired_workers(depth))
+            except Exception as e:
+                # Without a depth, keep the current workers but respect the minimum
+                print(f"Queue depth check failed: {e}")
+                self.scale(max(self.min_workers, len(self.workers)))
+            self._report()
+            self.stopping.wait(self.poll_interval)
+
+        self.shutdown()
+
+    def scale(self, desired: int):
+        """Start workers up to desired, or retire one once the surplus has lasted."""
+        running = len(self.workers)
+        if desired > running:
+            for _ in range(desired - running):
+                self._start_worker()
+            print(f"Scaled up {running} -> {desired} workers")
+            self.surplus_since = None
+        elif desired < running:
+            now = time.monotonic()
+            if self.surplus_since is None:
+                self.surplus_since = now
+            elif now - self.surplus_since >= self.scale_down_delay:
+                # Newest first, so long-lived workers with warm connections stay
+                worker = self.workers.pop(max(self.workers))
+                worker.retire()
+                self.retiring.append(worker)
+                supervisor_scale_events.labels(direction='down').inc()
+                print(f"Retiring worker {worker.slot} (pid {worker.pid}), {running - 1} workers left")
+                # The next retirement waits a full delay again
+                self.surplus_since = now
+        else:
+            self.surplus_since = None
+
+    def reap(self):
+        """Forget exited workers and kill retiring ones past the drain timeout."""
+        for slot, worker in list(self.workers.items()):
+            if worker.exited():
+                print(f"Worker {slot} (pid {worker.pid}) exited with {worker.process.returncode}")
+                del self.workers[slot]
+        now = time.monotonic()
+        for worker in list(self.retiring):
+            if worker.exited():
+                self.retiring.remove(worker)
+            elif now - worker.retiring_since > self.drain_timeout:
+                print(f"Worker {worker.slot} (pid {worker.pid}) did not drain in {self.drain_timeout:.0f}s, killing")
+                worker.process.kill()
+
+    def shutdown(self):
+        """Retire every worker and wait for them to drain."""
+        for worker in self.workers.values():
+            worker.retire()
+            self.retiring.append(worker)
+        self.workers.clear()
+        print(f"Draining {len(self.retiring)} workers")
+        while self.retiring:
+            self.reap()
+            self._report()
+            time.sleep(0.5)
+        if hasattr(self.read_depth, 'close'):
+            self.read_depth.close()
+        shutil.rmtree(self.slot_dir, ignore_errors=True)
+        print("Supervisor stopped")
+
+    def _start_worker(self):
+        # Lowest free slot, so metrics ports stay within METRICS_PORT + max_workers
+        busy = set(self.workers) | {worker.slot for worker in self.retiring}
+        slot = next(slot for slot in range(self.max_workers + len(self.retiring)) if slot not in busy)
+        worker = Worker(slot, self.metrics_port_base, self.node_concurrency, self.slot_dir)
+        self.workers[slot] = worker
+        supervisor_scale_events.labels(direction='up').inc()
+        print(f"Started worker {slot} (pid {worker.pid})")
+
+    def _report(self):
+        supervisor_workers.labels(state='running').set(len(self.workers))
+        supervisor_workers.labels(state='retiring').set(len(self.retiring))
+
+
+def main():
+    load_dotenv()
+    supervisor_metrics.start_http_server(int(os.getenv('SUPERVISOR_METRICS_PORT', 9099)))
+
+    queue_name = os.getenv('RABBITMQ_QUEUE', 'job_posts_queue')
+    source = os.getenv('SUPERVISOR_DEPTH_SOURCE', 'amqp').lower()
+    if source == 'management':
+        read_depth = ManagementQueueDepth(
+            queue_name,
+            os.getenv('RABBITMQ_MANAGEMENT_URL', 'http://localhost:15672'),
+            vhost=os.getenv('RABBITMQ_VHOST', '/')
+        )
+    else:
+        read_depth = AmqpQueueDepth(queue_name)
+
+    supervisor = ConsumerSupervisor(
+        read_depth,
+        min_workers=int(os.getenv('CONSUMER_MIN_WORKERS', 1)),
+        max_workers=int(os.getenv('CONSUMER_MAX_WORKERS', 4)),
+        messages_per_worker=int(os.getenv('SCALE_MESSAGES_PER_WORKER', 20)),
+        poll_interval=float(os.getenv('SUPERVISOR_POLL_INTERVAL', 10)),
+        scale_down_delay=float(os.getenv('SCALE_DOWN_DELAY', 120)),
+        drain_timeout=float(os.getenv('DRAIN_TIMEOUT', 300)),
+        metrics_port_base=int(os.getenv('METRICS_PORT', 9100)),
+        node_concurrency=int(os.getenv('OLLAMA_NODE_CONCURRENCY', 2)),
+    )
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    signal.signal(signal.SIGINT, supervisor.stop)
+
+    print(f"Supervising {supervisor.min_workers}-{supervisor.max_workers} consumers on {queue_name} ({source}), "
+          f"{supervisor.node_concurrency} requests per Ollama node in total")
+    supervisor.run()
+
+
+if __name__ == '__main__':
+    main()
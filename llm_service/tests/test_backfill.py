@@ -0,0 +1,12 @@
+from backfill import message_properties
+
+
+def test_message_properties_encode():
+    # pika encodes the properties on publish; a header it cannot encode
+    # (e.g. a float) makes every basic_publish raise
+    properties = message_properties(1_760_000_000_123)
+    properties.encode()
+
+    assert properties.headers == {'published_at_ms': 1_760_000_000_123}
+    assert properties.timestamp == 1_760_000_000
+    assert properties.delivery_mode == 2
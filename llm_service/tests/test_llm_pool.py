@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from llm_pool import OPEN, NoNodeAvailable, OllamaPool, SharedSlots
+
+
+def test_shared_slots_limit_across_pools(tmp_path):
+    # Two pools (as in two worker processes) on one node share its two slots
+    first = SharedSlots(str(tmp_path), 'http://gpu1:11434', 2)
+    second = SharedSlots(str(tmp_path), 'http://gpu1:11434', 2)
+
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    assert not second.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+
+
+def test_shared_slots_are_per_node(tmp_path):
+    gpu1 = SharedSlots(str(tmp_path), 'http://gpu1:11434', 1)
+    gpu2 = SharedSlots(str(tmp_path), 'http://gpu2:11434', 1)
+
+    assert gpu1.try_acquire()
+    assert gpu2.try_acquire()
+
+
+def test_pool_fails_fast_when_every_circuit_is_open():
+    pool = OllamaPool(['http://gpu1:11434', 'http://gpu2:11434'], health_interval=0, wait_timeout=300)
+    for node in pool.nodes:
+        node.state = OPEN
+        node.opened_at = time.monotonic()
+
+    started = time.monotonic()
+    with pytest.raises(NoNodeAvailable):
+        pool.chat(model='llama3.1:8b', messages=[])
+    assert time.monotonic() - started < 1
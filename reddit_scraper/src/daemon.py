@@ -0,0 +1,256 @@
+"""
+Long-running scraper with adaptive per-subreddit polling.
+
+Unlike the cron job (scraper.py), the daemon keeps one Reddit client, one
+database engine and one RabbitMQ connection for its whole life, and polls
+each subreddit on its own schedule. After every poll it estimates the
+subreddit's arrival rate of new posts and sets the next interval so that
+about SCRAPER_TARGET_NEW_POSTS new posts are waiting: busy subreddits are
+polled every few minutes, quiet ones down to every SCRAPER_MAX_INTERVAL
+seconds. A poll whose listing was entirely new may have missed posts, so it
+halves the interval instead.
+
+Usage:
+    SCRAPER_SUBREDDITS=forhire,jobbit,remotejs python src/daemon.py
+"""
+import heapq
+import os
+import signal
+import threading
+import time
+
+from dotenv import load_dotenv
+from jobposts.tracing import get_tracer, init_tracing, shutdown_tracing
+from db import get_db_engine
+from messaging.publisher import RabbitMQPublisher
+from reddit_api import RedditClient
+from monitoring import arrival_rate, last_success, metrics, poll_interval
+from scraper import load_reddit_client, publish_to_queue, save_to_database, scrape_job_posts
+
+tracer = get_tracer(__name__)
+
+# Weight of the latest poll in the arrival rate estimate
+RATE_SMOOTHING = 0.3
+
+# Seconds between servicing the idle RabbitMQ connection (heartbeats) while waiting
+CONNECTION_SERVICE_INTERVAL = 5.0
+
+# Seconds between attempts to publish IDs whose earlier publish failed
+PUBLISH_RETRY_INTERVAL = 30.0
+
+
+class SubredditSchedule:
+    """Polling state of one subreddit."""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.next_poll = time.monotonic()
+        self.last_poll = None
+        self.rate = None  # new posts per second
+
+    def __lt__(self, other):
+        return self.next_poll < other.next_poll
+
+    def update(self, new_posts: int, listing_full: bool, min_interval: float, max_interval: float,
+               target_new_posts: int):
+        """
+        Fold one poll's result into the rate estimate and pick the next interval.
+
+        Args:
+            new_posts: Posts from this poll that were not in the database yet
+            listing_full: Every post of a full listing was new, so some may be missing
+            min_interval: Lower bound in seconds
+            max_interval: Upper bound in seconds
+            target_new_posts: New posts a poll should find on average
+        """
+        now = time.monotonic()
+        if self.last_poll is not None:
+            observed = new_posts / max(now - self.last_poll, 1.0)
+            self.rate = observed if self.rate is None else (
+                RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.rate
+            )
+        self.last_poll = now
+
+        if listing_full:
+            interval = self.interval / 2
+        elif self.rate:
+            interval = target_new_posts / self.rate
+        else:
+            # Nothing new yet: back off gradually towards the maximum
+            interval = self.interval * 1.5
+        self.interval = max(min_interval, min(max_interval, interval))
+        self.next_poll = now + self.interval
+
+        poll_interval.labels(subreddit=self.name).set(self.interval)
+        arrival_rate.labels(subreddit=self.name).set((self.rate or 0.0) * 3600)
+
+
+class ScraperDaemon:
+    """
+    Polls subreddits on adaptive schedules over persistent connections.
+
+    Args:
+        subreddits: Subreddit names to poll
+        limit: Posts requested per listing
+        min_interval: Shortest interval between polls of one subreddit (seconds)
+        max_interval: Longest interval between polls of one subreddit (seconds)
+        initial_interval: Interval used until a rate has been observed
+        target_new_posts: New posts a poll should find on average
+    """
+
+    def __init__(self, subreddits, limit: int = 100, min_interval: float = 120.0,
+                 max_interval: float = 7200.0, initial_interval: float = 900.0,
+                 target_new_posts: int = 10):
+        self.limit = limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_posts = target_new_posts
+        self.schedule = [SubredditSchedule(name, initial_interval) for name in subreddits]
+        heapq.heapify(self.schedule)
+        self.stopping = threading.Event()
+        self.reddit = load_reddit_client()
+        self.engine = get_db_engine()
+        self.publisher = None
+        # Saved to the database but not yet confirmed by RabbitMQ
+        self.pending_ids = []
+
+    def stop(self, *args):
+        print("Stopping scraper daemon...")
+        self.stopping.set()
+
+    def run(self):
+        while not self.stopping.is_set():
+            entry = self.schedule[0]
+            delay = max(0.0, entry.next_poll - time.monotonic())
+            if self.pending_ids:
+                delay = min(delay, PUBLISH_RETRY_INTERVAL)
+            if self._sleep(delay):
+                break
+            self._flush_pending()
+            if entry.next_poll > time.monotonic():
+                continue
+            heapq.heappop(self.schedule)
+            try:
+                new_posts, listing_size = self.poll(entry.name)
+                entry.update(
+                    new_posts,
+                    listing_full=listing_size >= self.limit and new_posts >= listing_size,
+                    min_interval=self.min_interval,
+                    max_interval=self.max_interval,
+                    target_new_posts=self.target_new_posts,
+                )
+                last_success.set_to_current_time()
+                print(f"r/{entry.name}: {new_posts} new of {listing_size}, next poll in {entry.interval:.0f}s")
+            except Exception as e:
+                print(f"Error polling r/{entry.name}: {e}")
+                entry.next_poll = time.monotonic() + self.min_interval
+            heapq.heappush(self.schedule, entry)
+
+        self.close()
+
+    def poll(self, subreddit: str):
+        """Scrape one subreddit, save new posts and publish their IDs."""
+        with tracer.start_as_current_span('scraper.poll') as span:
+            span.set_attribute('subreddit', subreddit)
+            job_posts = scrape_job_posts([subreddit], limit=self.limit, reddit=self.reddit, sort='new')
+            if not job_posts:
+                return 0, 0
+
+            with tracer.start_as_current_span('save_to_database'):
+                inserted_ids = save_to_database(job_posts, engine=self.engine)
+            # Committed rows are duplicates to the next poll, so their IDs must
+            # not be lost if RabbitMQ is unavailable now
+            self.pending_ids.extend(inserted_ids)
+            self._flush_pending()
+            return len(inserted_ids), len(job_posts)
+
+    def _flush_pending(self):
+        """
+        Publish every pending ID over the persistent connection, reconnecting
+        once if it dropped. IDs stay pending until the broker confirms them;
+        after a partial failure some may be delivered twice, which the
+        consumer skips as already processed.
+        """
+        if not self.pending_ids:
+            return
+        for attempt in range(2):
+            try:
+                if self.publisher is None:
+                    self.publisher = RabbitMQPublisher()
+                    self.publisher.connect()
+                publish_to_queue(self.pending_ids, publisher=self.publisher)
+                self.pending_ids = []
+                return
+            except Exception as e:
+                print(f"Publish failed ({e}), reconnecting to RabbitMQ")
+                self._close_publisher()
+        print(f"{len(self.pending_ids)} job IDs not published, retrying in {PUBLISH_RETRY_INTERVAL:.0f}s")
+
+    def _sleep(self, seconds: float) -> bool:
+        """
+        Wait, servicing the RabbitMQ connection so its heartbeats keep it open.
+
+        Returns:
+            True if the daemon is stopping
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            if self.publisher is not None:
+                try:
+                    self.publisher.connection.process_data_events(time_limit=0)
+                except Exception as e:
+                    print(f"RabbitMQ connection lost while idle ({e})")
+                    self._close_publisher()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self.stopping.is_set()
+            # Interruptible so SIGTERM does not wait for the next poll
+            if self.stopping.wait(min(remaining, CONNECTION_SERVICE_INTERVAL)):
+                return True
+
+    def _close_publisher(self):
+        if self.publisher is not None:
+            try:
+                self.publisher.close()
+            except Exception:
+                pass
+            self.publisher = None
+
+    def close(self):
+        self._flush_pending()
+        if self.pending_ids:
+            print(f"Exiting with {len(self.pending_ids)} unpublished job IDs: {self.pending_ids}")
+        self._close_publisher()
+        if isinstance(self.reddit, RedditClient):
+            self.reddit.close()
+        self.engine.dispose()
+        print("Scraper daemon stopped")
+
+
+def main():
+    load_dotenv()
+    init_tracing('reddit_scraper')
+    metrics.start_http_server(int(os.getenv('METRICS_PORT', 9101)))
+
+    subreddits = [name.strip() for name in os.getenv('SCRAPER_SUBREDDITS', 'forhire').split(',') if name.strip()]
+    daemon = ScraperDaemon(
+        subreddits,
+        limit=int(os.getenv('SCRAPER_LIMIT', 100)),
+        min_interval=float(os.getenv('SCRAPER_MIN_INTERVAL', 120)),
+        max_interval=float(os.getenv('SCRAPER_MAX_INTERVAL', 7200)),
+        initial_interval=float(os.getenv('SCRAPER_INITIAL_INTERVAL', 900)),
+        target_new_posts=int(os.getenv('SCRAPER_TARGET_NEW_POSTS', 10)),
+    )
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+
+    print(f"Scraper daemon polling {', '.join('r/' + name for name in subreddits)}")
+    try:
+        daemon.run()
+    finally:
+        shutdown_tracing()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,10 @@
-from .models import RawJobPost, get_db_session, init_database
+from .models import (
+    RawJobPost,
+    DataVersion,
+    bump_data_version,
+    get_db_engine,
+    get_db_session,
+    insert_listing_stub,
+)
 
-__all__ = ['RawJobPost', 'get_db_session', 'init_database']
+__all__ = ['RawJobPost', 'DataVersion', 'bump_data_version', 'get_db_engine', 'get_db_session', 'insert_listing_stub']
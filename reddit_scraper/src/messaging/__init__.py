@@ -1,3 +1,3 @@
-from .publisher import RabbitMQPublisher
+from .publisher import RabbitMQPublisher, message_properties
 
-__all__ = ['RabbitMQPublisher']
+__all__ = ['RabbitMQPublisher', 'message_properties']
@@ -1,7 +1,32 @@
 import pika
 import json
 import os
-from typing import List
+import time
+from typing import Dict, List, Optional
+from jobposts.tracing import get_tracer, inject_headers
+from monitoring import messages_published, publish_duration
+
+tracer = get_tracer(__name__)
+
+
+def message_properties(published_at_ms: int, headers: Optional[Dict] = None) -> pika.BasicProperties:
+    """
+    Properties of a persistent job id message.
+
+    AMQP header tables cannot carry floats (pika raises
+    UnsupportedAMQPFieldException), so the sub-second publish time the
+    consumer uses for queue lag is sent as integer epoch milliseconds in
+    the published_at_ms header.
+
+    Args:
+        published_at_ms: Publish time in milliseconds since the epoch
+        headers: Extra headers, e.g. the trace context
+    """
+    return pika.BasicProperties(
+        delivery_mode=2,  # Make message persistent
+        timestamp=published_at_ms // 1000,
+        headers={**(headers or {}), 'published_at_ms': published_at_ms}
+    )
 
 
 class RabbitMQPublisher:
@@ -30,6 +55,8 @@ class RabbitMQPublisher:
 
         # Declare queue (idempotent operation)
         self.channel.queue_declare(queue=self.queue_name, durable=True)
+        # basic_publish waits for the broker's ack and raises if it is not stored
+        self.channel.confirm_delivery()
         print(f"Connected to RabbitMQ at {self.host}:{self.port}")
 
     def publish_job_ids(self, job_ids: List[int]):
@@ -42,17 +69,24 @@ class RabbitMQPublisher:
         if not self.channel:
             self.connect()
 
-        for job_id in job_ids:
-            message = json.dumps({'job_id': job_id})
-            self.channel.basic_publish(
-                exchange='',
-                routing_key=self.queue_name,
-                body=message,
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Make message persistent
-                )
-            )
-            print(f"Published job_id {job_id} to queue")
+        with tracer.start_as_current_span('publish_job_ids') as batch_span:
+            batch_span.set_attribute('count', len(job_ids))
+            for job_id in job_ids:
+                # One span per post; its context travels in the message headers
+                # so the consumer's spans join the same trace
+                with tracer.start_as_current_span('publish_job_id') as span:
+                    span.set_attribute('job_id', job_id)
+                    message = json.dumps({'job_id': job_id})
+                    properties = message_properties(int(time.time() * 1000), inject_headers())
+                    with publish_duration.time():
+                        self.channel.basic_publish(
+                            exchange='',
+                            routing_key=self.queue_name,
+                            body=message,
+                            properties=properties
+                        )
+                messages_published.inc()
+                print(f"Published job_id {job_id} to queue")
 
     def close(self):
         """Close connection to RabbitMQ."""
@@ -0,0 +1,29 @@
+from .metrics import (
+    metrics,
+    posts_scraped,
+    posts_inserted,
+    posts_duplicate,
+    messages_published,
+    publish_duration,
+    scrape_duration,
+    db_query_duration,
+    poll_interval,
+    arrival_rate,
+    last_success,
+    push_metrics,
+)
+
+__all__ = [
+    'metrics',
+    'posts_scraped',
+    'posts_inserted',
+    'posts_duplicate',
+    'messages_published',
+    'publish_duration',
+    'scrape_duration',
+    'db_query_duration',
+    'poll_interval',
+    'arrival_rate',
+    'last_success',
+    'push_metrics',
+]
@@ -0,0 +1,56 @@
+"""
+Prometheus metrics for the scraper.
+
+The cron scraper exits after each run, so instead of being scraped it pushes
+its metrics to a Pushgateway (PUSHGATEWAY_URL) at the end of every run. The
+daemon (daemon.py) is long-running and serves them on METRICS_PORT instead.
+Set METRICS_ENABLED=false to turn every metric into a no-op.
+"""
+import os
+
+from jobposts.metrics import MetricSet, metrics_enabled_from_env
+
+metrics = MetricSet('scraper', enabled=metrics_enabled_from_env())
+
+posts_scraped = metrics.counter(
+    'posts_scraped_total', 'Posts returned by Reddit', ['subreddit']
+)
+posts_inserted = metrics.counter(
+    'posts_inserted_total', 'New posts saved to the database', ['subreddit']
+)
+posts_duplicate = metrics.counter(
+    'posts_duplicate_total', 'Scraped posts already in the database', ['subreddit']
+)
+messages_published = metrics.counter(
+    'messages_published_total', 'Job IDs published to RabbitMQ'
+)
+publish_duration = metrics.histogram(
+    'publish_duration_seconds', 'Time to publish one job ID to RabbitMQ'
+)
+scrape_duration = metrics.histogram(
+    'scrape_duration_seconds', 'Time to fetch one subreddit listing from Reddit', ['subreddit'],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+db_query_duration = metrics.histogram(
+    'db_query_duration_seconds', 'Database round-trip time per statement', ['statement']
+)
+poll_interval = metrics.gauge(
+    'poll_interval_seconds', 'Current daemon polling interval', ['subreddit']
+)
+arrival_rate = metrics.gauge(
+    'arrival_rate_posts_per_hour', 'Estimated rate of new [Hiring] posts', ['subreddit']
+)
+last_success = metrics.gauge(
+    'last_success_timestamp_seconds', 'Unix time of the last successful scraper run'
+)
+
+
+def push_metrics():
+    """Push this run's metrics to the Pushgateway, if one is configured."""
+    gateway = os.getenv('PUSHGATEWAY_URL')
+    if not gateway:
+        return
+    try:
+        metrics.push(gateway, job=os.getenv('PUSHGATEWAY_JOB', 'reddit_scraper'))
+    except Exception as e:
+        print(f"Error pushing metrics to {gateway}: {e}")
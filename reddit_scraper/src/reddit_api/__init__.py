@@ -0,0 +1,4 @@
+from .client import RedditAPIError, RedditClient
+from .records import JobPostRecord, parse_listing
+
+__all__ = ['RedditAPIError', 'RedditClient', 'JobPostRecord', 'parse_listing']
@@ -0,0 +1,183 @@
+"""
+Minimal Reddit API client for the listing endpoints the scraper uses.
+
+An alternative to PRAW for the hot path: one pooled HTTP/2 connection to
+oauth.reddit.com, an application-only OAuth token that is cached in memory
+and, optionally, on disk (REDDIT_TOKEN_CACHE) so cron runs reuse it for its
+whole lifetime, and listings decoded directly into JobPostRecord objects.
+Reddit's X-Ratelimit-* headers are honoured by sleeping until the window
+resets when it is used up.
+"""
+import json
+import os
+import time
+from typing import List, Optional
+
+import httpx
+
+from .records import JobPostRecord, parse_listing
+
+# Refresh tokens this long before Reddit says they expire
+TOKEN_EXPIRY_MARGIN = 60
+
+
+class RedditAPIError(Exception):
+    """Reddit returned an error response."""
+
+
+class RedditClient:
+    """
+    Application-only (client credentials) Reddit API client.
+
+    Args:
+        client_id: Reddit app client ID
+        client_secret: Reddit app secret
+        user_agent: Descriptive User-Agent, required by Reddit's API rules
+        auth_url: Base URL of the token endpoint
+        api_url: Base URL of the OAuth API
+        token_cache: File to persist the access token in (optional)
+        timeout: Request timeout in seconds
+    """
+
+    def __init__(self, client_id: str, client_secret: str, user_agent: str,
+                 auth_url: str = 'https://www.reddit.com', api_url: str = 'https://oauth.reddit.com',
+                 token_cache: Optional[str] = None, timeout: float = 30.0):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.auth_url = auth_url.rstrip('/')
+        self.api_url = api_url.rstrip('/')
+        self.token_cache = token_cache
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._session = httpx.Client(
+            http2=True,
+            timeout=timeout,
+            headers={'User-Agent': user_agent},
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300),
+        )
+
+    @classmethod
+    def from_env(cls) -> 'RedditClient':
+        """Client configured from REDDIT_* environment variables."""
+        return cls(
+            client_id=os.getenv('REDDIT_CLIENT_ID'),
+            client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
+            user_agent=os.getenv('REDDIT_USER_AGENT'),
+            auth_url=os.getenv('REDDIT_AUTH_URL', 'https://www.reddit.com'),
+            api_url=os.getenv('REDDIT_API_URL', 'https://oauth.reddit.com'),
+            token_cache=os.getenv('REDDIT_TOKEN_CACHE'),
+        )
+
+    def search_posts(self, subreddit: str, query: str, sort: str = 'relevance',
+                     limit: int = 100) -> List[JobPostRecord]:
+        """
+        Search one subreddit, following pagination up to `limit` posts.
+
+        Args:
+            subreddit: Subreddit name
+            query: Search query, e.g. '[Hiring]'
+            sort: relevance, new, hot, top or comments
+            limit: Maximum number of posts to return
+
+        Returns:
+            List of JobPostRecord
+        """
+        records: List[JobPostRecord] = []
+        after = None
+        while len(records) < limit:
+            params = {
+                'q': query,
+                'restrict_sr': 'on',
+                'sort': sort,
+                'limit': min(100, limit - len(records)),
+                'raw_json': 1,
+            }
+            if after:
+                params['after'] = after
+            response = self._get(f'/r/{subreddit}/search', params)
+            page, after = parse_listing(response.content, subreddit)
+            records.extend(page)
+            if not after or not page:
+                break
+        return records[:limit]
+
+    def close(self):
+        self._session.close()
+
+    def _get(self, path: str, params: dict) -> httpx.Response:
+        for attempt in range(2):
+            response = self._session.get(
+                self.api_url + path,
+                params=params,
+                headers={'Authorization': f'bearer {self._access_token()}'},
+            )
+            if response.status_code == 401 and attempt == 0:
+                # Revoked or expired early; fetch a new token once
+                self._token = None
+                self._token_expires_at = 0.0
+                continue
+            break
+
+        self._respect_rate_limit(response)
+        if response.status_code != 200:
+            raise RedditAPIError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def _respect_rate_limit(self, response: httpx.Response):
+        remaining = response.headers.get('x-ratelimit-remaining')
+        reset = response.headers.get('x-ratelimit-reset')
+        if remaining is not None and reset is not None and float(remaining) < 1:
+            print(f"Reddit rate limit reached, sleeping {reset}s")
+            time.sleep(float(reset))
+
+    def _access_token(self) -> str:
+        if self._token and time.time() < self._token_expires_at:
+            return self._token
+        if self._load_cached_token():
+            return self._token
+
+        response = self._session.post(
+            self.auth_url + '/api/v1/access_token',
+            data={'grant_type': 'client_credentials'},
+            auth=(self.client_id or '', self.client_secret or ''),
+        )
+        if response.status_code != 200:
+            raise RedditAPIError(f"Token request returned {response.status_code}: {response.text[:200]}")
+        payload = response.json()
+        if 'access_token' not in payload:
+            raise RedditAPIError(f"Token request failed: {payload}")
+        self._token = payload['access_token']
+        self._token_expires_at = time.time() + float(payload.get('expires_in', 3600)) - TOKEN_EXPIRY_MARGIN
+        self._save_cached_token()
+        return self._token
+
+    def _load_cached_token(self) -> bool:
+        if not self.token_cache:
+            return False
+        try:
+            with open(self.token_cache) as cache:
+                cached = json.load(cache)
+        except (OSError, ValueError):
+            return False
+        if cached.get('client_id') != self.client_id or cached.get('expires_at', 0) <= time.time():
+            return False
+        self._token = cached['access_token']
+        self._token_expires_at = cached['expires_at']
+        return True
+
+    def _save_cached_token(self):
+        if not self.token_cache:
+            return
+        tmp_path = self.token_cache + '.tmp'
+        try:
+            # Owner-only: the file holds a bearer token
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as cache:
+                json.dump({
+                    'client_id': self.client_id,
+                    'access_token': self._token,
+                    'expires_at': self._token_expires_at,
+                }, cache)
+            os.replace(tmp_path, self.token_cache)
+        except OSError as e:
+            print(f"Could not cache Reddit token in {self.token_cache}: {e}")
@@ -0,0 +1,73 @@
+"""
+Compact job post records decoded straight from Reddit listing JSON.
+
+Only the fields the scraper stores are read; everything else in the listing
+(about a hundred keys per submission) is skipped without building objects.
+"""
+from datetime import datetime
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional, the stdlib parser is a slower fallback
+    import json as _json
+
+RECORD_FIELDS = ('id', 'title', 'body', 'author', 'created_utc', 'score', 'url', 'subreddit')
+
+
+class JobPostRecord:
+    """
+    One submission as saved by save_to_database.
+
+    Supports post['field'] as well as attribute access, so it can be used
+    wherever the scraper's post dicts are.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, id, title, body, author, created_utc, score, url, subreddit):
+        self.id = id
+        self.title = title
+        self.body = body
+        self.author = author
+        self.created_utc = created_utc
+        self.score = score
+        self.url = url
+        self.subreddit = subreddit
+
+    def __getitem__(self, field):
+        return getattr(self, field)
+
+    def __repr__(self):
+        return f"JobPostRecord(id={self.id!r}, subreddit={self.subreddit!r}, title={self.title!r})"
+
+
+def parse_listing(payload, subreddit: str):
+    """
+    Decode a search/listing response into records.
+
+    Args:
+        payload: Raw response body (bytes or str) or the already decoded dict
+        subreddit: Name stored on every record, as requested by the scraper
+
+    Returns:
+        (records, after) where after is the cursor of the next page or None
+    """
+    listing = _json.loads(payload) if isinstance(payload, (bytes, str)) else payload
+    data = listing['data']
+    records = []
+    for child in data['children']:
+        if child.get('kind') != 't3':
+            continue
+        post = child['data']
+        records.append(JobPostRecord(
+            post['id'],
+            post['title'],
+            post.get('selftext') or '',
+            # PRAW's str(post.author) is 'None' for deleted accounts
+            post.get('author') or 'None',
+            datetime.fromtimestamp(post['created_utc']),
+            post.get('score', 0),
+            post.get('url'),
+            subreddit,
+        ))
+    return records, data.get('after')
@@ -1,21 +1,43 @@
 import os
+import time
 import praw
 from dotenv import load_dotenv
 from datetime import datetime
-from db.models import RawJobPost, get_db_session, init_database
+from jobposts.retention import retention_cutoff
+from jobposts.tracing import get_tracer, init_tracing, shutdown_tracing
+from db.models import RawJobPost, bump_data_version, get_db_session, insert_listing_stub
 from messaging.publisher import RabbitMQPublisher
+from reddit_api import RedditClient
+from monitoring import (
+    last_success,
+    posts_duplicate,
+    posts_inserted,
+    posts_scraped,
+    push_metrics,
+    scrape_duration,
+)
+
+tracer = get_tracer(__name__)
 
 def load_reddit_client():
-    """Initialize and return Reddit API client."""
+    """
+    Initialize and return Reddit API client.
+
+    SCRAPER_BACKEND selects PRAW ('praw', default) or the lightweight
+    listing client ('http', see reddit_api).
+    """
     load_dotenv()
-    
+
+    if os.getenv('SCRAPER_BACKEND', 'praw').lower() == 'http':
+        return RedditClient.from_env()
+
     return praw.Reddit(
         client_id=os.getenv('REDDIT_CLIENT_ID'),
         client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
         user_agent=os.getenv('REDDIT_USER_AGENT')
     )
 
-def scrape_job_posts(subreddits=['forhire'], limit=100):
+def scrape_job_posts(subreddits=['forhire'], limit=100, reddit=None, sort='new'):
     """
     ['forhire', 'jobbit', 'remotejs', 'remotepython']
     Scrape job posts from specified subreddits.
@@ -23,54 +45,87 @@ def scrape_job_posts(subreddits=['forhire'], limit=100):
     Args:
         subreddits (list): List of subreddit names to scrape
         limit (int): Maximum number of posts to scrape per subreddit
+        reddit: Reddit client to reuse (default: a new one)
+        sort (str): Search sort order. 'new' (default) returns the latest posts;
+            'relevance' reaches back into months that may already be archived
     
     Returns:
         list: List of dictionaries containing post data
     """
-    reddit = load_reddit_client()
+    reddit = reddit or load_reddit_client()
     job_posts = []
     
     for subreddit_name in subreddits:
-        subreddit = reddit.subreddit(subreddit_name)
-        
-        # Search for posts with [Hiring] tag
-        for post in subreddit.search('[Hiring]', limit=limit):
-            post_data = {
-                'title': post.title,
-                'body': post.selftext,
-                'author': str(post.author),
-                'created_utc': datetime.fromtimestamp(post.created_utc),
-                'score': post.score,
-                'url': post.url,
-                'subreddit': subreddit_name,
-                'id': post.id
-            }
-            job_posts.append(post_data)
-    
+        with tracer.start_as_current_span('scrape_subreddit') as span:
+            started = time.perf_counter()
+            scraped_before = len(job_posts)
+
+            if isinstance(reddit, RedditClient):
+                # Records already carry exactly the fields saved below
+                job_posts.extend(reddit.search_posts(subreddit_name, '[Hiring]', sort=sort, limit=limit))
+            else:
+                subreddit = reddit.subreddit(subreddit_name)
+
+                # Search for posts with [Hiring] tag
+                for post in subreddit.search('[Hiring]', sort=sort, limit=limit):
+                    post_data = {
+                        'title': post.title,
+                        'body': post.selftext,
+                        'author': str(post.author),
+                        'created_utc': datetime.fromtimestamp(post.created_utc),
+                        'score': post.score,
+                        'url': post.url,
+                        'subreddit': subreddit_name,
+                        'id': post.id
+                    }
+                    job_posts.append(post_data)
+
+            scraped = len(job_posts) - scraped_before
+            scrape_duration.labels(subreddit=subreddit_name).observe(time.perf_counter() - started)
+            posts_scraped.labels(subreddit=subreddit_name).inc(scraped)
+            span.set_attributes({'subreddit': subreddit_name, 'posts': scraped})
+
     return job_posts
 
-def save_to_database(job_posts):
+def save_to_database(job_posts, engine=None):
     """
     Save scraped job posts to PostgreSQL database.
 
+    Posts older than the retention window (RETENTION_KEEP_MONTHS) are
+    skipped: their month has been archived and dropped, so saving them
+    would recreate it.
+
     Args:
         job_posts (list): List of dictionaries containing post data
+        engine: Database engine to reuse (default: a new one)
 
     Returns:
         list: List of database row IDs for successfully inserted posts
     """
-    session = get_db_session()
+    cutoff = retention_cutoff(int(os.getenv('RETENTION_KEEP_MONTHS', 6)))
+    recent_posts = [post_data for post_data in job_posts if post_data['created_utc'] >= cutoff]
+    if len(recent_posts) < len(job_posts):
+        print(f"Skipping {len(job_posts) - len(recent_posts)} posts created before {cutoff:%Y-%m}")
+
+    session = get_db_session(engine)
     inserted_ids = []
 
     try:
-        for post_data in job_posts:
-            # Check if post already exists
-            existing_post = session.query(RawJobPost).filter_by(
-                reddit_id=post_data['id']
-            ).first()
+        existing_ids = set()
+        if recent_posts:
+            # created_utc is the partition key, so the lower bound keeps the
+            # lookup to the months this batch covers
+            existing_ids = {
+                reddit_id for (reddit_id,) in session.query(RawJobPost.reddit_id).filter(
+                    RawJobPost.reddit_id.in_([post_data['id'] for post_data in recent_posts]),
+                    RawJobPost.created_utc >= min(post_data['created_utc'] for post_data in recent_posts)
+                )
+            }
 
-            if existing_post:
+        for post_data in recent_posts:
+            if post_data['id'] in existing_ids:
                 print(f"Post {post_data['id']} already exists, skipping...")
+                posts_duplicate.labels(subreddit=post_data['subreddit']).inc()
                 continue
 
             # Create new job post record
@@ -87,9 +142,16 @@ def save_to_database(job_posts):
 
             session.add(job_post)
             session.flush()  # Get the ID without committing
+            insert_listing_stub(session, job_post)
+            existing_ids.add(post_data['id'])
             inserted_ids.append(job_post.id)
+            posts_inserted.labels(subreddit=post_data['subreddit']).inc()
             print(f"Inserted post {post_data['id']} with DB ID {job_post.id}")
 
+        # Invalidate cached API responses
+        if inserted_ids:
+            bump_data_version(session)
+
         session.commit()
         print(f"Successfully saved {len(inserted_ids)} new posts to database")
 
@@ -103,17 +165,23 @@ def save_to_database(job_posts):
     return inserted_ids
 
 
-def publish_to_queue(job_ids):
+def publish_to_queue(job_ids, publisher=None):
     """
     Publish job post IDs to RabbitMQ for processing by LLM service.
 
     Args:
         job_ids (list): List of database row IDs
+        publisher: Connected RabbitMQPublisher to reuse; it is left open
     """
     if not job_ids:
         print("No new job IDs to publish")
         return
 
+    if publisher is not None:
+        publisher.publish_job_ids(job_ids)
+        print(f"Published {len(job_ids)} job IDs to queue")
+        return
+
     publisher = RabbitMQPublisher()
     try:
         publisher.connect()
@@ -129,11 +197,20 @@ def publish_to_queue(job_ids):
 def main():
     # Load environment variables
     load_dotenv()
+    init_tracing('reddit_scraper')
+
+    try:
+        with tracer.start_as_current_span('scraper.run'):
+            run()
+        last_success.set_to_current_time()
+    finally:
+        # The process exits after each run, so push instead of being scraped
+        push_metrics()
+        shutdown_tracing()
 
-    # Initialize database tables
-    print("Initializing database...")
-    init_database()
 
+def run():
+    """Scrape, save and publish new job posts once."""
     # Scrape job posts
     print("Scraping job posts...")
     job_posts = scrape_job_posts()
@@ -145,7 +222,9 @@ def main():
 
     # Save to database
     print("Saving to database...")
-    inserted_ids = save_to_database(job_posts)
+    with tracer.start_as_current_span('save_to_database') as span:
+        inserted_ids = save_to_database(job_posts)
+        span.set_attributes({'posts': len(job_posts), 'inserted': len(inserted_ids)})
 
     # Publish to RabbitMQ queue
     if inserted_ids:
@@ -0,0 +1,13 @@
+from .models import Base, NOTIFY_CHANNEL, RawJobPost, JobListing, JobTag, DataVersion, bump_data_version
+from .database import get_database_url
+
+__all__ = [
+    'Base',
+    'NOTIFY_CHANNEL',
+    'RawJobPost',
+    'JobListing',
+    'JobTag',
+    'DataVersion',
+    'bump_data_version',
+    'get_database_url',
+]
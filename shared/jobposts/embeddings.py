@@ -0,0 +1,69 @@
+"""
+Post embeddings for semantic search, stored in pgvector.
+
+Kept out of jobposts.models so that services which never touch embeddings
+(the scraper) do not need the pgvector package. Rows are written one at a
+time as posts are processed; the HNSW index on job_embeddings is maintained
+incrementally by Postgres and never rebuilt.
+"""
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import insert
+
+from .models import Base
+
+# Must match the vector(N) column created by migration 0005
+EMBEDDING_DIMENSIONS = 768
+DEFAULT_EMBEDDING_MODEL = 'nomic-embed-text'
+
+
+def get_embedding_model() -> str:
+    """Embedding model name from EMBEDDING_MODEL."""
+    return os.getenv('EMBEDDING_MODEL', DEFAULT_EMBEDDING_MODEL)
+
+
+class JobEmbedding(Base):
+    """Embedding of a listing's cleaned title, tags and text."""
+    __tablename__ = 'job_embeddings'
+
+    id = Column(Integer, ForeignKey('job_listing.id', ondelete='CASCADE'), primary_key=True)
+    model = Column(String(100), nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    embedded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<JobEmbedding(id={self.id}, model={self.model!r})>"
+
+
+def embedding_text(cleaned_title: Optional[str], cleaned_text: Optional[str], tags: Optional[list]) -> str:
+    """Text a post is embedded from: title, then tags, then the cleaned summary."""
+    parts = [cleaned_title or '']
+    if isinstance(tags, list) and tags:
+        parts.append(', '.join(str(tag) for tag in tags))
+    parts.append(cleaned_text or '')
+    return '\n'.join(part for part in parts if part)
+
+
+def upsert_embedding(session, job_id: int, model: str, embedding: List[float]):
+    """
+    Store a post's embedding, replacing any previous one.
+
+    Args:
+        session: Active SQLAlchemy session
+        job_id: Listing id
+        model: Embedding model name
+        embedding: Vector of EMBEDDING_DIMENSIONS floats
+    """
+    if len(embedding) != EMBEDDING_DIMENSIONS:
+        raise ValueError(
+            f"Embedding has {len(embedding)} dimensions, expected {EMBEDDING_DIMENSIONS} "
+            f"(model {model})"
+        )
+    values = {'model': model, 'embedding': embedding, 'embedded_at': datetime.utcnow()}
+    stmt = insert(JobEmbedding).values(id=job_id, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=[JobEmbedding.id], set_=values)
+    session.execute(stmt)
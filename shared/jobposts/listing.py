@@ -0,0 +1,77 @@
+"""
+Write helpers for the job_listing read model.
+
+Both helpers run inside the caller's transaction so the listing row changes
+atomically with the raw_job_posts row it mirrors.
+"""
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from .models import JobListing, JobTag, RawJobPost
+
+
+def resolve_tag_ids(session, names: List[str]) -> List[int]:
+    """
+    Map tag names to ids, creating missing tags.
+
+    Args:
+        session: Active SQLAlchemy session
+        names: Tag names
+
+    Returns:
+        Sorted list of tag ids
+    """
+    names = sorted({name for name in names if isinstance(name, str) and name})
+    if not names:
+        return []
+
+    session.execute(
+        insert(JobTag).values([{'name': name} for name in names]).on_conflict_do_nothing(
+            index_elements=[JobTag.name]
+        )
+    )
+    return sorted(session.execute(select(JobTag.id).where(JobTag.name.in_(names))).scalars())
+
+
+def insert_listing_stub(session, post: RawJobPost):
+    """
+    Create the listing row for a newly scraped, not yet processed post.
+
+    Args:
+        session: Active SQLAlchemy session
+        post: Flushed RawJobPost (its id must be assigned)
+    """
+    stmt = insert(JobListing).values(
+        id=post.id,
+        created_utc=post.created_utc,
+        url=post.url,
+        score=post.score or 0,
+        tag_ids=[]
+    ).on_conflict_do_nothing(index_elements=[JobListing.id])
+    session.execute(stmt)
+
+
+def upsert_listing(session, post: RawJobPost):
+    """
+    Write a processed post's cleaned fields to its listing row.
+
+    Args:
+        session: Active SQLAlchemy session
+        post: RawJobPost with cleaned_title, cleaned_text, tags and processed_at set
+    """
+    tags = post.tags if isinstance(post.tags, list) else []
+    values = {
+        'cleaned_title': post.cleaned_title,
+        'cleaned_text': post.cleaned_text,
+        'tags': post.tags,
+        'created_utc': post.created_utc,
+        'url': post.url,
+        'processed_at': post.processed_at,
+        'score': post.score or 0,
+        'tag_ids': resolve_tag_ids(session, tags),
+    }
+    stmt = insert(JobListing).values(id=post.id, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=[JobListing.id], set_=values)
+    session.execute(stmt)
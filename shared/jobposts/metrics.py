@@ -0,0 +1,151 @@
+"""
+Prometheus metrics shared by the scraper, the LLM consumer and the API.
+
+Each service builds a MetricSet and declares its metrics on it. When metrics
+are disabled (or prometheus_client is not installed) every metric is a no-op
+object, so instrumented code pays one attribute lookup and an empty call.
+"""
+import os
+import time
+from typing import Sequence
+
+from sqlalchemy import event
+
+try:
+    import prometheus_client
+except ImportError:  # prometheus_client is optional, metrics are disabled without it
+    prometheus_client = None
+
+# Seconds; covers sub-millisecond DB calls up to multi-second HTTP requests
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statement label values for DB round-trip histograms; anything else is 'other'
+STATEMENT_KINDS = {'select', 'insert', 'update', 'delete'}
+
+
+def metrics_enabled_from_env() -> bool:
+    """Whether METRICS_ENABLED is set to a true value (default true)."""
+    return os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NoopMetric:
+    """Stand-in for every metric type when metrics are disabled."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def set_to_current_time(self):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+    def time(self):
+        return _NoopTimer()
+
+
+_NOOP = NoopMetric()
+
+
+class MetricSet:
+    """
+    Factory for a service's metrics.
+
+    Args:
+        namespace: Prefix for every metric name, e.g. 'scraper'
+        enabled: Create real Prometheus metrics; otherwise no-ops
+    """
+
+    def __init__(self, namespace: str, enabled: bool = True):
+        if enabled and prometheus_client is None:
+            print("prometheus_client is not installed, metrics are disabled")
+            enabled = False
+        self.namespace = namespace
+        self.enabled = enabled
+        self.registry = prometheus_client.CollectorRegistry() if enabled else None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not self.enabled:
+            return _NOOP
+        return prometheus_client.Counter(
+            name, documentation, labelnames, namespace=self.namespace, registry=self.registry
+        )
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        if not self.enabled:
+            return _NOOP
+        return prometheus_client.Gauge(
+            name, documentation, labelnames, namespace=self.namespace, registry=self.registry
+        )
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS):
+        if not self.enabled:
+            return _NOOP
+        return prometheus_client.Histogram(
+            name, documentation, labelnames, namespace=self.namespace, registry=self.registry,
+            buckets=buckets
+        )
+
+    def generate_latest(self) -> bytes:
+        """Exposition-format snapshot of every metric in this set."""
+        if not self.enabled:
+            return b''
+        return prometheus_client.generate_latest(self.registry)
+
+    def start_http_server(self, port: int):
+        """Serve /metrics on the given port from a background thread."""
+        if self.enabled:
+            prometheus_client.start_http_server(port, registry=self.registry)
+            print(f"Serving metrics on port {port}")
+
+    def push(self, gateway: str, job: str):
+        """Push every metric to a Pushgateway, replacing the job's previous push."""
+        if self.enabled and gateway:
+            prometheus_client.push_to_gateway(gateway, job=job, registry=self.registry)
+
+
+def observe_queries(engine, histogram):
+    """
+    Record every statement's round-trip time on a histogram labelled by
+    statement type (select, insert, update, ...). Does nothing when the
+    histogram is a no-op, so disabled metrics add no engine listeners.
+
+    Args:
+        engine: SQLAlchemy engine
+        histogram: Histogram with a single 'statement' label
+    """
+    if isinstance(histogram, NoopMetric):
+        return
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_start'] = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_start', None)
+        if started is None:
+            return
+        kind = statement.lstrip()[:6].lower()
+        histogram.labels(statement=kind if kind in STATEMENT_KINDS else 'other').observe(
+            time.perf_counter() - started
+        )
+
+    event.listen(engine, 'before_cursor_execute', before)
+    event.listen(engine, 'after_cursor_execute', after)
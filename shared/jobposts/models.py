@@ -0,0 +1,159 @@
+"""
+SQLAlchemy models shared by the scraper, the LLM service and the API.
+
+The schema itself is owned by the Alembic migrations in shared/migrations;
+keep these models in sync with the latest revision.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Text, Index, Sequence, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+# Channel the LLM service NOTIFYs (payload: post id) when a post is processed
+NOTIFY_CHANNEL = 'job_posts_processed'
+
+
+class RawJobPost(Base):
+    """
+    Table to store raw job post data from Reddit and cleaned data from LLM service.
+
+    Raw columns are filled by the scraper.
+    Cleaned columns (nullable) are filled by the LLM microservice.
+
+    The table is range-partitioned by month on created_utc (see
+    jobposts.partitions), so the partition key is part of the primary key
+    and of the reddit_id unique constraint.
+    """
+    __tablename__ = 'raw_job_posts'
+
+    # Primary key (id, created_utc)
+    id = Column(Integer, Sequence('raw_job_posts_id_seq'), primary_key=True)
+
+    # Raw data from Reddit (filled by scraper)
+    reddit_id = Column(String(50), nullable=False)
+    title = Column(Text, nullable=False)
+    body = Column(Text)
+    author = Column(String(100))
+    created_utc = Column(DateTime, primary_key=True, nullable=False)
+    score = Column(Integer)
+    url = Column(Text)
+    subreddit = Column(String(100))
+
+    # Metadata
+    scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Cleaned data (filled by LLM service, nullable initially)
+    cleaned_title = Column(Text, nullable=True)
+    cleaned_text = Column(Text, nullable=True)
+    tags = Column(JSONB, nullable=True)  # Store as JSON array
+    processed_at = Column(DateTime, nullable=True)
+    # Ollama model and prompt template version that produced the cleaned data
+    analysis_model = Column(String(100), nullable=True)
+    prompt_version = Column(String(20), nullable=True)
+
+    __table_args__ = (
+        # A Reddit post's created_utc never changes, so this is unique per post
+        UniqueConstraint('reddit_id', 'created_utc', name='uq_raw_job_posts_reddit_id'),
+        # Sort keys for the API listing, with id as a stable tie-breaker
+        Index('ix_raw_job_posts_created_utc_id', 'created_utc', 'id'),
+        Index('ix_raw_job_posts_score_id', 'score', 'id'),
+        Index(
+            'ix_raw_job_posts_processed_at',
+            'processed_at',
+            postgresql_where=processed_at.isnot(None)
+        ),
+        # Serves `tags @> '["tag"]'` lookups
+        Index(
+            'ix_raw_job_posts_tags',
+            'tags',
+            postgresql_using='gin',
+            postgresql_ops={'tags': 'jsonb_path_ops'}
+        ),
+        {'postgresql_partition_by': 'RANGE (created_utc)'},
+    )
+
+    def __repr__(self):
+        return f"<RawJobPost(id={self.id}, reddit_id={self.reddit_id}, title={self.title[:50]})>"
+
+
+class JobListing(Base):
+    """
+    Narrow read model served by the API.
+
+    Holds only the fields JobPostResponse returns plus precomputed sort keys
+    and tag ids, so listing queries never touch the raw Reddit bodies. A row
+    is created by the scraper when the post is inserted and filled in by the
+    LLM service when the post is processed (see jobposts.listing).
+    """
+    __tablename__ = 'job_listing'
+
+    # Same id as the raw_job_posts row
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    # Served fields
+    cleaned_title = Column(Text, nullable=True)
+    cleaned_text = Column(Text, nullable=True)
+    tags = Column(JSONB, nullable=True)
+    created_utc = Column(DateTime, nullable=False)
+    url = Column(Text)
+
+    # Sort keys and filters
+    processed_at = Column(DateTime, nullable=True)
+    score = Column(Integer, nullable=False, default=0)
+    tag_ids = Column(ARRAY(Integer), nullable=False, default=list)
+
+    __table_args__ = (
+        Index('ix_job_listing_created_utc_id', 'created_utc', 'id'),
+        Index('ix_job_listing_processed_at_id', 'processed_at', 'id'),
+        Index('ix_job_listing_score_id', 'score', 'id'),
+        Index('ix_job_listing_tag_ids', 'tag_ids', postgresql_using='gin'),
+    )
+
+    def __repr__(self):
+        return f"<JobListing(id={self.id}, cleaned_title={self.cleaned_title!r})>"
+
+
+class JobTag(Base):
+    """Dictionary of tag names, referenced by JobListing.tag_ids."""
+    __tablename__ = 'job_tags'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(Text, nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<JobTag(id={self.id}, name={self.name!r})>"
+
+
+class DataVersion(Base):
+    """
+    Single-row counter bumped whenever job post data changes.
+
+    The API uses it to invalidate cached responses and to build ETags.
+    """
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion(version={self.version}, updated_at={self.updated_at})>"
+
+
+def bump_data_version(session):
+    """
+    Increment the data version counter within the session's transaction.
+
+    Args:
+        session: Active SQLAlchemy session (or connection)
+    """
+    now = datetime.utcnow()
+    stmt = insert(DataVersion).values(id=1, version=1, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DataVersion.id],
+        set_={'version': DataVersion.version + 1, 'updated_at': now}
+    )
+    session.execute(stmt)
@@ -0,0 +1,138 @@
+"""
+Monthly range partitions of raw_job_posts on created_utc.
+
+Partitions are named raw_job_posts_yYYYYmMM and cover [month start, next
+month start). Rows outside every monthly partition land in
+raw_job_posts_default until a matching partition is created.
+"""
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+PARENT_TABLE = 'raw_job_posts'
+DEFAULT_PARTITION = 'raw_job_posts_default'
+
+
+def month_start(value: datetime) -> datetime:
+    """Truncate a datetime to the first instant of its month."""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month-start datetime by a number of months."""
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding the given month."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> datetime:
+    """Inverse of partition_name."""
+    suffix = name[len(PARENT_TABLE) + 2:]
+    year, month = suffix.split('m')
+    return datetime(int(year), int(month), 1)
+
+
+def list_partitions(conn) -> List[Tuple[str, datetime]]:
+    """
+    List attached monthly partitions, oldest first.
+
+    Returns:
+        List of (partition name, month start)
+    """
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent AND child.relname <> :default
+    """), {'parent': PARENT_TABLE, 'default': DEFAULT_PARTITION}).scalars().all()
+    return sorted((name, parse_partition_name(name)) for name in rows)
+
+
+def list_detached_partitions(conn) -> List[str]:
+    """
+    Monthly partition tables that exist but are not attached, e.g. left over
+    by a retention run that failed between detaching and archiving.
+    """
+    return conn.execute(text("""
+        SELECT relname
+        FROM pg_class
+        WHERE relkind = 'r'
+          AND relname ~ :pattern
+          AND NOT relispartition
+        ORDER BY relname
+    """), {'pattern': f'^{PARENT_TABLE}_y[0-9]{{4}}m[0-9]{{2}}$'}).scalars().all()
+
+
+def default_partition_months(conn) -> List[datetime]:
+    """Months that currently have rows parked in the default partition."""
+    rows = conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', created_utc) FROM {DEFAULT_PARTITION}"
+    )).scalars().all()
+    return sorted(rows)
+
+
+def create_month_partition(conn, month: datetime) -> bool:
+    """
+    Create and attach the partition for a month if it does not exist.
+
+    Rows for that month already sitting in the default partition are moved
+    into the new table before it is attached, since attaching a range that
+    the default partition still holds rows for would fail.
+
+    Returns:
+        True if a partition was created
+    """
+    name = partition_name(month)
+    exists = conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {'name': name}).scalar()
+    if exists:
+        return False
+
+    bounds = {'lower': month, 'upper': add_months(month, 1)}
+    conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE created_utc >= :lower AND created_utc < :upper
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds)
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['lower'].isoformat()}') TO ('{bounds['upper'].isoformat()}')"
+    ))
+    print(f"Created partition {name}")
+    return True
+
+
+def ensure_partitions(engine, months_ahead: int = 3) -> List[str]:
+    """
+    Create partitions for the coming months and for any months found in the
+    default partition. Each partition is created in its own transaction.
+
+    Args:
+        engine: SQLAlchemy engine
+        months_ahead: Number of future months to pre-create
+
+    Returns:
+        Names of the partitions created
+    """
+    current = month_start(datetime.utcnow())
+    with engine.connect() as conn:
+        months = set(default_partition_months(conn))
+    months.update(add_months(current, offset) for offset in range(months_ahead + 1))
+
+    created = []
+    for month in sorted(months):
+        with engine.begin() as conn:
+            if create_month_partition(conn, month):
+                created.append(partition_name(month))
+    return created
@@ -0,0 +1,230 @@
+"""
+Retention job for raw_job_posts partitions.
+
+Pre-creates upcoming monthly partitions, then detaches every partition older
+than the retention window, archives its rows to a compressed file and drops
+it together with the month's job_listing rows. Archived months can still be
+read through the API's /api/v1/archive endpoints.
+
+Usage:
+    python -m jobposts.retention --keep-months 6 --archive-dir /var/lib/jobposts/archive
+"""
+import argparse
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+
+from .database import get_database_url
+from .models import bump_data_version
+from .partitions import (
+    PARENT_TABLE,
+    add_months,
+    ensure_partitions,
+    list_detached_partitions,
+    list_partitions,
+    month_start,
+    parse_partition_name,
+)
+
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def archive_path(archive_dir: str, partition: str, archive_format: str) -> str:
+    """
+    Path of the archive file for a partition.
+
+    A month can be archived more than once (late rows for an archived month
+    recreate its partition), so later archives get a numeric suffix instead
+    of overwriting earlier ones.
+    """
+    extension = 'parquet' if archive_format == 'parquet' else 'ndjson.gz'
+    path = os.path.join(archive_dir, f"{partition}.{extension}")
+    sequence = 1
+    while os.path.exists(path):
+        path = os.path.join(archive_dir, f"{partition}.{sequence}.{extension}")
+        sequence += 1
+    return path
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _write_ndjson(result, path: str) -> int:
+    rows = 0
+    with gzip.open(path, 'wt', encoding='utf-8') as archive:
+        for partition in result.partitions(ARCHIVE_BATCH_SIZE):
+            for row in partition:
+                archive.write(json.dumps(dict(row._mapping), default=_json_default) + '\n')
+                rows += 1
+    return rows
+
+
+def _archive_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ('id', pa.int64()),
+        ('reddit_id', pa.string()),
+        ('title', pa.string()),
+        ('body', pa.string()),
+        ('author', pa.string()),
+        ('created_utc', pa.timestamp('us')),
+        ('score', pa.int64()),
+        ('url', pa.string()),
+        ('subreddit', pa.string()),
+        ('scraped_at', pa.timestamp('us')),
+        ('cleaned_title', pa.string()),
+        ('cleaned_text', pa.string()),
+        ('tags', pa.list_(pa.string())),
+        ('processed_at', pa.timestamp('us')),
+        ('analysis_model', pa.string()),
+        ('prompt_version', pa.string()),
+    ])
+
+
+def _write_parquet(result, path: str) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _archive_schema()
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for partition in result.partitions(ARCHIVE_BATCH_SIZE):
+            records = [
+                {field.name: row._mapping.get(field.name) for field in schema}
+                for row in partition
+            ]
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            rows += len(partition)
+    return rows
+
+
+def archive_partition(conn, partition: str, archive_dir: str, archive_format: str) -> int:
+    """
+    Write every row of a detached partition to the archive directory.
+
+    The file is written under a temporary name and renamed once complete, so
+    readers never see a partial archive.
+
+    Returns:
+        Number of rows archived
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(archive_dir, partition, archive_format)
+    tmp_path = path + '.tmp'
+
+    result = conn.execution_options(stream_results=True).execute(
+        text(f"SELECT * FROM {partition} ORDER BY id")
+    )
+    try:
+        if archive_format == 'parquet':
+            rows = _write_parquet(result, tmp_path)
+        else:
+            rows = _write_ndjson(result, tmp_path)
+    finally:
+        result.close()
+
+    os.replace(tmp_path, path)
+    return rows
+
+
+def retention_cutoff(keep_months: int, now: Optional[datetime] = None) -> datetime:
+    """
+    Start of the oldest month kept online.
+
+    Args:
+        keep_months: Number of months (including the current one) kept online
+        now: Reference time (default: the current UTC time)
+    """
+    return add_months(month_start(now or datetime.utcnow()), -(keep_months - 1))
+
+
+def apply_retention(engine, keep_months: int, archive_dir: str, archive_format: str = 'ndjson',
+                    months_ahead: int = 3, dry_run: bool = False) -> list:
+    """
+    Archive and drop partitions older than the retention window.
+
+    Args:
+        engine: SQLAlchemy engine
+        keep_months: Number of months (including the current one) kept online
+        archive_dir: Directory receiving archive files
+        archive_format: 'ndjson' (gzip) or 'parquet'
+        months_ahead: Future partitions to pre-create
+        dry_run: Only report which partitions would be archived
+
+    Returns:
+        List of archived partition names
+    """
+    created = ensure_partitions(engine, months_ahead=months_ahead)
+    if created:
+        print(f"Created {len(created)} partitions: {', '.join(created)}")
+
+    cutoff = retention_cutoff(keep_months)
+    with engine.connect() as conn:
+        expired = [name for name, month in list_partitions(conn) if month < cutoff]
+        leftover = list_detached_partitions(conn)
+
+    if not expired and not leftover:
+        print(f"No partitions older than {cutoff:%Y-%m}")
+        return []
+
+    archived = []
+    for partition in leftover + expired:
+        if dry_run:
+            print(f"Would archive {partition}")
+            continue
+
+        if partition not in leftover:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition}"))
+
+        # The detached table is only dropped after its archive file is complete
+        month = parse_partition_name(partition)
+        with engine.begin() as conn:
+            rows = archive_partition(conn, partition, archive_dir, archive_format)
+            conn.execute(text(f"DROP TABLE {partition}"))
+            conn.execute(
+                text("DELETE FROM job_listing WHERE created_utc >= :lower AND created_utc < :upper"),
+                {'lower': month, 'upper': add_months(month, 1)}
+            )
+            bump_data_version(conn)
+
+        print(f"Archived {rows} rows from {partition}")
+        archived.append(partition)
+
+    return archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keep-months', type=int, default=int(os.getenv('RETENTION_KEEP_MONTHS', 6)))
+    parser.add_argument('--archive-dir', default=os.getenv('ARCHIVE_DIR', '/var/lib/jobposts/archive'))
+    parser.add_argument('--format', dest='archive_format', choices=['ndjson', 'parquet'],
+                        default=os.getenv('ARCHIVE_FORMAT', 'ndjson'))
+    parser.add_argument('--months-ahead', type=int, default=3)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    if args.keep_months < 1:
+        parser.error("--keep-months must be at least 1")
+
+    engine = create_engine(get_database_url())
+    apply_retention(
+        engine,
+        keep_months=args.keep_months,
+        archive_dir=args.archive_dir,
+        archive_format=args.archive_format,
+        months_ahead=args.months_ahead,
+        dry_run=args.dry_run
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Stage-level latency breakdown from spans written by the JSON trace exporter.
+
+Usage:
+    python -m jobposts.trace_report /tmp/traces-*.jsonl
+    python -m jobposts.trace_report /tmp/traces-*.jsonl --job-id 1234
+"""
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+# Pipeline stages in the order a post goes through them
+STAGES = [
+    'scrape_subreddit',
+    'save_to_database',
+    'publish_job_ids',
+    'publish_job_id',
+    'queue_wait',
+    'process_message',
+    'fetch_job_post',
+    'ollama.chat',
+    'ollama.embeddings',
+    'update_cleaned_data',
+    'sse.dispatch',
+]
+
+
+def load_spans(paths: Iterable[str]) -> List[Dict]:
+    spans = []
+    for path in paths:
+        with open(path, encoding='utf-8') as source:
+            spans.extend(json.loads(line) for line in source if line.strip())
+    return spans
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def stage_breakdown(spans: List[Dict]) -> Dict[str, Dict]:
+    """Count and latency percentiles (ms) per span name, pipeline stages first."""
+    durations = defaultdict(list)
+    for span in spans:
+        durations[span['name']].append(span['duration_ms'])
+
+    ordered = [name for name in STAGES if name in durations]
+    ordered += sorted(name for name in durations if name not in STAGES)
+
+    report = {}
+    for name in ordered:
+        values = sorted(durations[name])
+        report[name] = {
+            'count': len(values),
+            'mean_ms': sum(values) / len(values),
+            'p50_ms': percentile(values, 0.50),
+            'p95_ms': percentile(values, 0.95),
+            'p99_ms': percentile(values, 0.99),
+        }
+    return report
+
+
+def post_timeline(spans: List[Dict], job_id: int) -> List[Dict]:
+    """Spans tagged with the job id and all their descendants, in start order."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span['parent_id']].append(span)
+
+    pending = [span for span in spans if span['attributes'].get('job_id') == job_id]
+    selected = {}
+    while pending:
+        span = pending.pop()
+        if span['span_id'] in selected:
+            continue
+        selected[span['span_id']] = span
+        pending.extend(children.get(span['span_id'], ()))
+
+    timeline = sorted(selected.values(), key=lambda span: span['start_ns'])
+    if not timeline:
+        return []
+    origin = timeline[0]['start_ns']
+    return [
+        {
+            'service': span['service'],
+            'name': span['name'],
+            'offset_ms': (span['start_ns'] - origin) / 1e6,
+            'duration_ms': span['duration_ms'],
+        }
+        for span in timeline
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='JSON span files (TRACING_JSON_FILE of each service)')
+    parser.add_argument('--job-id', type=int, help='Show the timeline of one post instead')
+    args = parser.parse_args()
+
+    spans = load_spans(args.paths)
+    if args.job_id is not None:
+        result = {'job_id': args.job_id, 'timeline': post_timeline(spans, args.job_id)}
+    else:
+        result = {'spans': len(spans), 'stages': stage_breakdown(spans)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+OpenTelemetry tracing shared by the scraper, the LLM consumer and the API.
+
+A post's trace starts in the scraper run, continues in the consumer through
+a W3C traceparent carried in the AMQP message headers, and ends in the API
+when the processed-post notification is fanned out to live subscribers.
+
+TRACING_EXPORTER selects where finished spans go:
+    none  - tracing disabled (default)
+    otlp  - OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (e.g. a local collector)
+    json  - one JSON object per line appended to TRACING_JSON_FILE, readable
+            by `python -m jobposts.trace_report`
+
+The OpenTelemetry packages are optional; without them every tracer is a
+no-op.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+except ImportError:  # opentelemetry is optional, tracing is disabled without it
+    trace = None
+
+_initialized = False
+
+
+class _NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def update_name(self, name):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def record_exception(self, exception, *args, **kwargs):
+        pass
+
+    def set_status(self, *args, **kwargs):
+        pass
+
+    def end(self, *args, **kwargs):
+        pass
+
+
+class _NoopTracer:
+    @contextmanager
+    def start_as_current_span(self, name, *args, **kwargs):
+        yield _NoopSpan()
+
+    def start_span(self, name, *args, **kwargs):
+        return _NoopSpan()
+
+
+if trace is not None:
+    class JsonFileSpanExporter(SpanExporter):
+        """Appends finished spans to a file as JSON lines."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        def export(self, spans) -> "SpanExportResult":
+            lines = []
+            for span in spans:
+                parent = span.parent
+                lines.append(json.dumps({
+                    'service': span.resource.attributes.get('service.name'),
+                    'name': span.name,
+                    'trace_id': format(span.context.trace_id, '032x'),
+                    'span_id': format(span.context.span_id, '016x'),
+                    'parent_id': format(parent.span_id, '016x') if parent else None,
+                    'start_ns': span.start_time,
+                    'end_ns': span.end_time,
+                    'duration_ms': (span.end_time - span.start_time) / 1e6,
+                    'status': span.status.status_code.name,
+                    'attributes': dict(span.attributes or {}),
+                }, default=str))
+            with self._lock, open(self.path, 'a', encoding='utf-8') as output:
+                output.write('\n'.join(lines) + '\n')
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+
+def init_tracing(service_name: str, exporter: Optional[str] = None, json_file: Optional[str] = None) -> bool:
+    """
+    Install the global tracer provider for this process, once.
+
+    Args:
+        service_name: Reported as service.name on every span
+        exporter: 'none', 'otlp' or 'json' (default: TRACING_EXPORTER)
+        json_file: Output path for 'json' (default: TRACING_JSON_FILE)
+
+    Returns:
+        True if spans are being exported
+    """
+    global _initialized
+    exporter_name = (exporter or os.getenv('TRACING_EXPORTER', 'none')).lower()
+    if _initialized or exporter_name == 'none':
+        return _initialized
+    if trace is None:
+        print("opentelemetry is not installed, tracing is disabled")
+        return False
+
+    if exporter_name == 'otlp':
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter()
+    elif exporter_name == 'json':
+        path = json_file or os.getenv('TRACING_JSON_FILE', f'/tmp/traces-{service_name}.jsonl')
+        span_exporter = JsonFileSpanExporter(path)
+    else:
+        print(f"Unknown TRACING_EXPORTER {exporter_name!r}, tracing is disabled")
+        return False
+
+    provider = TracerProvider(resource=Resource.create({'service.name': service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _initialized = True
+    print(f"Tracing enabled ({exporter_name}) for {service_name}")
+    return True
+
+
+def shutdown_tracing():
+    """Flush pending spans; call before a short-lived process exits."""
+    if _initialized:
+        trace.get_tracer_provider().shutdown()
+
+
+def get_tracer(name: str):
+    """Tracer for a module; a no-op until init_tracing() installs a provider."""
+    if trace is None:
+        return _NoopTracer()
+    return trace.get_tracer(name)
+
+
+def inject_headers(headers: Optional[Dict] = None) -> Dict:
+    """Add the current trace context (traceparent) to a message header dict."""
+    headers = {} if headers is None else headers
+    if _initialized:
+        propagate.inject(headers)
+    return headers
+
+
+def extract_context(headers: Optional[Dict]):
+    """Trace context from message headers, for use as a span's `context`."""
+    if not _initialized or not headers:
+        return None
+    carrier = {key: value.decode() if isinstance(value, bytes) else value for key, value in headers.items()}
+    return propagate.extract(carrier)
+
+
+def current_traceparent() -> Optional[str]:
+    """W3C traceparent of the active span, or None when not tracing."""
+    if not _initialized:
+        return None
+    return inject_headers().get('traceparent')
+
+
+def context_from_traceparent(traceparent: Optional[str]):
+    """Inverse of current_traceparent()."""
+    if not traceparent:
+        return None
+    return extract_context({'traceparent': traceparent})
+
@@ -0,0 +1,56 @@
+"""Initial schema: raw_job_posts and data_version
+
+Databases created by the old `Base.metadata.create_all` call already have
+these tables; they are left untouched so this revision acts as the baseline.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'raw_job_posts' not in tables:
+        op.create_table(
+            'raw_job_posts',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('reddit_id', sa.String(50), nullable=False),
+            sa.Column('title', sa.Text(), nullable=False),
+            sa.Column('body', sa.Text()),
+            sa.Column('author', sa.String(100)),
+            sa.Column('created_utc', sa.DateTime(), nullable=False),
+            sa.Column('score', sa.Integer()),
+            sa.Column('url', sa.Text()),
+            sa.Column('subreddit', sa.String(100)),
+            sa.Column('scraped_at', sa.DateTime(), nullable=False),
+            sa.Column('cleaned_title', sa.Text()),
+            sa.Column('cleaned_text', sa.Text()),
+            sa.Column('tags', sa.JSON()),
+            sa.Column('processed_at', sa.DateTime()),
+        )
+        op.create_index('ix_raw_job_posts_reddit_id', 'raw_job_posts', ['reddit_id'], unique=True)
+
+    if 'data_version' not in tables:
+        op.create_table(
+            'data_version',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('version', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table('data_version')
+    op.drop_index('ix_raw_job_posts_reddit_id', table_name='raw_job_posts')
+    op.drop_table('raw_job_posts')
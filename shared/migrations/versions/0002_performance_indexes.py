@@ -0,0 +1,82 @@
+"""Performance indexes and JSONB tags
+
+Converts tags to JSONB so it can carry a GIN index, and adds the indexes
+backing the API's sort orders and filters. Indexes are built concurrently
+so the migration does not block the scraper or the consumer.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'raw_job_posts',
+        'tags',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using='tags::jsonb'
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_raw_job_posts_created_utc_id',
+            'raw_job_posts',
+            ['created_utc', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_raw_job_posts_score_id',
+            'raw_job_posts',
+            ['score', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_raw_job_posts_processed_at',
+            'raw_job_posts',
+            ['processed_at'],
+            postgresql_where=sa.text('processed_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_raw_job_posts_tags',
+            'raw_job_posts',
+            ['tags'],
+            postgresql_using='gin',
+            postgresql_ops={'tags': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in (
+            'ix_raw_job_posts_tags',
+            'ix_raw_job_posts_processed_at',
+            'ix_raw_job_posts_score_id',
+            'ix_raw_job_posts_created_utc_id',
+        ):
+            op.drop_index(name, table_name='raw_job_posts', postgresql_concurrently=True, if_exists=True)
+
+    op.alter_column(
+        'raw_job_posts',
+        'tags',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='tags::json'
+    )
@@ -0,0 +1,137 @@
+"""Partition raw_job_posts by month on created_utc
+
+Rebuilds raw_job_posts as a declaratively range-partitioned table with one
+partition per month (raw_job_posts_yYYYYmMM) plus a default partition, so
+queries on recent date ranges only touch recent partitions and old months can
+be detached and archived by jobposts.retention.
+
+Postgres requires the partition key in every unique constraint, so the
+primary key becomes (id, created_utc) and reddit_id is unique together with
+created_utc (a post's creation time never changes).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, reddit_id, title, body, author, created_utc, score, url, subreddit, "
+    "scraped_at, cleaned_title, cleaned_text, tags, processed_at"
+)
+
+INDEXES = (
+    "CREATE INDEX ix_raw_job_posts_created_utc_id ON raw_job_posts (created_utc, id)",
+    "CREATE INDEX ix_raw_job_posts_score_id ON raw_job_posts (score, id)",
+    "CREATE INDEX ix_raw_job_posts_processed_at ON raw_job_posts (processed_at) "
+    "WHERE processed_at IS NOT NULL",
+    "CREATE INDEX ix_raw_job_posts_tags ON raw_job_posts USING gin (tags jsonb_path_ops)",
+)
+
+
+def _rebuild(create_table_sql: str, partitioned: bool):
+    op.execute("ALTER TABLE raw_job_posts RENAME TO raw_job_posts_old")
+    op.execute("ALTER TABLE raw_job_posts_old RENAME CONSTRAINT raw_job_posts_pkey TO raw_job_posts_old_pkey")
+    op.execute("ALTER SEQUENCE raw_job_posts_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE raw_job_posts_old DROP CONSTRAINT IF EXISTS uq_raw_job_posts_reddit_id")
+    for name in (
+        'ix_raw_job_posts_reddit_id',
+        'ix_raw_job_posts_created_utc_id',
+        'ix_raw_job_posts_score_id',
+        'ix_raw_job_posts_processed_at',
+        'ix_raw_job_posts_tags',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(create_table_sql)
+
+    if partitioned:
+        op.execute("CREATE TABLE raw_job_posts_default PARTITION OF raw_job_posts DEFAULT")
+        # One partition per month from the oldest post up to three months ahead
+        op.execute("""
+            DO $$
+            DECLARE
+                month_start timestamp;
+            BEGIN
+                FOR month_start IN
+                    SELECT generate_series(
+                        date_trunc('month', COALESCE(
+                            (SELECT min(created_utc) FROM raw_job_posts_old),
+                            now() AT TIME ZONE 'UTC'
+                        )),
+                        date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                        interval '1 month'
+                    )
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF raw_job_posts FOR VALUES FROM (%L) TO (%L)',
+                        'raw_job_posts_' || to_char(month_start, '"y"YYYY"m"MM'),
+                        month_start,
+                        month_start + interval '1 month'
+                    );
+                END LOOP;
+            END $$;
+        """)
+
+    op.execute(f"INSERT INTO raw_job_posts ({COLUMNS}) SELECT {COLUMNS} FROM raw_job_posts_old")
+    op.execute("DROP TABLE raw_job_posts_old")
+    op.execute("ALTER SEQUENCE raw_job_posts_id_seq OWNED BY raw_job_posts.id")
+    op.execute("SELECT setval('raw_job_posts_id_seq', COALESCE((SELECT max(id) FROM raw_job_posts), 1))")
+
+
+def upgrade():
+    _rebuild("""
+        CREATE TABLE raw_job_posts (
+            id integer NOT NULL DEFAULT nextval('raw_job_posts_id_seq'),
+            reddit_id varchar(50) NOT NULL,
+            title text NOT NULL,
+            body text,
+            author varchar(100),
+            created_utc timestamp NOT NULL,
+            score integer,
+            url text,
+            subreddit varchar(100),
+            scraped_at timestamp NOT NULL,
+            cleaned_title text,
+            cleaned_text text,
+            tags jsonb,
+            processed_at timestamp,
+            CONSTRAINT raw_job_posts_pkey PRIMARY KEY (id, created_utc),
+            CONSTRAINT uq_raw_job_posts_reddit_id UNIQUE (reddit_id, created_utc)
+        ) PARTITION BY RANGE (created_utc)
+    """, partitioned=True)
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade():
+    # Archived (detached and dropped) months are not restored
+    _rebuild("""
+        CREATE TABLE raw_job_posts (
+            id integer NOT NULL DEFAULT nextval('raw_job_posts_id_seq'),
+            reddit_id varchar(50) NOT NULL,
+            title text NOT NULL,
+            body text,
+            author varchar(100),
+            created_utc timestamp NOT NULL,
+            score integer,
+            url text,
+            subreddit varchar(100),
+            scraped_at timestamp NOT NULL,
+            cleaned_title text,
+            cleaned_text text,
+            tags jsonb,
+            processed_at timestamp,
+            CONSTRAINT raw_job_posts_pkey PRIMARY KEY (id)
+        )
+    """, partitioned=False)
+    op.execute("CREATE UNIQUE INDEX ix_raw_job_posts_reddit_id ON raw_job_posts (reddit_id)")
+    for statement in INDEXES:
+        op.execute(statement)
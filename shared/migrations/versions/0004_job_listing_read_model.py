@@ -0,0 +1,73 @@
+"""job_listing read model and job_tags dictionary
+
+Adds the narrow job_listing table the API reads from, plus job_tags mapping
+tag names to the integer ids stored in job_listing.tag_ids, and backfills
+both from raw_job_posts.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'job_tags',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.Text(), nullable=False, unique=True),
+    )
+    op.create_table(
+        'job_listing',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('cleaned_title', sa.Text()),
+        sa.Column('cleaned_text', sa.Text()),
+        sa.Column('tags', postgresql.JSONB()),
+        sa.Column('created_utc', sa.DateTime(), nullable=False),
+        sa.Column('url', sa.Text()),
+        sa.Column('processed_at', sa.DateTime()),
+        sa.Column('score', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tag_ids', postgresql.ARRAY(sa.Integer()), nullable=False, server_default='{}'),
+    )
+
+    op.execute("""
+        INSERT INTO job_tags (name)
+        SELECT DISTINCT jsonb_array_elements_text(tags)
+        FROM raw_job_posts
+        WHERE jsonb_typeof(tags) = 'array'
+        ON CONFLICT (name) DO NOTHING
+    """)
+    op.execute("""
+        INSERT INTO job_listing (
+            id, cleaned_title, cleaned_text, tags, created_utc, url, processed_at, score, tag_ids
+        )
+        SELECT
+            r.id, r.cleaned_title, r.cleaned_text, r.tags, r.created_utc, r.url, r.processed_at,
+            COALESCE(r.score, 0),
+            COALESCE(
+                (SELECT array_agg(t.id ORDER BY t.id)
+                 FROM job_tags t
+                 WHERE jsonb_typeof(r.tags) = 'array' AND r.tags ? t.name),
+                '{}'
+            )
+        FROM raw_job_posts r
+    """)
+
+    op.create_index('ix_job_listing_created_utc_id', 'job_listing', ['created_utc', 'id'])
+    op.create_index('ix_job_listing_processed_at_id', 'job_listing', ['processed_at', 'id'])
+    op.create_index('ix_job_listing_score_id', 'job_listing', ['score', 'id'])
+    op.create_index('ix_job_listing_tag_ids', 'job_listing', ['tag_ids'], postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_table('job_listing')
+    op.drop_table('job_tags')
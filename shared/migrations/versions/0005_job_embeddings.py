@@ -0,0 +1,42 @@
+"""job_embeddings with an HNSW index for semantic search
+
+Requires the pgvector extension (the compose file uses the pgvector/pgvector
+Postgres image). Embeddings are filled in by the LLM consumer as posts are
+processed; llm_service/src/embed_backfill.py embeds posts processed earlier.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with jobposts.embeddings.EMBEDDING_DIMENSIONS
+EMBEDDING_DIMENSIONS = 768
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(f"""
+        CREATE TABLE job_embeddings (
+            id INTEGER PRIMARY KEY REFERENCES job_listing (id) ON DELETE CASCADE,
+            model VARCHAR(100) NOT NULL,
+            embedding vector({EMBEDDING_DIMENSIONS}) NOT NULL,
+            embedded_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'UTC')
+        )
+    """)
+    # Cosine distance (<=>); new rows are added to the graph as they are inserted
+    op.execute("""
+        CREATE INDEX ix_job_embeddings_hnsw ON job_embeddings
+        USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    """)
+
+
+def downgrade():
+    op.drop_table('job_embeddings')
@@ -0,0 +1,32 @@
+"""record the model and prompt version behind each analysis
+
+Adds raw_job_posts.analysis_model and raw_job_posts.prompt_version, written
+by the LLM consumer together with the cleaned data. Posts processed before
+this revision all used the original prompt, so they are marked 'v1'; their
+model was not recorded and stays NULL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Added on the partitioned parent, so every partition gets the columns
+    op.add_column('raw_job_posts', sa.Column('analysis_model', sa.String(100), nullable=True))
+    op.add_column('raw_job_posts', sa.Column('prompt_version', sa.String(20), nullable=True))
+    op.execute("UPDATE raw_job_posts SET prompt_version = 'v1' WHERE processed_at IS NOT NULL")
+
+
+def downgrade():
+    op.drop_column('raw_job_posts', 'prompt_version')
+    op.drop_column('raw_job_posts', 'analysis_model')